@@ -1,3 +1,7 @@
 from . import query_embeddings
 from . import generate_embeddings_visualization
 from . import erase_memgraph
+from . import migrate_wikidata_cache
+from . import benchmark_json_codecs
+from . import compress_caches
+from . import compact_caches
@@ -0,0 +1,91 @@
+"""
+Standalone script to compare the JSON codecs available to the ETL.
+
+Decodes and re-encodes every line of the bundled JSONL datasets with each
+installed codec (see `io_helpers.JSON_CODEC_FACTORIES`) and reports the best
+time of several rounds, relative to the stdlib `json` module.
+
+Usage:
+    python -m scripts.benchmark_json_codecs
+    python -m scripts.benchmark_json_codecs --rounds 10 src/music_rag_etl/data/genres.jsonl
+"""
+
+import argparse
+import time
+from pathlib import Path
+from typing import Callable, List
+
+from music_rag_etl.settings import LOCAL_DATA_DIR
+from music_rag_etl.utils.io_helpers import JSON_CODEC_FACTORIES, JsonCodec, get_json_codec
+
+DEFAULT_FILES = [LOCAL_DATA_DIR / "artists.jsonl", LOCAL_DATA_DIR / "tracks.jsonl"]
+
+
+def best_time(func: Callable[[], object], rounds: int) -> float:
+    """
+    Returns the fastest wall-clock time of `rounds` calls to `func`, in seconds.
+    """
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def benchmark_file(path: Path, codecs: List[JsonCodec], rounds: int) -> None:
+    """
+    Prints decode and encode timings of every codec for one JSONL file.
+    """
+    lines = [line for line in path.read_bytes().splitlines() if line.strip()]
+    records = [codecs[0].loads(line) for line in lines]
+    size_mb = sum(len(line) for line in lines) / 1_000_000
+    print(f"\n{path.name}: {len(lines)} records, {size_mb:.1f} MB")
+    print(f"  {'codec':<10}{'decode (s)':>12}{'encode (s)':>12}{'speedup':>10}")
+
+    baseline = None
+    for codec in codecs:
+        decode = best_time(lambda: [codec.loads(line) for line in lines], rounds)
+        encode = best_time(lambda: [codec.dumps(record) for record in records], rounds)
+        total = decode + encode
+        if codec.name == "json":
+            baseline = total
+        speedup = f"{baseline / total:.1f}x" if baseline else "-"
+        print(f"  {codec.name:<10}{decode:>12.3f}{encode:>12.3f}{speedup:>10}")
+
+
+def main() -> None:
+    """
+    Main execution function for the JSON codec benchmark.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the available JSON codecs.")
+    parser.add_argument(
+        "files",
+        nargs="*",
+        type=Path,
+        default=DEFAULT_FILES,
+        help="JSONL files to benchmark (defaults to the bundled artists and tracks).",
+    )
+    parser.add_argument("--rounds", type=int, default=5, help="Rounds per measurement.")
+    args = parser.parse_args()
+
+    print("--- JSON Codec Benchmark ---")
+    # The stdlib codec goes first so it serves as the baseline
+    codecs = [get_json_codec("json")]
+    for name in JSON_CODEC_FACTORIES:
+        if name == "json":
+            continue
+        try:
+            codecs.append(get_json_codec(name))
+        except ImportError:
+            print(f"Skipping '{name}': not installed.")
+
+    for path in args.files:
+        if not path.exists():
+            print(f"Skipping {path}: file not found.")
+            continue
+        benchmark_file(path, codecs, args.rounds)
+
+
+if __name__ == "__main__":
+    main()
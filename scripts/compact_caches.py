@@ -0,0 +1,139 @@
+"""
+Standalone maintenance script enforcing the cache policies (see CACHE_POLICIES).
+
+For each cache, expired and unreadable entries are deleted, and then the least
+recently used entries are evicted until the cache fits in its size limit.
+
+Expired Wikidata entities and Wikipedia articles are first revalidated against
+the latest revision of their page: unchanged entries get a new TTL instead of
+being deleted, so the next run only re-downloads the ones that changed.
+
+Usage:
+    python -m scripts.compact_caches
+    python -m scripts.compact_caches --cache lastfm --no-revalidate
+"""
+
+import argparse
+from typing import Dict, List, Optional
+
+import requests
+
+from music_rag_etl.settings import (
+    LASTFM_CACHE_DIR,
+    WIKIDATA_CACHE_BACKEND,
+    WIKIDATA_CACHE_DB,
+    WIKIDATA_CACHE_DIR,
+    WIKIPEDIA_CACHE_DIR,
+)
+from music_rag_etl.utils.cache_helpers import (
+    FileCacheBackend,
+    SQLiteCacheBackend,
+    create_cache_backend,
+    get_cache_policy,
+    load_cache_codec,
+)
+from music_rag_etl.utils.wikidata_helpers import revalidate_wikidata_entities
+from music_rag_etl.utils.wikipedia_helpers import (
+    revalidate_wikipedia_articles,
+    wikipedia_revisions,
+)
+
+CACHES = ["wikidata", "lastfm", "wikipedia"]
+
+
+def compact_cache(
+    cache: str, revalidate: bool = True, max_bytes: Optional[int] = None
+) -> Dict[str, int]:
+    """
+    Compacts one cache according to its policy.
+
+    Args:
+        cache: The cache name, one of CACHES.
+        revalidate: Whether to revalidate expired entries against their latest
+            revision (Wikidata and Wikipedia only).
+        max_bytes: Overrides the size limit of the policy.
+
+    Returns:
+        The compaction statistics of `CacheBackend.compact`.
+    """
+    policy = get_cache_policy(cache)
+    if cache == "wikidata":
+        location = WIKIDATA_CACHE_DB if WIKIDATA_CACHE_BACKEND == "sqlite" else WIKIDATA_CACHE_DIR
+        backend = create_cache_backend(
+            WIKIDATA_CACHE_BACKEND, location, load_cache_codec(WIKIDATA_CACHE_DIR), policy
+        )
+        revalidate_fn = revalidate_wikidata_entities
+    elif cache == "lastfm":
+        backend = FileCacheBackend(
+            LASTFM_CACHE_DIR, codec=load_cache_codec(LASTFM_CACHE_DIR), policy=policy
+        )
+        revalidate_fn = None
+    else:
+        backend = FileCacheBackend(
+            WIKIPEDIA_CACHE_DIR,
+            suffix=".txt",
+            codec=load_cache_codec(WIKIPEDIA_CACHE_DIR),
+            policy=policy,
+            text=True,
+        )
+        revalidate_fn = revalidate_wikipedia_articles
+
+    try:
+        stats = backend.compact(
+            max_bytes=max_bytes, revalidate=revalidate_fn if revalidate else None
+        )
+        if cache == "wikipedia":
+            # Revisions of deleted articles are no longer needed
+            articles = set(backend.iter_keys())
+            wikipedia_revisions.delete_many(
+                [key for key in wikipedia_revisions.iter_keys() if key not in articles]
+            )
+        if isinstance(backend, SQLiteCacheBackend):
+            backend.vacuum()
+    finally:
+        backend.close()
+    return stats
+
+
+def main() -> None:
+    """
+    Main execution function for the cache compaction script.
+    """
+    parser = argparse.ArgumentParser(description="Expire, revalidate and evict cache entries.")
+    parser.add_argument(
+        "--cache",
+        choices=CACHES,
+        action="append",
+        help="Cache to compact (repeatable). Defaults to all of them.",
+    )
+    parser.add_argument(
+        "--no-revalidate",
+        action="store_true",
+        help="Delete expired entries without checking their latest revision.",
+    )
+    parser.add_argument(
+        "--max-bytes", type=int, default=None, help="Overrides the size limit of each cache."
+    )
+    args = parser.parse_args()
+
+    print("--- Cache Compaction Tool ---")
+    failed: List[str] = []
+    for cache in args.cache or CACHES:
+        print(f"\nCompacting the {cache} cache...")
+        try:
+            stats = compact_cache(cache, not args.no_revalidate, args.max_bytes)
+        except requests.exceptions.RequestException as e:
+            print(f"ERROR: Revalidation failed ({e}). Retry later or use --no-revalidate.")
+            failed.append(cache)
+            continue
+        print(
+            f"SUCCESS: {stats['expired']} expired, {stats['renewed']} renewed, "
+            f"{stats['evicted']} evicted; {stats['entries']} entries "
+            f"({stats['bytes'] / 1e6:.1f} MB) left."
+        )
+    if failed:
+        raise SystemExit(f"Compaction failed for: {', '.join(failed)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""
+Standalone script to compress the raw response caches with zstd.
+
+For the Wikidata and Last.fm caches, a zstd dictionary is trained on a sample
+of their (small) entries and saved as CACHE_DICTIONARY_FILENAME in the cache
+directory. Wikipedia articles are large enough to compress well without one.
+Every entry is then rewritten with the new codec.
+
+Run the pipeline with CACHE_COMPRESSION=zstd afterwards so that new entries are
+compressed too; existing entries are read transparently either way.
+
+Usage:
+    python -m scripts.compress_caches
+    python -m scripts.compress_caches --cache wikidata --samples 10000
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from music_rag_etl.settings import (
+    CACHE_COMPRESSION_LEVEL,
+    CACHE_DICTIONARY_FILENAME,
+    LASTFM_CACHE_DIR,
+    WIKIDATA_CACHE_BACKEND,
+    WIKIDATA_CACHE_DB,
+    WIKIDATA_CACHE_DIR,
+    WIKIPEDIA_CACHE_DIR,
+)
+from music_rag_etl.utils.cache_helpers import (
+    CacheBackend,
+    CacheCodec,
+    FileCacheBackend,
+    copy_cache_entries,
+    create_cache_backend,
+    load_cache_codec,
+    train_cache_dictionary,
+)
+from music_rag_etl.utils.io_helpers import json_dumps
+
+CACHES = ["wikidata", "lastfm", "wikipedia"]
+# zstd needs a reasonable number of samples to train a useful dictionary
+MIN_DICTIONARY_SAMPLES = 100
+
+
+def directory_size(directory: Path) -> int:
+    """
+    Returns the total size in bytes of all files below a directory.
+    """
+    return sum(path.stat().st_size for path in directory.rglob("*") if path.is_file())
+
+
+def sample_entries(cache: CacheBackend, sample_size: int) -> List[bytes]:
+    """
+    Returns up to `sample_size` random cache entries as uncompressed JSON bytes.
+    """
+    keys = list(cache.iter_keys())
+    sampled_keys = random.sample(keys, min(sample_size, len(keys)))
+    return [json_dumps(value).encode("utf-8") for value in cache.get_many(sampled_keys).values()]
+
+
+def compress_json_cache(
+    cache_dir: Path,
+    open_backend: Callable[[CacheCodec], CacheBackend],
+    level: int,
+    sample_size: Optional[int],
+) -> int:
+    """
+    Rewrites a JSON cache with zstd, training a dictionary first.
+
+    Args:
+        cache_dir: The cache directory, where the dictionary is saved.
+        open_backend: Opens the cache backend with a given codec.
+        level: The zstd compression level.
+        sample_size: Entries sampled to train the dictionary, or None for no dictionary.
+
+    Returns:
+        The number of entries rewritten.
+    """
+    source = open_backend(load_cache_codec(cache_dir))
+    dictionary_path = cache_dir / CACHE_DICTIONARY_FILENAME
+
+    dictionary = None
+    if sample_size:
+        samples = sample_entries(source, sample_size)
+        if len(samples) >= MIN_DICTIONARY_SAMPLES:
+            dictionary = train_cache_dictionary(samples)
+            print(f"Trained a {len(dictionary)} byte dictionary on {len(samples)} entries.")
+        else:
+            print(f"Only {len(samples)} entries, skipping the dictionary.")
+
+    target = open_backend(CacheCodec("zstd", level=level, dictionary=dictionary))
+    # The dictionary is saved first: entries are unreadable without it, while
+    # entries left uncompressed by an interrupted run are still readable.
+    if dictionary:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        dictionary_path.write_bytes(dictionary)
+    rewritten = copy_cache_entries(source, target)
+    if not dictionary:
+        dictionary_path.unlink(missing_ok=True)
+
+    source.close()
+    target.close()
+    return rewritten
+
+
+def compress_text_cache(cache_dir: Path, suffix: str, level: int) -> int:
+    """
+    Rewrites a cache of one text file per key (e.g., Wikipedia articles) with zstd.
+
+    Returns:
+        The number of files rewritten.
+    """
+    source_codec = load_cache_codec(cache_dir)
+    target_codec = CacheCodec("zstd", level=level)
+    rewritten = 0
+    for cache_file in cache_dir.glob(f"*{suffix}"):
+        data = target_codec.encode(source_codec.decode(cache_file.read_bytes()))
+        temp_path = cache_file.with_name(f".{cache_file.name}.tmp")
+        temp_path.write_bytes(data)
+        os.replace(temp_path, cache_file)
+        rewritten += 1
+    return rewritten
+
+
+def main() -> None:
+    """
+    Main execution function for the cache compression script.
+    """
+    parser = argparse.ArgumentParser(description="Compress the raw response caches with zstd.")
+    parser.add_argument(
+        "--cache",
+        choices=CACHES,
+        action="append",
+        help="Cache to compress (repeatable). Defaults to all of them.",
+    )
+    parser.add_argument(
+        "--level", type=int, default=CACHE_COMPRESSION_LEVEL, help="zstd compression level."
+    )
+    parser.add_argument(
+        "--samples", type=int, default=5000, help="Entries sampled to train each dictionary."
+    )
+    parser.add_argument(
+        "--no-dictionary", action="store_true", help="Compress without a trained dictionary."
+    )
+    args = parser.parse_args()
+    sample_size = None if args.no_dictionary else args.samples
+
+    print("--- Cache Compression Tool ---")
+    for cache in args.cache or CACHES:
+        if cache == "wikidata":
+            cache_dir = WIKIDATA_CACHE_DIR
+        elif cache == "lastfm":
+            cache_dir = LASTFM_CACHE_DIR
+        else:
+            cache_dir = WIKIPEDIA_CACHE_DIR
+        if not cache_dir.exists():
+            print(f"Skipping {cache}: {cache_dir} does not exist.")
+            continue
+
+        size_before = directory_size(cache_dir)
+        print(f"\nCompressing the {cache} cache in {cache_dir}...")
+        if cache == "wikidata":
+            location = WIKIDATA_CACHE_DB if WIKIDATA_CACHE_BACKEND == "sqlite" else WIKIDATA_CACHE_DIR
+            rewritten = compress_json_cache(
+                cache_dir,
+                lambda codec: create_cache_backend(WIKIDATA_CACHE_BACKEND, location, codec),
+                args.level,
+                sample_size,
+            )
+            if WIKIDATA_CACHE_BACKEND == "sqlite":
+                # Free pages are only returned to the filesystem by a VACUUM,
+                # which goes through the WAL, so the WAL is truncated afterwards
+                conn = sqlite3.connect(str(WIKIDATA_CACHE_DB))
+                conn.execute("VACUUM;")
+                conn.execute("PRAGMA wal_checkpoint(TRUNCATE);")
+                conn.close()
+        elif cache == "lastfm":
+            rewritten = compress_json_cache(
+                cache_dir,
+                lambda codec: FileCacheBackend(LASTFM_CACHE_DIR, codec=codec),
+                args.level,
+                sample_size,
+            )
+        else:
+            rewritten = compress_text_cache(cache_dir, ".txt", args.level)
+
+        size_after = directory_size(cache_dir)
+        print(
+            f"SUCCESS: Rewrote {rewritten} entries, "
+            f"{size_before / 1e6:.1f} MB -> {size_after / 1e6:.1f} MB."
+        )
+
+
+if __name__ == "__main__":
+    main()
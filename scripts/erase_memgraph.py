@@ -1,9 +1,9 @@
 """
 Standalone script to completely erase the Memgraph database content.
 
-This script provides a convenient way to clear all nodes, relationships, and 
-indexes from the Memgraph database. It reuses the core logic from the 
-ETL application to ensure consistency.
+This script provides a convenient way to clear all nodes, relationships, 
+indexes and uniqueness constraints from the Memgraph database. It reuses the
+core logic from the ETL application to ensure consistency.
 
 Usage:
     python -m scripts.erase_memgraph
@@ -43,7 +43,7 @@ def main() -> None:
     
     # 3. Confirmation Prompt
     confirm = input(
-        "\nWARNING: This will delete ALL data and indexes in the database.\n"
+        "\nWARNING: This will delete ALL data, indexes and constraints in the database.\n"
         "Are you sure you want to proceed? (yes/no): "
     )
     
@@ -0,0 +1,65 @@
+"""
+Standalone script to import the legacy one-JSON-file-per-key Wikidata cache
+into the configured cache backend.
+
+The legacy layout stores entities as `{qid}.json` and SPARQL responses as
+`sparql_albums_{qid}.json` / `sparql_tracks_{qid}.json` in WIKIDATA_CACHE_DIR.
+Every entry keeps its key, so the pipeline reads migrated entries transparently.
+
+Usage:
+    python -m scripts.migrate_wikidata_cache
+    python -m scripts.migrate_wikidata_cache --source /path/to/wikidata --delete-source
+"""
+
+import argparse
+from pathlib import Path
+
+from music_rag_etl.settings import WIKIDATA_CACHE_DIR
+from music_rag_etl.utils.cache_helpers import migrate_file_cache
+from music_rag_etl.utils.wikidata_helpers import get_wikidata_cache
+
+
+def main() -> None:
+    """
+    Main execution function for the cache migration script.
+    """
+    parser = argparse.ArgumentParser(
+        description="Import the per-file Wikidata cache into the cache backend."
+    )
+    parser.add_argument(
+        "--source",
+        type=Path,
+        default=WIKIDATA_CACHE_DIR,
+        help="Directory containing the legacy {key}.json cache files.",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=1000,
+        help="Number of entries written per transaction.",
+    )
+    parser.add_argument(
+        "--delete-source",
+        action="store_true",
+        help="Delete each legacy file once it has been imported.",
+    )
+    args = parser.parse_args()
+
+    print("--- Wikidata Cache Migration Tool ---")
+    if not args.source.exists():
+        print(f"Nothing to migrate: {args.source} does not exist.")
+        return
+
+    cache = get_wikidata_cache()
+    imported = migrate_file_cache(
+        args.source,
+        cache,
+        batch_size=args.batch_size,
+        delete_source=args.delete_source,
+    )
+    cache.close()
+    print(f"SUCCESS: Imported {imported} cache entries from {args.source}.")
+
+
+if __name__ == "__main__":
+    main()
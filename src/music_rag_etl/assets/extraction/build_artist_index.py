@@ -1,12 +1,18 @@
+from pathlib import Path
 from typing import Callable
 
 from dagster import asset, AssetExecutionContext
 
-from music_rag_etl.utils.sparql_queries import get_artists_by_year_range_query
-from music_rag_etl.utils.io_helpers import merge_jsonl_files
+from music_rag_etl.utils.sparql_queries import get_artists_by_date_range_query
+from music_rag_etl.utils.io_helpers import merge_jsonl_files, jsonl_writer
+from music_rag_etl.utils.wikidata_dump_helpers import (
+    WikidataDumpConfig,
+    iter_artist_records_from_dump,
+)
 from music_rag_etl.utils.wikidata_helpers import (
     execute_sparql_extraction,
     format_artist_record_from_sparql,
+    paginate_sparql_query_by_date,
 )
 from music_rag_etl.settings import (
     PATH_DATASETS,
@@ -43,9 +49,10 @@ def create_artist_extraction_asset(decade: str, year_range: tuple[int, int]) ->
         execute_sparql_extraction(
             context=context,
             output_path=output_path,
-            get_query_function=get_artists_by_year_range_query,
+            get_query_function=get_artists_by_date_range_query,
             record_processor=format_artist_record_from_sparql,
             label=f"artists_{decade}",
+            paginator=paginate_sparql_query_by_date,
             start_year=start_year,
             end_year=end_year,
         )
@@ -71,14 +78,33 @@ def build_artist_extraction_assets():
 @asset(
     name="build_artist_index",
     deps=[f"build_artist_index_{decade}" for decade in DECADES_TO_EXTRACT],
-    description="Merges all decade-specific artist JSONL files into a single artist_index.jsonl.",
+    description="Merges all decade-specific artist JSONL files into a single artist_index.jsonl, "
+                "or builds it offline from a local Wikidata dump.",
     group_name="extraction"
 )
-def build_artist_index(context: AssetExecutionContext) -> str:
+def build_artist_index(context: AssetExecutionContext, config: WikidataDumpConfig) -> str:
     """
     Merges all decade-specific artist JSONL files into a single artist_index.jsonl.
+
+    When `config.dump_path` is set, the index is instead built offline by
+    streaming a local Wikidata JSON dump, and the decade extracts are ignored.
+    Materialize this asset on its own to skip the SPARQL extraction.
     """
     output_path = PATH_DATASETS / ARTIST_INDEX_PRE_CLEAN
+    if config.dump_path:
+        context.log.info(f"Building artist index offline from dump {config.dump_path}")
+        total_written = 0
+        with jsonl_writer(output_path) as write:
+            for record in iter_artist_records_from_dump(
+                Path(config.dump_path),
+                date_ranges=list(DECADES_TO_EXTRACT.values()),
+                processes=config.processes,
+            ):
+                write(record)
+                total_written += 1
+        context.log.info(f"Stored {total_written} artist records from dump in {output_path}")
+        return str(output_path)
+
     input_paths = [
         PATH_DATASETS / f"artist_index_{decade}.jsonl" for decade in DECADES_TO_EXTRACT
     ]
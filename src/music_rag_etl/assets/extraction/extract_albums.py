@@ -2,40 +2,34 @@ import aiohttp
 from typing import Dict, Any, List
 from functools import partial
 
-import polars as pl
 from dagster import asset, AssetExecutionContext
 
 from music_rag_etl.settings import (
     ARTIST_INDEX,
     ALBUMS_FILE,
+    ALBUMS_SPARQL_BATCH_SIZE,
     WIKIDATA_ENTITY_URL,
 )
-from music_rag_etl.utils.io_helpers import save_to_jsonl
-from music_rag_etl.utils.concurrency_helpers import process_items_incrementally_async
+from music_rag_etl.utils.cache_helpers import memory_caches
+from music_rag_etl.utils.dataset_helpers import scan_dataset
+from music_rag_etl.utils.io_helpers import JsonlSink, chunk_list
+from music_rag_etl.utils.concurrency_helpers import (
+    concurrency_limiters,
+    process_items_incrementally_async,
+)
 from music_rag_etl.utils.request_utils import create_aiohttp_session
-from music_rag_etl.utils.sparql_queries import get_albums_by_artist_query
-from music_rag_etl.utils.wikidata_helpers import async_fetch_sparql_with_cache
+from music_rag_etl.utils.sparql_queries import get_albums_by_artists_query
+from music_rag_etl.utils.wikidata_helpers import async_fetch_grouped_sparql_with_cache
 
 
-async def async_fetch_albums_for_artist(
+def _parse_album_bindings(
     artist_qid: str,
+    results: List[Dict[str, Any]],
     context: AssetExecutionContext,
-    session: aiohttp.ClientSession,
 ) -> List[Dict[str, Any]]:
     """
-    Worker function to fetch albums for a single artist via SPARQL (with caching).
+    Converts the SPARQL result rows of a single artist into album records.
     """
-    query = get_albums_by_artist_query(artist_qid)
-    
-    response_data = await async_fetch_sparql_with_cache(
-        context=context,
-        artist_qid=artist_qid,
-        query=query,
-        session=session
-    )
-
-    results = response_data.get("results", {}).get("bindings", [])
-    
     if not results:
         context.log.debug(f"No albums found in SPARQL response for artist {artist_qid}")
 
@@ -71,11 +65,37 @@ async def async_fetch_albums_for_artist(
     return albums
 
 
+async def async_fetch_albums_for_artists(
+    artist_qids: List[str],
+    context: AssetExecutionContext,
+    session: aiohttp.ClientSession,
+) -> List[Dict[str, Any]]:
+    """
+    Worker function to fetch albums for a batch of artists with a single
+    VALUES-based SPARQL query (with per-artist caching).
+    """
+    responses = await async_fetch_grouped_sparql_with_cache(
+        context=context,
+        qids=artist_qids,
+        cache_prefix="sparql_albums",
+        get_query_function=get_albums_by_artists_query,
+        group_variable="artist",
+        session=session,
+    )
+
+    albums = []
+    for artist_qid, response_data in responses.items():
+        results = response_data.get("results", {}).get("bindings", [])
+        albums.extend(_parse_album_bindings(artist_qid, results, context))
+    return albums
+
+
 @asset(
     name="extract_albums",
     deps=["extract_artist"],
     description="Extracts Albums dataset albums.jsonl from Artist Index using Wikidata API with SPARQL",
-    group_name="extraction"
+    group_name="extraction",
+    io_manager_key="parquet_io_manager",
 )
 async def create_albums(context: AssetExecutionContext) -> str:
     """
@@ -84,38 +104,39 @@ async def create_albums(context: AssetExecutionContext) -> str:
     context.log.info("Starting album extraction.")
 
     # 1. Load Artists
-    df = pl.read_ndjson(ARTIST_INDEX)
-    artist_ids = df["wikidata_id"].unique().to_list()
+    # Only the ID column is read from the Parquet copy of the index
+    df = scan_dataset(ARTIST_INDEX).select("wikidata_id").unique().collect()
+    artist_ids = df["wikidata_id"].to_list()
     
     total_artists = len(artist_ids)
     context.log.info(f"Found {total_artists} artists to process.")
 
-    # 2. Initialize Output File
-    ALBUMS_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with open(ALBUMS_FILE, "w", encoding="utf-8") as f:
-        pass
-    context.log.info(f"Initialized empty output file at {ALBUMS_FILE}")
-
+    # 2. Albums are streamed to a temporary file that replaces ALBUMS_FILE on success
     seen_album_ids = set()
     processed_count = 0
     total_albums_saved = 0
-    log_interval = 50
 
-    # 3. Process Incrementally
-    async with create_aiohttp_session() as session:
+    # 3. Batch artists so each SPARQL request covers many artists at once
+    artist_batches = list(chunk_list(artist_ids, ALBUMS_SPARQL_BATCH_SIZE))
+    total_batches = len(artist_batches)
+    context.log.info(
+        f"Split artists into {total_batches} batches of size {ALBUMS_SPARQL_BATCH_SIZE}."
+    )
+
+    # 4. Process Incrementally
+    async with create_aiohttp_session() as session, JsonlSink(ALBUMS_FILE, background=True) as sink:
         worker_fn = partial(
-            async_fetch_albums_for_artist, 
+            async_fetch_albums_for_artists,
             context=context, 
             session=session
         )
         
-        # Using concurrency of 5 for SPARQL endpoint to be safe. 
-        # If the user insists on 50 for *Entity API*, that's fine, but for SPARQL it's risky.
-        # I'll stick to a safe 10.
+        # max_concurrent_tasks only caps the number of workers; the requests to
+        # the SPARQL endpoint are paced by its adaptive concurrency limiter.
         results_iterator = process_items_incrementally_async(
-            items=artist_ids,
+            items=artist_batches,
             process_func=worker_fn,
-            max_concurrent_tasks=10, 
+            max_concurrent_tasks=5,
             logger=context.log
         )
 
@@ -127,12 +148,15 @@ async def create_albums(context: AssetExecutionContext) -> str:
                     new_unique_albums.append(album)
             
             if new_unique_albums:
-                save_to_jsonl(new_unique_albums, ALBUMS_FILE, mode="a")
+                await sink.awrite_many(new_unique_albums)
                 total_albums_saved += len(new_unique_albums)
 
             processed_count += 1
-            if processed_count % log_interval == 0:
-                context.log.info(f"Processed {processed_count}/{total_artists} artists. Saved {total_albums_saved} unique albums so far.")
+            context.log.info(f"Processed {processed_count}/{total_batches} artist batches. Saved {total_albums_saved} unique albums so far.")
 
     context.log.info(f"Finished. Total albums saved: {total_albums_saved}")
+    context.add_output_metadata({
+        "concurrency_limits": concurrency_limiters.metadata(),
+        "memory_caches": memory_caches.metadata(),
+    })
     return str(ALBUMS_FILE)
@@ -1,4 +1,3 @@
-import json
 import asyncio
 import aiohttp
 import polars as pl
@@ -6,11 +5,17 @@ from dagster import asset, AssetExecutionContext
 from typing import List, Dict, Any, Optional
 from functools import partial
 
-from music_rag_etl.settings import ARTIST_INDEX, ARTISTS_FILE, BATCH_SIZE, LASTFM_MAX_RPS
-from music_rag_etl.utils.io_helpers import chunk_list
-from music_rag_etl.utils.concurrency_helpers import process_items_incrementally_async, AsyncRateLimiter
+from music_rag_etl.settings import ARTIST_INDEX, ARTISTS_FILE, BATCH_SIZE
+from music_rag_etl.utils.cache_helpers import memory_caches
+from music_rag_etl.utils.dataset_helpers import scan_dataset
+from music_rag_etl.utils.io_helpers import JsonlSink, chunk_list
+from music_rag_etl.utils.concurrency_helpers import (
+    concurrency_limiters,
+    process_items_incrementally_async,
+)
 from music_rag_etl.utils.lastfm_helpers import async_get_artist_info_with_fallback
 from music_rag_etl.utils.wikidata_helpers import (
+    WikidataEntityBatcher,
     async_fetch_wikidata_entities_batch_with_cache,
     async_resolve_qids_to_labels,
 )
@@ -65,9 +70,15 @@ async def _async_enrich_artist_batch(
     api_key: str,
     api_url: str,
     session: Optional[aiohttp.ClientSession] = None,
-    limiter: Optional[AsyncRateLimiter] = None,
+    entity_batcher: Optional[WikidataEntityBatcher] = None,
+    label_batcher: Optional[WikidataEntityBatcher] = None,
 ) -> List[Dict[str, Any]]:
-    """Async worker function to enrich a batch of artists with Wikidata and Last.fm data."""
+    """
+    Async worker function to enrich a batch of artists with Wikidata and Last.fm data.
+
+    Uncached artist entities and country labels are fetched through the shared
+    batchers when given, so concurrent workers fill the same wbgetentities requests.
+    """
     enriched_batch = []
     qids_in_batch = [artist["wikidata_id"] for artist in artist_batch]
 
@@ -85,7 +96,7 @@ async def _async_enrich_artist_batch(
         # 1. Fetch all Wikidata entities for the batch
         # This respects the serial constraint via process_items_concurrently_async(limit=1) caller
         wikidata_entities = await async_fetch_wikidata_entities_batch_with_cache(
-            context, qids_in_batch, session=session
+            context, qids_in_batch, session=session, batcher=entity_batcher
         )
 
         # 2. Collect all unique country QIDs from the current artist batch
@@ -96,9 +107,9 @@ async def _async_enrich_artist_batch(
             if country_qid:
                 country_qids.add(country_qid)
 
-        # 3. Resolve these country QIDs to labels in a single batch call
+        # 3. Resolve these country QIDs to labels, sharing requests across batches
         country_labels_map = await async_resolve_qids_to_labels(
-            context, list(country_qids), session=session
+            context, list(country_qids), session=session, batcher=label_batcher
         )
 
         # 4. Process each artist in the batch concurrently for LastFM
@@ -115,7 +126,7 @@ async def _async_enrich_artist_batch(
 
             # Get Last.fm data using fallback logic
             lastfm_data = await async_get_artist_info_with_fallback(
-                context, artist_name, aliases, artist_mbid, api_key, api_url, session=session, limiter=limiter
+                context, artist_name, aliases, artist_mbid, api_key, api_url, session=session
             )
 
             tags = []
@@ -161,7 +172,8 @@ async def _async_enrich_artist_batch(
     description="Extract Artists dataset artists.jsonl from the Artist Index and enrich them with data from "
                 "Wikidata API and Last FM API",
     required_resource_keys={"api_config"},
-    group_name="extraction"
+    group_name="extraction",
+    io_manager_key="parquet_io_manager",
 )
 async def extract_artist(context: AssetExecutionContext):
     """
@@ -174,13 +186,15 @@ async def extract_artist(context: AssetExecutionContext):
     api_url = context.resources.api_config["lastfm_api_url"].get_value()
 
     # 1. Load upstream data
-    artist_df = pl.read_ndjson(ARTIST_INDEX)
+    artist_df = (
+        scan_dataset(ARTIST_INDEX)
+        .filter(pl.col("wikipedia_url").is_not_null() & (pl.col("wikipedia_url") != ""))
+        .collect()
+    )
 
     # artist_df = artist_df.head(50)
 
-    artists_to_process = [
-    artist for artist in artist_df.to_dicts() if artist.get("wikipedia_url")
-    ]
+    artists_to_process = artist_df.to_dicts()
     context.log.info(f"Loaded {len(artists_to_process)} artists to process.")
 
     # 2. Chunk data for concurrent processing
@@ -195,25 +209,23 @@ async def extract_artist(context: AssetExecutionContext):
     # (though asyncio stuff isn't pickled here, it's just async).
     # Since we are inside an async asset, we can create a session here.
     
-    # Prepare output file (empty it)
-    ARTISTS_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with open(ARTISTS_FILE, "w", encoding="utf-8") as f:
-        pass
-
     seen_ids = set()
     total_saved = 0
 
-    # Initialize Global Rate Limiter for Last.fm
-    lastfm_limiter = AsyncRateLimiter(max_rps=LASTFM_MAX_RPS)
-
-    async with create_aiohttp_session() as session:
+    # Last.fm requests are throttled by the shared per-host rate limiter
+    # (HOST_RATE_LIMITS), so no limiter has to be threaded through the workers.
+    # Artists are streamed to a temporary file that replaces ARTISTS_FILE on success.
+    async with create_aiohttp_session() as session, JsonlSink(ARTISTS_FILE, background=True) as sink:
+        entity_batcher = WikidataEntityBatcher(context, session)
+        label_batcher = WikidataEntityBatcher(context, session, props="labels")
         worker_fn = partial(
             _async_enrich_artist_batch, 
             context=context, 
             api_key=api_key, 
             api_url=api_url, 
             session=session,
-            limiter=lastfm_limiter
+            entity_batcher=entity_batcher,
+            label_batcher=label_batcher,
         )
 
         # 4. Process batches incrementally
@@ -234,13 +246,18 @@ async def extract_artist(context: AssetExecutionContext):
                     seen_ids.add(record["id"])
             
             if unique_results:
-                with open(ARTISTS_FILE, "a", encoding="utf-8") as f:
-                    for record in unique_results:
-                        f.write(json.dumps(record, ensure_ascii=False) + "\n")
-                
+                await sink.awrite_many(unique_results)
                 total_saved += len(unique_results)
                 context.log.info(f"Saved {len(unique_results)} new artists. Total: {total_saved}")
 
     context.log.info(f"Successfully finished enrichment. Total artists saved: {total_saved}")
+    context.add_output_metadata({
+        "concurrency_limits": concurrency_limiters.metadata(),
+        "memory_caches": memory_caches.metadata(),
+        "wikidata_batches": {
+            "entities": entity_batcher.stats(),
+            "labels": label_batcher.stats(),
+        },
+    })
 
     return str(ARTISTS_FILE)
@@ -8,13 +8,19 @@ import polars as pl
 from dagster import asset, AssetExecutionContext
 
 from music_rag_etl.settings import ARTIST_INDEX, GENRES_FILE, CHUNK_SIZE
-from music_rag_etl.utils.io_helpers import save_to_jsonl, chunk_list
+from music_rag_etl.utils.cache_helpers import memory_caches
+from music_rag_etl.utils.dataset_helpers import scan_dataset
+from music_rag_etl.utils.io_helpers import JsonlSink, chunk_list
 from music_rag_etl.utils.transformation_helpers import (
     extract_unique_ids_from_column,
     clean_text_string,
 )
-from music_rag_etl.utils.concurrency_helpers import process_items_incrementally_async
+from music_rag_etl.utils.concurrency_helpers import (
+    concurrency_limiters,
+    process_items_incrementally_async,
+)
 from music_rag_etl.utils.wikidata_helpers import (
+    WikidataEntityBatcher,
     async_fetch_wikidata_entities_batch_with_cache,
 )
 from music_rag_etl.utils.request_utils import create_aiohttp_session
@@ -24,7 +30,8 @@ from music_rag_etl.utils.request_utils import create_aiohttp_session
     name="extract_genres",
     deps=["preprocess_artist_index"],
     description="Extract Genres dataset genres.jsonl from the Artist Index using the Wikidata API",
-    group_name="extraction"
+    group_name="extraction",
+    io_manager_key="parquet_io_manager",
 )
 async def extract_genres(context: AssetExecutionContext) -> Path:
     """
@@ -35,32 +42,31 @@ async def extract_genres(context: AssetExecutionContext) -> Path:
     context.log.info("Starting genre extraction from artist index.")
 
     # 1. Read artist index and extract unique genre IDs
-    df = pl.read_ndjson(ARTIST_INDEX)
-    df = df.filter(
-        pl.col("wikipedia_url").is_not_null() & (pl.col("wikipedia_url") != "")
+    df = (
+        scan_dataset(ARTIST_INDEX)
+        .select(["wikipedia_url", "genres"])
+        .filter(pl.col("wikipedia_url").is_not_null() & (pl.col("wikipedia_url") != ""))
+        .collect()
     )
     unique_genre_ids = extract_unique_ids_from_column(df, "genres")
     context.log.info(
         f"Found {len(unique_genre_ids)} unique genre IDs in the artist index."
     )
 
-    # 2. Create the final output file upfront, ensuring it's empty
-    GENRES_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with open(GENRES_FILE, "w", encoding="utf-8") as f:
-        pass
-    context.log.info(f"Created empty output file at {GENRES_FILE}")
-
     # 3. Define a worker function for concurrent batch processing
     async def async_fetch_and_parse_genre_batch(
         id_chunk: List[str],
         session: aiohttp.ClientSession,
+        batcher: WikidataEntityBatcher,
     ) -> List[Dict[str, Any]]:
         """
         Worker function to fetch a batch of Wikidata entities and parse their labels/aliases.
         """
         batch_results = []
+        # Genres only need their labels and aliases, not their claims. Cache
+        # misses of all chunks are pooled into full requests by the batcher.
         entity_data_map = await async_fetch_wikidata_entities_batch_with_cache(
-            context, id_chunk, session=session
+            context, id_chunk, session=session, props="labels|aliases", batcher=batcher
         )
         if not entity_data_map:
             return []
@@ -102,8 +108,10 @@ async def extract_genres(context: AssetExecutionContext) -> Path:
     processed_chunks = 0
     log_interval = 10  # Log progress every 10 chunks
 
-    async with create_aiohttp_session() as session:
-        worker_fn = partial(async_fetch_and_parse_genre_batch, session=session)
+    # Genres are streamed to a temporary file that replaces GENRES_FILE on success
+    async with create_aiohttp_session() as session, JsonlSink(GENRES_FILE, background=True) as sink:
+        batcher = WikidataEntityBatcher(context, session, props="labels|aliases")
+        worker_fn = partial(async_fetch_and_parse_genre_batch, session=session, batcher=batcher)
         
         results_iterator = process_items_incrementally_async(
             items=id_chunks,
@@ -114,11 +122,16 @@ async def extract_genres(context: AssetExecutionContext) -> Path:
 
         async for batch_results in results_iterator:
             if batch_results:
-                save_to_jsonl(batch_results, GENRES_FILE, mode="a")
+                await sink.awrite_many(batch_results)
             
             processed_chunks += 1
             if processed_chunks % log_interval == 0:
                 context.log.info(f"Processed {processed_chunks} / {total_chunks} genre chunks...")
 
     context.log.info(f"Successfully saved {len(unique_genre_ids)} genres to {GENRES_FILE}")
+    context.add_output_metadata({
+        "concurrency_limits": concurrency_limiters.metadata(),
+        "memory_caches": memory_caches.metadata(),
+        "wikidata_batches": batcher.stats(),
+    })
     return GENRES_FILE
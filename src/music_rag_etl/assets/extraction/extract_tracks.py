@@ -3,40 +3,36 @@ import aiohttp
 from typing import Dict, Any, List
 from functools import partial
 
-import polars as pl
 from dagster import asset, AssetExecutionContext
 
 from music_rag_etl.settings import (
     ALBUMS_FILE,
     TRACKS_FILE,
+    TRACKS_SPARQL_BATCH_SIZE,
     WIKIDATA_ENTITY_URL,
 )
-from music_rag_etl.utils.io_helpers import save_to_jsonl
+from music_rag_etl.utils.cache_helpers import memory_caches
+from music_rag_etl.utils.dataset_helpers import scan_dataset
+from music_rag_etl.utils.io_helpers import JsonlSink, chunk_list
 from music_rag_etl.utils.transformation_helpers import clean_text_string
-from music_rag_etl.utils.concurrency_helpers import process_items_incrementally_async
+from music_rag_etl.utils.concurrency_helpers import (
+    AdaptiveBatchSize,
+    concurrency_limiters,
+    process_items_incrementally_async,
+)
 from music_rag_etl.utils.request_utils import create_aiohttp_session
-from music_rag_etl.utils.sparql_queries import get_tracks_by_album_query
-from music_rag_etl.utils.wikidata_helpers import async_fetch_tracks_sparql_with_cache
+from music_rag_etl.utils.sparql_queries import get_tracks_by_albums_query
+from music_rag_etl.utils.wikidata_helpers import async_fetch_grouped_sparql_with_cache
 
 
-async def async_fetch_tracks_for_album(
+def _parse_track_bindings(
     album_qid: str,
+    results: List[Dict[str, Any]],
     context: AssetExecutionContext,
-    session: aiohttp.ClientSession,
 ) -> List[Dict[str, Any]]:
     """
-    Worker function to fetch tracks for a single album via SPARQL (with caching).
+    Converts the SPARQL result rows of a single album into track records.
     """
-    query = get_tracks_by_album_query(album_qid)
-    
-    response_data = await async_fetch_tracks_sparql_with_cache(
-        context=context,
-        album_qid=album_qid,
-        query=query,
-        session=session
-    )
-
-    results = response_data.get("results", {}).get("bindings", [])
     if not results:
         context.log.debug(f"No tracks found in SPARQL response for album {album_qid}")
 
@@ -67,11 +63,40 @@ async def async_fetch_tracks_for_album(
     return tracks
 
 
+async def async_fetch_tracks_for_albums(
+    album_qids: List[str],
+    context: AssetExecutionContext,
+    session: aiohttp.ClientSession,
+    batch_size: AdaptiveBatchSize,
+) -> List[Dict[str, Any]]:
+    """
+    Worker function to fetch tracks for a group of albums with VALUES-based
+    SPARQL queries (with per-album caching). The shared `batch_size` shrinks
+    when the endpoint times out.
+    """
+    responses = await async_fetch_grouped_sparql_with_cache(
+        context=context,
+        qids=album_qids,
+        cache_prefix="sparql_tracks",
+        get_query_function=get_tracks_by_albums_query,
+        group_variable="album",
+        session=session,
+        batch_size=batch_size,
+    )
+
+    tracks = []
+    for album_qid, response_data in responses.items():
+        results = response_data.get("results", {}).get("bindings", [])
+        tracks.extend(_parse_track_bindings(album_qid, results, context))
+    return tracks
+
+
 @asset(
     name="extract_tracks",
     deps=["extract_albums"],
     description="Extracts Tracks dataset tracks.jsonl from albums.jsonl using Wikidata API with SPARQL",
-    group_name="extraction"
+    group_name="extraction",
+    io_manager_key="parquet_io_manager",
 )
 async def extract_tracks(context: AssetExecutionContext) -> str:
     """
@@ -80,33 +105,37 @@ async def extract_tracks(context: AssetExecutionContext) -> str:
     context.log.info("Starting track extraction.")
 
     # 1. Load Albums
-    df = pl.read_ndjson(ALBUMS_FILE)
-    album_ids = df["id"].unique().to_list()
+    df = scan_dataset(ALBUMS_FILE).select("id").unique().collect()
+    album_ids = df["id"].to_list()
     
     total_albums = len(album_ids)
     context.log.info(f"Found {total_albums} albums to process.")
 
-    # 2. Initialize Output File
-    TRACKS_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with open(TRACKS_FILE, "w", encoding="utf-8") as f:
-        pass
-    context.log.info(f"Initialized empty output file at {TRACKS_FILE}")
-
+    # 2. Tracks are streamed to a temporary file that replaces TRACKS_FILE on success
     seen_track_ids = set()
     processed_count = 0
     total_tracks_saved = 0
-    log_interval = 250
 
-    # 3. Process Incrementally
-    async with create_aiohttp_session() as session:
+    # 3. Group albums; each group is fetched with batched SPARQL queries whose
+    # size adapts down when the endpoint times out
+    album_groups = list(chunk_list(album_ids, TRACKS_SPARQL_BATCH_SIZE))
+    total_groups = len(album_groups)
+    batch_size = AdaptiveBatchSize(initial=TRACKS_SPARQL_BATCH_SIZE)
+    context.log.info(
+        f"Split albums into {total_groups} groups of size {TRACKS_SPARQL_BATCH_SIZE}."
+    )
+
+    # 4. Process Incrementally
+    async with create_aiohttp_session() as session, JsonlSink(TRACKS_FILE, background=True) as sink:
         worker_fn = partial(
-            async_fetch_tracks_for_album, 
+            async_fetch_tracks_for_albums,
             context=context, 
-            session=session
+            session=session,
+            batch_size=batch_size,
         )
         
         results_iterator = process_items_incrementally_async(
-            items=album_ids,
+            items=album_groups,
             process_func=worker_fn,
             max_concurrent_tasks=5,
             logger=context.log
@@ -120,12 +149,19 @@ async def extract_tracks(context: AssetExecutionContext) -> str:
                     new_unique_tracks.append(track)
             
             if new_unique_tracks:
-                save_to_jsonl(new_unique_tracks, TRACKS_FILE, mode="a")
+                await sink.awrite_many(new_unique_tracks)
                 total_tracks_saved += len(new_unique_tracks)
 
             processed_count += 1
-            if processed_count % log_interval == 0:
-                context.log.info(f"Processed {processed_count}/{total_albums} albums. Saved {total_tracks_saved} unique tracks so far.")
+            if processed_count % 10 == 0:
+                context.log.info(
+                    f"Processed {processed_count}/{total_groups} album groups "
+                    f"(batch size {batch_size.current}). Saved {total_tracks_saved} unique tracks so far."
+                )
 
     context.log.info(f"Finished. Total tracks saved: {total_tracks_saved}")
+    context.add_output_metadata({
+        "concurrency_limits": concurrency_limiters.metadata(),
+        "memory_caches": memory_caches.metadata(),
+    })
     return str(TRACKS_FILE)
@@ -14,9 +14,14 @@ from music_rag_etl.settings import (
     ARTIST_INDEX,
     GENRES_FILE,
 )
-from music_rag_etl.utils.io_helpers import save_to_jsonl
+from music_rag_etl.utils.cache_helpers import memory_caches
+from music_rag_etl.utils.dataset_helpers import scan_dataset
+from music_rag_etl.utils.io_helpers import JsonlSink
 from music_rag_etl.utils.transformation_helpers import clean_text_string
-from music_rag_etl.utils.concurrency_helpers import process_items_incrementally_async
+from music_rag_etl.utils.concurrency_helpers import (
+    concurrency_limiters,
+    process_items_incrementally_async,
+)
 from music_rag_etl.utils.wikipedia_helpers import async_fetch_artist_article_payload
 from music_rag_etl.utils.request_utils import create_aiohttp_session
 
@@ -25,7 +30,8 @@ from music_rag_etl.utils.request_utils import create_aiohttp_session
     name="extract_wikipedia_articles",
     deps=["extract_genres"],
     description="Extract Wikipedia articles, split them in chunks and, enrich them with metadata.",
-    group_name="extraction"
+    group_name="extraction",
+    io_manager_key="parquet_io_manager",
 )
 async def create_wikipedia_articles_dataset(
     context: AssetExecutionContext,
@@ -36,19 +42,17 @@ async def create_wikipedia_articles_dataset(
     incrementally to a single JSONL file.
     """
     context.log.info("Loading artist index and genres lookup.")
-    artist_df = pl.read_ndjson(ARTIST_INDEX)
-    genres_df = pl.read_ndjson(GENRES_FILE)
+    artist_df = (
+        scan_dataset(ARTIST_INDEX)
+        .filter(pl.col("wikipedia_url").is_not_null() & (pl.col("wikipedia_url") != ""))
+        .collect()
+    )
+    genres_df = scan_dataset(GENRES_FILE).select(["id", "genre_label"]).collect()
     genre_lookup = dict(
         zip(genres_df["id"].to_list(), genres_df["genre_label"].to_list())
     )
 
-    # 1. Create the final output file upfront, ensuring it's empty
-    WIKIPEDIA_ARTICLES_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with open(WIKIPEDIA_ARTICLES_FILE, "w", encoding="utf-8") as f:
-        pass  # Create an empty file
-    context.log.info(f"Created empty output file at {WIKIPEDIA_ARTICLES_FILE}")
-
-    rows_to_process = [row for row in artist_df.to_dicts() if row.get("wikipedia_url")]
+    rows_to_process = artist_df.to_dicts()
     total_rows = len(rows_to_process)
     context.log.info(
         f"Starting concurrent fetching and processing of {total_rows} Wikipedia articles..."
@@ -113,7 +117,10 @@ async def create_wikipedia_articles_dataset(
     processed_count = 0
     log_interval = 250  # Log progress every 250 articles
 
-    async with create_aiohttp_session() as session:
+    # Chunks are streamed to a temporary file that replaces WIKIPEDIA_ARTICLES_FILE on success
+    async with create_aiohttp_session() as session, JsonlSink(
+        WIKIPEDIA_ARTICLES_FILE, background=True
+    ) as sink:
         worker_fn = partial(async_process_artist, session=session)
         
         # Use incremental processor to get results as they are ready
@@ -124,10 +131,10 @@ async def create_wikipedia_articles_dataset(
             logger=context.log
         )
         
-        # Append results to the file as they come in
+        # Write results to the sink as they come in
         async for artist_chunks in results_iterator:
             if artist_chunks:
-                save_to_jsonl(artist_chunks, WIKIPEDIA_ARTICLES_FILE, mode="a")
+                await sink.awrite_many(artist_chunks)
             
             processed_count += 1
             if processed_count % log_interval == 0:
@@ -136,4 +143,8 @@ async def create_wikipedia_articles_dataset(
     context.log.info(
         f"Finished processing. Final dataset saved to {WIKIPEDIA_ARTICLES_FILE}."
     )
+    context.add_output_metadata({
+        "concurrency_limits": concurrency_limiters.metadata(),
+        "memory_caches": memory_caches.metadata(),
+    })
     return WIKIPEDIA_ARTICLES_FILE
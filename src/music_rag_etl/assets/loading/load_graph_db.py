@@ -1,14 +1,36 @@
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Type, Union
+
+import polars as pl
 from dagster import AssetExecutionContext, MaterializeResult, asset
 from gqlalchemy import Memgraph
 from tqdm import tqdm
-from pydantic import ValidationError
+from pydantic import BaseModel, ValidationError
 
 from music_rag_etl.settings import LOCAL_DATA_DIR
-from music_rag_etl.utils.io_helpers import load_jsonl
+from music_rag_etl.utils.dataset_helpers import scan_dataset
+from music_rag_etl.utils.io_helpers import iter_jsonl
 from music_rag_etl.utils.memgraph_helpers import (
+    CONTENT_HASH_PROPERTY,
+    STORAGE_MODE_ANALYTICAL,
+    STORAGE_MODE_TRANSACTIONAL,
     MemgraphConfig,
+    MemgraphPool,
     clear_database,
+    compute_content_hash,
+    create_edges,
+    create_nodes,
+    delete_edges,
+    delete_nodes,
+    fetch_edges,
+    fetch_indexes,
+    fetch_node_hashes,
+    fetch_unique_constraints,
     get_memgraph_client,
+    set_storage_mode,
+    update_nodes,
 )
 from music_rag_etl.utils.models import (
     GenreNode,
@@ -18,29 +40,275 @@ from music_rag_etl.utils.models import (
 )
 
 
-def create_indexes(memgraph: Memgraph, context: AssetExecutionContext) -> None:
+# Node label, dataset file and validation model, in loading order
+NODE_FILES: List[Tuple[str, str, Type[BaseModel]]] = [
+    ("Genre", "genres.jsonl", GenreNode),
+    ("Artist", "artists.jsonl", ArtistNode),
+    ("Album", "albums.jsonl", AlbumNode),
+    ("Track", "tracks.jsonl", TrackNode),
+]
+
+
+# Node properties referencing other nodes. They are only stored when relationships
+# are matched on the server, which removes them afterwards.
+REFERENCE_PROPERTIES: Dict[str, Set[str]] = {
+    "Artist": {"genres", "similar_artists"},
+    "Album": {"artist_id"},
+    "Track": {"album_id"},
+}
+
+# Relationship type, source label and target label, in loading order
+EDGE_TYPES: List[Tuple[str, str, str]] = [
+    ("HAS_GENRE", "Artist", "Genre"),
+    ("SIMILAR_TO", "Artist", "Artist"),
+    ("PERFORMED_BY", "Album", "Artist"),
+    ("CONTAINS_TRACK", "Album", "Track"),
+]
+
+EDGE_SCHEMA = {"source": pl.String, "target": pl.String}
+
+
+def _iter_node_rows(
+    path: Path,
+    model: Type[BaseModel],
+    label: str,
+    context: AssetExecutionContext,
+    exclude: Optional[Set[str]] = None,
+    skipped: Optional[Dict[str, int]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Streams the validated node properties of a JSONL dataset.
+
+    Args:
+        path: The JSONL dataset.
+        model: The Pydantic model validating each record.
+        label: The node label, for logging.
+        context: The Dagster asset execution context for logging.
+        exclude: Properties left out of the rows.
+        skipped: Counts of the skipped "invalid" and "duplicate" records, updated
+            in place.
+
+    Yields:
+        The properties of each valid record, with their content hash. Invalid
+        records and records repeating an earlier id are skipped.
+    """
+    skipped = skipped if skipped is not None else {}
+    seen: Set[str] = set()
+    for raw_record in iter_jsonl(path):
+        try:
+            row = model(**raw_record).model_dump(exclude=exclude)
+        except ValidationError as e:
+            context.log.warning(f"Skipping invalid {label.lower()} record: {e}")
+            skipped["invalid"] = skipped.get("invalid", 0) + 1
+            continue
+        if row["id"] in seen:
+            context.log.warning(f"Skipping duplicate {label.lower()} id {row['id']}")
+            skipped["duplicate"] = skipped.get("duplicate", 0) + 1
+            continue
+        seen.add(row["id"])
+        row[CONTENT_HASH_PROPERTY] = compute_content_hash(row)
+        yield row
+
+
+def _get_throughput(count: int, seconds: float) -> Dict[str, float]:
+    """Returns the row count, duration and rows/second of a loading step."""
+    return {
+        "rows": count,
+        "seconds": round(seconds, 3),
+        "rows_per_second": round(count / seconds, 1) if seconds > 0 else 0.0,
+    }
+
+
+def _select_edges(
+    frame: pl.LazyFrame, source: str, target: str, explode: Optional[str] = None
+) -> pl.LazyFrame:
+    """
+    Selects the (source, target) id pairs of one relationship type.
+
+    Args:
+        frame: The dataset holding the references.
+        source: The column of the source ids.
+        target: The column of the target ids.
+        explode: `source` or `target`, if that column holds a list of ids.
+
+    Returns:
+        The edges, without nulls; empty if a column is missing from the dataset.
+    """
+    if not {source, target} <= set(frame.collect_schema().names()):
+        return pl.LazyFrame(schema=EDGE_SCHEMA)
+    columns = {"source": pl.col(source), "target": pl.col(target)}
+    if explode:
+        # Lists that are empty in every record are inferred with a null dtype
+        column = "source" if explode == source else "target"
+        columns[column] = columns[column].cast(pl.List(pl.String))
+    edges = frame.select(**columns)
+    if explode:
+        edges = edges.explode("source" if explode == source else "target")
+    return edges.cast(EDGE_SCHEMA).drop_nulls()
+
+
+def _resolve_similar_artists(artists: pl.LazyFrame) -> pl.LazyFrame:
+    """
+    Resolves the similar artist names of each artist to artist ids.
+
+    Names are matched against artist names first and, for names that aren't the
+    name of any artist, against artist aliases. A name shared by several
+    artists links to all of them. Self-references are dropped.
+
+    Args:
+        artists: The artists dataset.
+
+    Returns:
+        The SIMILAR_TO edges as (source, target) id pairs.
+    """
+    names = _select_edges(artists, "name", "id").with_columns(priority=pl.lit(0))
+    aliases = _select_edges(artists, "aliases", "id", explode="aliases").with_columns(
+        priority=pl.lit(1)
+    )
+    lookup = (
+        pl.concat([names, aliases])
+        .filter(pl.col("priority") == pl.col("priority").min().over("source"))
+        .select(name="source", target="target")
+    )
+    similar = _select_edges(artists, "id", "similar_artists", explode="similar_artists")
+    return (
+        similar.join(lookup, left_on="target", right_on="name")
+        .select(source="source", target="target_right")
+        .filter(pl.col("source") != pl.col("target"))
+    )
+
+
+def build_edge_lists(data_dir: Path) -> Dict[str, pl.DataFrame]:
+    """
+    Computes the edge lists of every relationship type from the datasets.
+
+    Args:
+        data_dir: The directory holding the JSONL datasets (their Parquet copies
+            are used when fresh).
+
+    Returns:
+        A mapping from relationship type to a DataFrame of unique (source, target)
+        node id pairs; empty for a relationship whose dataset is missing or
+        has no records.
+    """
+    artists = scan_dataset(data_dir / "artists.jsonl")
+    albums = scan_dataset(data_dir / "albums.jsonl")
+    tracks = scan_dataset(data_dir / "tracks.jsonl")
+    edges = {
+        "HAS_GENRE": _select_edges(artists, "id", "genres", explode="genres"),
+        "SIMILAR_TO": _resolve_similar_artists(artists),
+        "PERFORMED_BY": _select_edges(albums, "id", "artist_id"),
+        "CONTAINS_TRACK": _select_edges(tracks, "album_id", "id"),
+    }
+    return {
+        rel_type: frame.unique(maintain_order=True).collect()
+        for rel_type, frame in edges.items()
+    }
+
+
+def _sync_nodes(
+    memgraph: Union[Memgraph, MemgraphPool],
+    label: str,
+    rows: Iterable[Dict[str, Any]],
+    batch_size: int,
+) -> Dict[str, int]:
+    """
+    Applies the differences between a dataset and the nodes of a label.
+
+    Rows are compared with the nodes by id and content hash: new ids are
+    inserted, changed ones updated in place (keeping their relationships), and
+    nodes whose id is no longer in the dataset are deleted.
+
+    Args:
+        memgraph: The Memgraph client instance, or a pool to write in parallel.
+        label: The node label.
+        rows: The node properties with unique ids, including their content hash.
+        batch_size: The maximum number of rows per query.
+
+    Returns:
+        The number of inserted, updated, unchanged and deleted nodes.
+    """
+    # Ids left in this map once the dataset is consumed are deleted
+    stored_hashes = fetch_node_hashes(memgraph, label)
+    changes = {"inserted": 0, "updated": 0, "unchanged": 0, "deleted": 0}
+    inserts: List[Dict[str, Any]] = []
+    updates: List[Dict[str, Any]] = []
+
+    for row in rows:
+        stored_hash = stored_hashes.pop(row["id"], None)
+        if stored_hash is None:
+            inserts.append(row)
+        elif stored_hash != row[CONTENT_HASH_PROPERTY]:
+            updates.append(row)
+        else:
+            changes["unchanged"] += 1
+
+        if len(inserts) >= batch_size:
+            changes["inserted"] += create_nodes(memgraph, label, inserts, batch_size)
+            inserts = []
+        if len(updates) >= batch_size:
+            changes["updated"] += update_nodes(memgraph, label, updates, batch_size)
+            updates = []
+
+    changes["inserted"] += create_nodes(memgraph, label, inserts, batch_size)
+    changes["updated"] += update_nodes(memgraph, label, updates, batch_size)
+    changes["deleted"] = delete_nodes(memgraph, label, list(stored_hashes), batch_size)
+    return changes
+
+
+def diff_edges(
+    edges: pl.DataFrame, current: List[Tuple[str, str]]
+) -> Tuple[pl.DataFrame, pl.DataFrame]:
+    """
+    Compares the edge list of a relationship type with the edges in the graph.
+
+    Args:
+        edges: The (source, target) pairs computed from the datasets.
+        current: The (source, target) pairs of the relationships in the graph.
+
+    Returns:
+        The edges to create and the edges to delete.
+    """
+    current_edges = pl.DataFrame(current, schema=EDGE_SCHEMA, orient="row").unique()
+    return (
+        edges.join(current_edges, on=["source", "target"], how="anti"),
+        current_edges.join(edges, on=["source", "target"], how="anti"),
+    )
+
+
+def create_indexes(
+    memgraph: Memgraph, context: AssetExecutionContext, reference_properties: bool = True
+) -> None:
     """
     Creates necessary indexes in Memgraph to optimize query performance.
 
+    Existing indexes are kept, so this can run on a populated database.
+
     Args:
         memgraph: The Memgraph client instance.
         context: The Dagster asset execution context for logging.
+        reference_properties: Whether to index the temporary reference properties
+            used to match relationships on the server.
 
     Raises:
         Exception: If any index creation command fails.
     """
     context.log.info("Creating indexes...")
-    index_commands = [
-        "CREATE INDEX ON :Artist(id);",
-        "CREATE INDEX ON :Artist(name);",
-        "CREATE INDEX ON :Album(id);",
-        "CREATE INDEX ON :Album(artist_id);",
-        "CREATE INDEX ON :Track(id);",
-        "CREATE INDEX ON :Track(album_id);",
-        "CREATE INDEX ON :Genre(id);",
+    indexes = [
+        ("Artist", "id"),
+        ("Artist", "name"),
+        ("Album", "id"),
+        ("Track", "id"),
+        ("Genre", "id"),
     ]
+    if reference_properties:
+        indexes += [("Album", "artist_id"), ("Track", "album_id")]
 
-    for cmd in index_commands:
+    existing = fetch_indexes(memgraph)
+    for label, property_name in indexes:
+        if (label, property_name) in existing:
+            continue
+        cmd = f"CREATE INDEX ON :{label}({property_name});"
         try:
             memgraph.execute(cmd)
             context.log.info(f"Executed: {cmd}")
@@ -49,167 +317,174 @@ def create_indexes(memgraph: Memgraph, context: AssetExecutionContext) -> None:
             raise e
 
 
-@asset(
-    name="load_graph_db",
-    deps=["extract_tracks"],
-    description="Ingests Artists, Albums, Tracks, and Genres into Memgraph.",
-    group_name="loading"
-)
-def load_graph_db(context: AssetExecutionContext, config: MemgraphConfig) -> MaterializeResult:
+def create_constraints(memgraph: Memgraph, context: AssetExecutionContext) -> None:
     """
-    Dagster asset that ingests music data into the Memgraph database.
-    
-    This asset performs the following steps:
-    1. Clears the existing database.
-    2. Loads Genres, Artists, Albums, and Tracks nodes from JSONL files.
-    3. Creates indexes for performance.
-    4. Establishes relationships between nodes (e.g., Artist-Genre, Album-Artist).
-    5. Cleans up temporary properties used for relationship creation.
+    Creates a uniqueness constraint on the `id` of every node label.
+
+    Existing constraints are kept, so this can run on a populated database.
 
     Args:
-        context: The Dagster asset execution context.
-        config: Configuration for the Memgraph connection.
+        memgraph: The Memgraph client instance.
+        context: The Dagster asset execution context for logging.
+
+    Raises:
+        Exception: If any constraint creation command fails.
+    """
+    context.log.info("Creating uniqueness constraints...")
+    existing = fetch_unique_constraints(memgraph)
+    for label, _, _ in NODE_FILES:
+        if (label, "id") in existing:
+            continue
+        cmd = f"CREATE CONSTRAINT ON (n:{label}) ASSERT n.id IS UNIQUE;"
+        try:
+            memgraph.execute(cmd)
+            context.log.info(f"Executed: {cmd}")
+        except Exception as e:
+            context.log.error(f"Failed to execute '{cmd}': {e}")
+            raise e
+
+
+@contextmanager
+def _timed_phase(
+    name: str, phases: Dict[str, float], context: AssetExecutionContext
+) -> Iterator[None]:
+    """
+    Times a phase of the load, recording its duration in seconds in `phases`.
+    """
+    context.log.info(f"Starting phase '{name}'...")
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        phases[name] = round(time.perf_counter() - start, 3)
+        context.log.info(f"Phase '{name}' took {phases[name]:.2f}s.")
+
+
+def _load_nodes(
+    memgraph: Union[Memgraph, MemgraphPool],
+    context: AssetExecutionContext,
+    config: MemgraphConfig,
+) -> Dict[str, Any]:
+    """
+    Loads (or, incrementally, synchronizes) the nodes of every label.
+
+    Records are streamed from disk and sent in batches of `config.batch_size`
+    rows, so memory use doesn't grow with the datasets.
+
+    Args:
+        memgraph: The Memgraph client instance, or a pool to write in parallel.
+        context: The Dagster asset execution context for logging.
+        config: The load configuration.
 
     Returns:
-        MaterializeResult: Metadata about the number of nodes loaded and status.
+        The metadata entries of the node phase.
     """
-    memgraph = get_memgraph_client(config)
-    # --- Step 1: Clear Database ---
-    clear_database(memgraph, context)
+    node_counts: Dict[str, int] = {}
+    node_changes: Dict[str, Dict[str, int]] = {}
+    ingestion_stats: Dict[str, Dict[str, float]] = {}
+    skipped_records: Dict[str, Dict[str, int]] = {}
+    for label, filename, model in NODE_FILES:
+        path = LOCAL_DATA_DIR / filename
+        context.log.info(f"Loading {label} nodes from {path}...")
 
-    # --- Step 2: Node Ingestion ---
-    context.log.info("Starting Stage 1: Node Ingestion")
+        # Relationships resolved client-side don't need the reference properties
+        exclude = REFERENCE_PROPERTIES.get(label) if config.edge_mode == "client" else None
+        skipped_records[label] = {"invalid": 0, "duplicate": 0}
+        start = time.perf_counter()
+        rows = tqdm(
+            _iter_node_rows(path, model, label, context, exclude, skipped_records[label]),
+            desc=f"Loading {label}s",
+        )
+        if config.incremental:
+            node_changes[label] = _sync_nodes(memgraph, label, rows, config.batch_size)
+            count = sum(node_changes[label].values()) - node_changes[label]["deleted"]
+        else:
+            count = create_nodes(memgraph, label, rows, config.batch_size)
+        ingestion_stats[label] = _get_throughput(count, time.perf_counter() - start)
 
-    # 1. Genres
-    genres_path = LOCAL_DATA_DIR / "genres.jsonl"
-    genres_data = load_jsonl(genres_path)
-    context.log.info(f"Loading {len(genres_data)} genres...")
-    
-    genre_count = 0
-    for raw_genre in tqdm(genres_data, desc="Loading Genres"):
-        try:
-            genre = GenreNode(**raw_genre)
-            query = """
-            CREATE (:Genre {
-                id: $id, 
-                name: $name, 
-                aliases: $aliases
-            });
-            """
-            memgraph.execute(
-                query, 
-                {
-                    "id": genre.id,
-                    "name": genre.name,
-                    "aliases": genre.aliases
-                }
-            )
-            genre_count += 1
-        except ValidationError as e:
-            context.log.warning(f"Skipping invalid genre record: {e}")
+        node_counts[Path(filename).stem] = count
+        context.log.info(
+            f"Loaded {count} {label} nodes in {ingestion_stats[label]['seconds']:.2f}s."
+        )
 
-    # 2. Artists
-    artists_path = LOCAL_DATA_DIR / "artists.jsonl"
-    artists_data = load_jsonl(artists_path)
-    context.log.info(f"Loading {len(artists_data)} artists...")
-    
-    artist_count = 0
-    for raw_artist in tqdm(artists_data, desc="Loading Artists"):
-        try:
-            artist = ArtistNode(**raw_artist)
-            query = """
-            CREATE (:Artist {
-                id: $id, 
-                name: $name, 
-                country: $country, 
-                aliases: $aliases,
-                tags: $tags,
-                genres: $genres,
-                similar_artists: $similar_artists
-            });
-            """
-            memgraph.execute(
-                query,
-                {
-                    "id": artist.id,
-                    "name": artist.name,
-                    "country": artist.country,
-                    "aliases": artist.aliases,
-                    "tags": artist.tags,
-                    "genres": artist.genres,  # Temp prop
-                    "similar_artists": artist.similar_artists  # Temp prop
-                }
-            )
-            artist_count += 1
-        except ValidationError as e:
-            context.log.warning(f"Skipping invalid artist record: {e}")
+    metadata: Dict[str, Any] = {
+        "nodes_loaded": node_counts,
+        "node_ingestion": ingestion_stats,
+        "skipped_records": skipped_records,
+    }
+    if config.incremental:
+        metadata["node_changes"] = node_changes
+    return metadata
 
-    # 3. Albums
-    albums_path = LOCAL_DATA_DIR / "albums.jsonl"
-    albums_data = load_jsonl(albums_path)
-    context.log.info(f"Loading {len(albums_data)} albums...")
-    
-    album_count = 0
-    for raw_album in tqdm(albums_data, desc="Loading Albums"):
-        try:
-            album = AlbumNode(**raw_album)
-            query = """
-            CREATE (:Album {
-                id: $id, 
-                title: $title, 
-                year: $year,
-                artist_id: $artist_id
-            });
-            """
-            memgraph.execute(
-                query,
-                {
-                    "id": album.id,
-                    "title": album.title,
-                    "year": album.year,
-                    "artist_id": album.artist_id # Temp prop
-                }
-            )
-            album_count += 1
-        except ValidationError as e:
-            context.log.warning(f"Skipping invalid album record: {e}")
-    context.log.info(f"Loaded {album_count} albums.")
 
-    # 4. Tracks
-    tracks_path = LOCAL_DATA_DIR / "tracks.jsonl"
-    tracks_data = load_jsonl(tracks_path)
-    context.log.info(f"Loading {len(tracks_data)} tracks...")
-    
-    track_count = 0
-    for raw_track in tqdm(tracks_data, desc="Loading Tracks"):
-        try:
-            track = TrackNode(**raw_track)
-            query = """
-            CREATE (:Track {
-                id: $id, 
-                title: $title,
-                album_id: $album_id
-            });
-            """
-            memgraph.execute(
-                query,
-                {
-                    "id": track.id,
-                    "title": track.title,
-                    "album_id": track.album_id # Temp prop
-                }
+def _load_edges(
+    memgraph: Union[Memgraph, MemgraphPool],
+    context: AssetExecutionContext,
+    config: MemgraphConfig,
+) -> Dict[str, Any]:
+    """
+    Creates (or, incrementally, synchronizes) the relationships of every type
+    from the edge lists computed client-side.
+
+    Args:
+        memgraph: The Memgraph client instance, or a pool to write in parallel.
+        context: The Dagster asset execution context for logging.
+        config: The load configuration.
+
+    Returns:
+        The metadata entries of the relationship phase.
+    """
+    edge_changes: Dict[str, Dict[str, int]] = {}
+    edge_stats: Dict[str, Dict[str, float]] = {}
+    edges = build_edge_lists(LOCAL_DATA_DIR)
+    for rel_type, source_label, target_label in EDGE_TYPES:
+        context.log.info(f"Creating ({source_label})-[:{rel_type}]->({target_label})...")
+        start = time.perf_counter()
+        to_create = edges[rel_type]
+        if config.incremental:
+            # Relationships of deleted nodes are already gone at this point
+            current = fetch_edges(memgraph, rel_type, source_label, target_label)
+            to_create, to_delete = diff_edges(to_create, current)
+            delete_edges(
+                memgraph,
+                rel_type,
+                source_label,
+                target_label,
+                to_delete.iter_rows(named=True),
+                config.batch_size,
             )
-            track_count += 1
-        except ValidationError as e:
-            context.log.warning(f"Skipping invalid track record: {e}")
-    context.log.info(f"Loaded {track_count} tracks.")
+            edge_changes[rel_type] = {
+                "inserted": to_create.height,
+                "deleted": to_delete.height,
+                "unchanged": edges[rel_type].height - to_create.height,
+            }
+        create_edges(
+            memgraph,
+            rel_type,
+            source_label,
+            target_label,
+            to_create.iter_rows(named=True),
+            config.batch_size,
+        )
+        edge_stats[rel_type] = _get_throughput(
+            edges[rel_type].height, time.perf_counter() - start
+        )
+
+    metadata: Dict[str, Any] = {"edge_ingestion": edge_stats}
+    if config.incremental:
+        metadata["edge_changes"] = edge_changes
+    return metadata
 
-    # --- Step 3: Index Creation ---
-    create_indexes(memgraph, context)
 
-    # --- Step 4: Relationship Ingestion ---
-    context.log.info("Starting Stage 3: Relationship Ingestion")
+def _create_edges_from_properties(memgraph: Memgraph, context: AssetExecutionContext) -> None:
+    """
+    Creates the relationships by matching the temporary reference properties of
+    the nodes on the server, then removes those properties.
 
+    Args:
+        memgraph: The Memgraph client instance.
+        context: The Dagster asset execution context for logging.
+    """
     # 1. Artist -> Genre
     context.log.info("Creating (Artist)-[:HAS_GENRE]->(Genre)...")
     query_artist_genre = """
@@ -253,28 +528,145 @@ def load_graph_db(context: AssetExecutionContext, config: MemgraphConfig) -> Mat
     """
     memgraph.execute(query_album_track)
 
-    # --- Step 5: Cleanup ---
-    context.log.info("Starting Stage 4: Cleanup (Removing temporary properties)")
+    # 5. Cleanup
+    context.log.info("Removing temporary properties...")
 
     cleanup_queries = [
         "MATCH (n:Artist) REMOVE n.genres, n.similar_artists;",
         "MATCH (n:Album) REMOVE n.artist_id;",
         "MATCH (n:Track) REMOVE n.album_id;"
     ]
-    
     for q in cleanup_queries:
         memgraph.execute(q)
-        
+
+
+@asset(
+    name="load_graph_db",
+    deps=["extract_tracks"],
+    description="Ingests Artists, Albums, Tracks, and Genres into Memgraph.",
+    group_name="loading"
+)
+def load_graph_db(context: AssetExecutionContext, config: MemgraphConfig) -> MaterializeResult:
+    """
+    Dagster asset that ingests music data into the Memgraph database.
+    
+    This asset performs the following timed phases:
+    1. Clears the existing database (unless `config.incremental` is set).
+    2. Creates indexes for performance and `id` uniqueness constraints.
+    3. Loads Genres, Artists, Albums, and Tracks nodes from JSONL files, in
+       batched UNWIND queries of `config.batch_size` rows. Invalid records and
+       duplicate ids are skipped.
+    4. Establishes relationships between nodes (e.g., Artist-Genre, Album-Artist).
+       With `config.edge_mode` "client" (the default), the edge lists are built
+       with Polars from the datasets and created in batched UNWIND queries; with
+       "server", they are matched from temporary node properties, which are
+       removed afterwards.
+    5. With `config.analytical_mode` (by default, on full reloads only),
+       phases 3 and 4 run in analytical storage mode; the database is switched
+       back to transactional mode at the end.
+
+    With `config.workers` > 1, phases 3 and 4 write over a pool of connections:
+    node rows are partitioned by id hash, and relationships are scheduled so
+    that no two connections write edges between the same nodes at once.
+
+    Every node stores a hash of its properties. With `config.incremental`, the
+    database is not cleared: nodes and relationships are compared with the
+    datasets, and only the inserted, updated and deleted ones are written.
+
+    Args:
+        context: The Dagster asset execution context.
+        config: Configuration for the Memgraph connection.
+
+    Returns:
+        MaterializeResult: Metadata about the number of nodes loaded, the time and
+            throughput of each label, relationship type and phase, and status.
+
+    Raises:
+        ValueError: If `config.edge_mode` is unknown, or incremental loading is
+            requested with the 'server' edge mode.
+    """
+    edge_mode = config.edge_mode
+    if edge_mode not in ("client", "server"):
+        raise ValueError(f"Unknown edge mode '{edge_mode}', expected 'client' or 'server'.")
+    if config.incremental and edge_mode != "client":
+        raise ValueError("Incremental loading requires the 'client' edge mode.")
+
+    memgraph = get_memgraph_client(config)
+    phases: Dict[str, float] = {}
+    metadata: Dict[str, Any] = {}
+
+    # --- Phase 1: Clear Database ---
+    if not config.incremental:
+        with _timed_phase("clear", phases, context):
+            clear_database(memgraph, context)
+
+    # --- Phase 2: Indexes & Constraints ---
+    # Created before any data: the id indexes serve the lookups of the
+    # relationship and diff queries, and the constraints reject duplicate ids
+    with _timed_phase("schema", phases, context):
+        create_indexes(memgraph, context, reference_properties=edge_mode == "server")
+        create_constraints(memgraph, context)
+
+    analytical_mode = (
+        config.analytical_mode
+        if config.analytical_mode is not None
+        else not config.incremental
+    )
+    if analytical_mode:
+        set_storage_mode(memgraph, STORAGE_MODE_ANALYTICAL)
+    # Batches are written over a pool of connections, partitioned by node id
+    pool = (
+        MemgraphPool(lambda: get_memgraph_client(config), config.workers)
+        if config.workers > 1
+        else None
+    )
+    writer = pool or memgraph
+    load_failed = False
+    try:
+        # --- Phase 3: Node Ingestion ---
+        with _timed_phase("nodes", phases, context):
+            metadata.update(_load_nodes(writer, context, config))
+
+        # --- Phase 4: Relationship Ingestion ---
+        with _timed_phase("relationships", phases, context):
+            if edge_mode == "client":
+                metadata.update(_load_edges(writer, context, config))
+            else:
+                _create_edges_from_properties(memgraph, context)
+    except BaseException:
+        load_failed = True
+        raise
+    finally:
+        if pool:
+            pool.close()
+        # --- Phase 5: Back to Transactional Mode ---
+        if analytical_mode:
+            try:
+                with _timed_phase("storage_mode", phases, context):
+                    set_storage_mode(memgraph, STORAGE_MODE_TRANSACTIONAL)
+            except Exception as e:
+                context.log.error(
+                    f"Failed to switch back to {STORAGE_MODE_TRANSACTIONAL}: {e}"
+                )
+                # Don't mask the error that failed the load
+                if not load_failed:
+                    raise
+
     context.log.info("Graph population complete.")
 
-    return MaterializeResult(
-        metadata={
-            "nodes_loaded": {
-                "genres": len(genres_data),
-                "artists": len(artists_data),
-                "albums": album_count,
-                "tracks": track_count
-            },
-            "status": "success"
+    if config.incremental:
+        metadata["changes"] = {
+            "nodes": metadata.pop("node_changes"),
+            "edges": metadata.pop("edge_changes"),
+        }
+    metadata.update(
+        {
+            "phases": phases,
+            "batch_size": config.batch_size,
+            "workers": config.workers,
+            "conflict_retries": pool.retries if pool else 0,
+            "mode": "incremental" if config.incremental else "full",
+            "status": "success",
         }
-    )
\ No newline at end of file
+    )
+    return MaterializeResult(metadata=metadata)
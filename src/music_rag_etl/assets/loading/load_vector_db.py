@@ -8,7 +8,7 @@ import json
 import hashlib
 import os
 from pathlib import Path
-from typing import List, Tuple
+from typing import Iterable, Iterator, List, Tuple
 
 # 1. Disable Parallelism to prevent deadlocks
 os.environ["TOKENIZERS_PARALLELISM"] = "false"
@@ -112,7 +112,14 @@ def get_chroma_collection(
     return collection, emb_fn
 
 
-def read_and_process_data(file_path: Path) -> Tuple[List[str], List[dict], List[str]]:
+def read_and_process_data(
+    file_path: Path,
+    batch_size: int = BATCH_SIZE,
+) -> Iterator[Tuple[List[str], List[dict], List[str]]]:
+    """
+    Streams the JSONL file and yields (documents, metadatas, ids) batches of up
+    to `batch_size` chunks, so memory use doesn't grow with the file size.
+    """
     documents: List[str] = []
     metadatas: List[dict] = []
     ids: List[str] = []
@@ -164,38 +171,33 @@ def read_and_process_data(file_path: Path) -> Tuple[List[str], List[dict], List[
                 doc_id = hashlib.md5(f"{article_text}-{index}".encode("utf-8")).hexdigest()
                 ids.append(doc_id)
 
-    return documents, metadatas, ids
+                if len(documents) >= batch_size:
+                    yield documents, metadatas, ids
+                    documents, metadatas, ids = [], [], []
+
+    if documents:
+        yield documents, metadatas, ids
 
 
 def ingest_data(
     collection: Collection,
-    documents: List[str],
-    metadatas: List[dict],
-    ids: List[str],
-    batch_size: int = BATCH_SIZE,
+    batches: Iterable[Tuple[List[str], List[dict], List[str]]],
 ) -> None:
-    if not documents:
-        print("No valid documents were found to ingest.")
-        return
-
-    print(f"Adding {len(documents)} documents to Chroma collection...")
-
-    total_batches = (len(documents) + batch_size - 1) // batch_size
-    for i in tqdm(
-        range(0, len(documents), batch_size),
-        total=total_batches,
-        desc="Ingesting documents",
-    ):
-        batch_documents = documents[i: i + batch_size]
-        batch_metadatas = metadatas[i: i + batch_size]
-        batch_ids = ids[i: i + batch_size]
+    print("Adding documents to Chroma collection...")
 
+    total_documents = 0
+    for batch_documents, batch_metadatas, batch_ids in tqdm(batches, desc="Ingesting batches"):
         collection.upsert(
             ids=batch_ids,
             documents=batch_documents,
             metadatas=batch_metadatas,
         )
-    print("Success! Data ingested.")
+        total_documents += len(batch_documents)
+
+    if not total_documents:
+        print("No valid documents were found to ingest.")
+        return
+    print(f"Success! {total_documents} documents ingested.")
 
 
 def test_query(collection: Collection, emb_fn: NomicEmbeddingFunction) -> None:
@@ -226,8 +228,8 @@ def main() -> None:
     collection, emb_fn = get_chroma_collection(
         CHROMA_DB_PATH, DEFAULT_COLLECTION_NAME, device
     )
-    documents, metadatas, ids = read_and_process_data(WIKIPEDIA_ARTICLES_FILE)
-    ingest_data(collection, documents, metadatas, ids, BATCH_SIZE)
+    batches = read_and_process_data(WIKIPEDIA_ARTICLES_FILE, BATCH_SIZE)
+    ingest_data(collection, batches)
     test_query(collection, emb_fn)
 
 
@@ -2,13 +2,15 @@ from pathlib import Path
 import polars as pl
 from dagster import asset, AssetExecutionContext
 from music_rag_etl.settings import ARTIST_INDEX, ARTIST_INDEX_PRE_CLEAN
+from music_rag_etl.utils.dataset_helpers import write_dataset
 
 
 @asset(
     name="preprocess_artist_index",
     deps=["build_artist_index"],
     description="Different text preprocessing tasks in the Artists Index",
-    group_name="text_preprocessing"
+    group_name="text_preprocessing",
+    io_manager_key="parquet_io_manager",
 )
 def preprocess_artist_index(context: AssetExecutionContext) -> Path:
     """
@@ -56,8 +58,8 @@ def preprocess_artist_index(context: AssetExecutionContext) -> Path:
     # Drop temporary columns
     clean_lf = clean_lf.drop(["min_refs", "max_refs"])
 
-    # 4. Collect & Save
-    clean_lf.collect().write_ndjson(ARTIST_INDEX)
+    # 4. Collect & Save as Parquet, plus the JSONL export
+    write_dataset(clean_lf.collect(), ARTIST_INDEX)
 
     context.log.info(f"Preprocessed artist index saved to {ARTIST_INDEX}")
 
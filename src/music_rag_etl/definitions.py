@@ -11,6 +11,7 @@ from music_rag_etl.assets.extraction import (
 )
 from music_rag_etl.assets.transformation import preprocess_artist_index
 from music_rag_etl.assets.loading import load_graph_db
+from music_rag_etl.utils.dataset_helpers import ParquetDatasetIOManager
 
 
 # Create a list of all asset modules
@@ -37,6 +38,8 @@ defs = Definitions(
             "lastfm_api_key": EnvVar("LASTFM_API_KEY"),
             "lastfm_api_url": EnvVar("LASTFM_API_URL"),
             "nomic_api_key": EnvVar("NOMIC_API_KEY"),
-        }
+        },
+        # Stores the intermediate datasets as Parquet next to their JSONL export
+        "parquet_io_manager": ParquetDatasetIOManager(),
     },
 )
@@ -2,6 +2,7 @@
 Centralized configuration settings for the musicRAG ETL project.
 """
 
+import os
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -36,6 +37,56 @@ WIKIPEDIA_CACHE_DIR = DATA_DIR / ".cache" / "wikipedia_articles"
 WIKIDATA_CACHE_DIR = DATA_DIR / ".cache" / "wikidata"
 LASTFM_CACHE_DIR = DATA_DIR / ".cache" / "last_fm"
 
+# --- Cache Backends ---
+# "sqlite" keeps all Wikidata responses in a single WAL-mode database file;
+# "file" keeps the legacy layout of one JSON file per key in WIKIDATA_CACHE_DIR.
+WIKIDATA_CACHE_BACKEND = "sqlite"
+WIKIDATA_CACHE_DB = WIKIDATA_CACHE_DIR / "wikidata_cache.sqlite3"
+
+# --- Cache Compression ---
+# "zstd" compresses new cache entries (requires the `zstandard` package); None
+# stores them uncompressed. Entries are always read transparently either way.
+CACHE_COMPRESSION = os.getenv("CACHE_COMPRESSION") or None
+CACHE_COMPRESSION_LEVEL = 3
+# A trained zstd dictionary stored in a cache directory under this name is
+# used for that cache, which greatly improves the ratio of small records.
+CACHE_DICTIONARY_FILENAME = "zstd.dict"
+CACHE_DICTIONARY_SIZE = 112 * 1024  # Bytes, the zstd CLI default
+
+# --- In-Memory Cache Tier ---
+# Byte budget of the process-wide LRU tier in front of each on-disk cache,
+# measured as the serialized JSON (or text) size of the entries. 0 disables it.
+MEMORY_CACHE_LIMITS = {
+    "wikidata": 256 * 1024 * 1024,
+    "lastfm": 64 * 1024 * 1024,
+    "wikipedia": 128 * 1024 * 1024,
+}
+
+# --- Cache Expiry & Size Limits ---
+# Per-cache policies: seconds until positive and negative entries expire (None
+# never expires), and the maximum total size in bytes enforced by
+# `python -m scripts.compact_caches`, which evicts least recently used entries
+# (None is unbounded). Negative entries are API errors and missing entities.
+# Expired Wikidata entities and Wikipedia articles are revalidated against their
+# latest revision by the compaction, so only changed ones are re-downloaded.
+CACHE_POLICIES = {
+    "wikidata": {
+        "positive_ttl": 180 * 24 * 3600,
+        "negative_ttl": 7 * 24 * 3600,
+        "max_bytes": 4 * 1024 ** 3,
+    },
+    "lastfm": {
+        "positive_ttl": 90 * 24 * 3600,
+        "negative_ttl": 7 * 24 * 3600,
+        "max_bytes": 1024 ** 3,
+    },
+    "wikipedia": {
+        "positive_ttl": 180 * 24 * 3600,
+        "negative_ttl": 7 * 24 * 3600,
+        "max_bytes": 4 * 1024 ** 3,
+    },
+}
+
 # --- Temporal Directory ---
 # For intermediate files during ETL processes.
 PATH_TEMP = DATA_DIR / ".temp"
@@ -62,6 +113,20 @@ GENRES_FILE = DATA_DIR / "datasets" / "genres.jsonl"
 ALBUMS_FILE = DATA_DIR / "datasets" / "albums.jsonl"
 TRACKS_FILE = DATA_DIR / "datasets" / "tracks.jsonl"
 
+# --- Columnar Datasets ---
+# Datasets handled by the Parquet IO manager, keyed by the asset that produces
+# them. Each one is stored as a Parquet file next to its JSONL export.
+DATASET_FILES = {
+    "preprocess_artist_index": ARTIST_INDEX,
+    "extract_genres": GENRES_FILE,
+    "extract_artist": ARTISTS_FILE,
+    "extract_albums": ALBUMS_FILE,
+    "extract_tracks": TRACKS_FILE,
+    "extract_wikipedia_articles": WIKIPEDIA_ARTICLES_FILE,
+}
+PARQUET_COMPRESSION = "zstd"
+PARQUET_COMPRESSION_LEVEL = 3
+
 # ==============================================================================
 #  API & SERVICE CONFIGURATION
 # ==============================================================================
@@ -90,6 +155,45 @@ LASTFM_REQUEST_TIMEOUT = 10
 LASTFM_MAX_RETRIES = 3
 LASTFM_RETRY_DELAY = 1
 
+# --- Rate Limits ---
+# Requests per second and burst capacity per host. Every async request to one
+# of these hosts draws from a single shared token bucket.
+HOST_RATE_LIMITS = {
+    "ws.audioscrobbler.com": (LASTFM_MAX_RPS, LASTFM_MAX_RPS),  # Last.fm
+    "www.wikidata.org": (10, 20),  # Wikidata Action API
+    "query.wikidata.org": (5, 5),  # Wikidata SPARQL endpoint
+    "en.wikipedia.org": (20, 40),  # Wikipedia API
+}
+
+# Initial and maximum concurrent requests per host. The limit adapts between
+# 1 and the maximum (AIMD), backing off on 429/503 responses and timeouts.
+HOST_CONCURRENCY_LIMITS = {
+    "ws.audioscrobbler.com": (10, 50),
+    "www.wikidata.org": (5, 50),
+    "query.wikidata.org": (2, 5),  # WDQS allows 5 parallel queries per client
+    "en.wikipedia.org": (5, 20),
+}
+
+# --- Retries ---
+RETRY_MAX_BACKOFF = 60  # Upper bound (seconds) of the jittered backoff
+# Process-wide retry budget: retries refilled per second and maximum burst
+RETRY_BUDGET_RATE = 1.0
+RETRY_BUDGET_BURST = 50
+# Consecutive failures that open a host's circuit, and seconds until a probe
+CIRCUIT_BREAKER_FAILURE_THRESHOLD = 10
+CIRCUIT_BREAKER_RESET_TIMEOUT = 30
+
+# --- HTTP Connection Pools ---
+# Sync (requests): number of per-host pools cached, and connections kept per host
+HTTP_POOL_CONNECTIONS = 10
+HTTP_POOL_MAXSIZE = 32
+# Async (aiohttp): total and per-host connection limits. The per-host limit
+# must not be lower than the largest value in HOST_CONCURRENCY_LIMITS.
+HTTP_CONNECTION_LIMIT = 100
+HTTP_CONNECTION_LIMIT_PER_HOST = 50
+HTTP_DNS_CACHE_TTL = 300  # Seconds
+HTTP_KEEPALIVE_TIMEOUT = 30  # Seconds an idle connection is kept open
+
 # --- ChromaDB ---
 DEFAULT_MODEL_NAME = "nomic-ai/nomic-embed-text-v1.5"
 DEFAULT_COLLECTION_NAME = "musicrag_collection"
@@ -101,12 +205,46 @@ DEFAULT_COLLECTION_NAME = "musicrag_collection"
 
 BATCH_SIZE = 32
 WIKIDATA_BATCH_SIZE = 400
+# Entity parts requested from wbgetentities by default, and the only claims kept
+# when entities are cached: country of origin (P495), country of citizenship
+# (P27) and MusicBrainz artist ID (P434). Cached entities are projected on read,
+# so adding a claim here requires clearing the entity cache to fetch it.
+WIKIDATA_ENTITY_PROPS = "labels|aliases|claims"
+WIKIDATA_CLAIM_WHITELIST = ["P495", "P27", "P434"]
+# wbgetentities accepts up to 50 IDs per request. Entity lookups from concurrent
+# tasks are micro-batched: a request is sent as soon as this many QIDs are
+# waiting, or WIKIDATA_MICROBATCH_DELAY seconds after the first one.
+WIKIDATA_API_MAX_IDS = 50
+WIKIDATA_MICROBATCH_DELAY = 0.005
+# Number of date partitions of a decade fetched concurrently from the SPARQL endpoint
+SPARQL_PARTITION_WORKERS = 4
 CHUNK_SIZE = 50
+# Number of artists bound in one VALUES block of the batched album SPARQL query
+ALBUMS_SPARQL_BATCH_SIZE = 50
+# Initial number of albums per batched track SPARQL query (halved on timeouts)
+TRACKS_SPARQL_BATCH_SIZE = 50
 REQUEST_TIMEOUT_SECONDS = 65
 RATE_LIMIT_DELAY = 1
+# JSON codec used for caches and datasets: "orjson", "msgspec" or "json".
+# When unset, the fastest installed library is used.
+JSON_CODEC = os.getenv("JSON_CODEC") or None
+# Buffered JSONL sinks: bytes buffered before a write, and max seconds between writes
+JSONL_SINK_BUFFER_SIZE = 1 << 20
+JSONL_SINK_FLUSH_INTERVAL = 5.0
 
 ENABLE_LOGGING = True
 
+# --- Memgraph Loading ---
+# Rows sent per `UNWIND $rows ...` query when loading the graph. Larger batches
+# mean fewer Bolt round trips, at the cost of bigger transactions.
+MEMGRAPH_BATCH_SIZE = 5000
+# Connections (one thread each) writing the batches in parallel; roughly the
+# number of cores of the database. Write conflicts are retried with jittered
+# backoff, starting at MEMGRAPH_RETRY_DELAY seconds.
+MEMGRAPH_WORKERS = 4
+MEMGRAPH_MAX_RETRIES = 5
+MEMGRAPH_RETRY_DELAY = 0.1
+
 # --- Wikidata Extraction ---
 DECADES_TO_EXTRACT = {
     "1960s": (1960, 1969),
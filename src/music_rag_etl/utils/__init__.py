@@ -6,3 +6,5 @@ from . import io_helpers
 from . import wikipedia_helpers
 from . import concurrency_helpers
 from . import lastfm_helpers
+from . import cache_helpers
+from . import wikidata_dump_helpers
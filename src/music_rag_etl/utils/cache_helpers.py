@@ -0,0 +1,1000 @@
+"""
+Pluggable key-value cache backends for raw API responses.
+
+The default backend is a single SQLite database in WAL mode, which replaces the
+legacy layout of one JSON file per key. Both backends expose bulk
+`get_many`/`put_many` so a whole API batch costs a single round trip.
+
+Entries are serialized through a `CacheCodec`, which can compress them with
+zstd (optionally with a dictionary trained on the cache itself) and reads
+compressed and legacy uncompressed entries alike.
+
+Each backend follows a `CachePolicy`: expired entries are treated as misses,
+and `CacheBackend.compact` deletes them and evicts the least recently used
+entries above the cache's size limit.
+"""
+
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from music_rag_etl.settings import (
+    CACHE_COMPRESSION,
+    CACHE_COMPRESSION_LEVEL,
+    CACHE_DICTIONARY_FILENAME,
+    CACHE_DICTIONARY_SIZE,
+    CACHE_POLICIES,
+    MEMORY_CACHE_LIMITS,
+)
+from music_rag_etl.utils.io_helpers import chunk_list, json_dumps, json_loads
+
+# SQLite limits the number of bound parameters per statement (999 on old builds).
+SQLITE_MAX_VARIABLES = 900
+
+# Every zstd frame starts with this magic number. Neither JSON nor UTF-8 text
+# can start with it, so compressed entries are detected without a flag.
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+# The last access of an entry is recorded at most once per this many seconds,
+# so reads of hot entries do not turn into writes.
+ACCESS_TIME_RESOLUTION = 60 * 60
+
+
+class CacheCodec:
+    """
+    Converts cache entries to and from bytes, optionally compressing with zstd.
+
+    Decoding is transparent: zstd frames are decompressed (with the dictionary
+    if they were compressed with one) and anything else is returned unchanged,
+    so caches written before compression was enabled stay readable.
+    """
+
+    def __init__(
+        self,
+        compression: Optional[str] = None,
+        level: int = CACHE_COMPRESSION_LEVEL,
+        dictionary: Optional[bytes] = None,
+    ):
+        """
+        Args:
+            compression: "zstd" to compress new entries, or None to store them as-is.
+            level: The zstd compression level.
+            dictionary: An optional trained zstd dictionary.
+
+        Raises:
+            ValueError: If the compression type is unknown.
+        """
+        if compression not in (None, "zstd"):
+            raise ValueError(f"Unknown cache compression: {compression}")
+        self.compression = compression
+        self.level = level
+        self.dictionary = dictionary
+        # zstd (de)compression contexts must not be shared between threads
+        self._local = threading.local()
+
+    def _get_compressor(self):
+        compressor = getattr(self._local, "compressor", None)
+        if compressor is None:
+            import zstandard
+
+            dict_data = None
+            if self.dictionary:
+                dict_data = zstandard.ZstdCompressionDict(self.dictionary)
+            compressor = zstandard.ZstdCompressor(level=self.level, dict_data=dict_data)
+            self._local.compressor = compressor
+        return compressor
+
+    def _get_decompressor(self, with_dictionary: bool):
+        attribute = "dict_decompressor" if with_dictionary else "decompressor"
+        decompressor = getattr(self._local, attribute, None)
+        if decompressor is None:
+            import zstandard
+
+            dict_data = None
+            if with_dictionary:
+                dict_data = zstandard.ZstdCompressionDict(self.dictionary)
+            decompressor = zstandard.ZstdDecompressor(dict_data=dict_data)
+            setattr(self._local, attribute, decompressor)
+        return decompressor
+
+    def encode(self, data: bytes) -> bytes:
+        """Compresses raw entry bytes if compression is enabled."""
+        if self.compression is None:
+            return data
+        return self._get_compressor().compress(data)
+
+    def decode(self, data: Union[bytes, str]) -> Union[bytes, str]:
+        """
+        Decompresses an entry if it is a zstd frame, otherwise returns it as-is.
+
+        Raises:
+            ValueError: If a compressed entry cannot be decompressed, e.g. because
+                it was written with a different dictionary.
+        """
+        if isinstance(data, str) or not data.startswith(ZSTD_MAGIC):
+            return data
+        import zstandard
+
+        try:
+            dict_id = zstandard.get_frame_parameters(data).dict_id
+            if dict_id and not self.dictionary:
+                raise ValueError(f"Entry needs zstd dictionary {dict_id}, none is loaded")
+            return self._get_decompressor(with_dictionary=bool(dict_id)).decompress(data)
+        except zstandard.ZstdError as e:
+            raise ValueError(f"Could not decompress cache entry: {e}") from e
+
+    def dumps(self, value: Any) -> bytes:
+        """Serializes a value to JSON and encodes it."""
+        return self.encode(json_dumps(value).encode("utf-8"))
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        """
+        Decodes an entry and parses it as JSON.
+
+        Raises:
+            ValueError: If the entry is corrupted (json.JSONDecodeError included).
+        """
+        return json_loads(self.decode(data))
+
+
+def load_cache_codec(
+    cache_dir: Path, compression: Optional[str] = CACHE_COMPRESSION
+) -> CacheCodec:
+    """
+    Builds the codec of a cache, using its trained dictionary if there is one.
+
+    Args:
+        cache_dir: The cache directory, which may hold a CACHE_DICTIONARY_FILENAME.
+        compression: The compression for new entries, "zstd" or None.
+
+    Returns:
+        The configured CacheCodec.
+    """
+    try:
+        dictionary = (cache_dir / CACHE_DICTIONARY_FILENAME).read_bytes()
+    except FileNotFoundError:
+        dictionary = None
+    return CacheCodec(compression, dictionary=dictionary)
+
+
+@lru_cache(maxsize=None)
+def get_cache_codec(cache_dir: Path) -> CacheCodec:
+    """
+    Returns the process-wide codec of a cache directory, as configured in settings.
+    """
+    return load_cache_codec(cache_dir)
+
+
+class CachePolicy:
+    """
+    Expiry and size limits of a cache.
+
+    Negative entries (API errors, missing entities, empty values, SPARQL
+    responses without bindings) have their
+    own TTL, usually much shorter than that of positive entries, so that a
+    transient failure is not cached for as long as a valid response.
+    """
+
+    def __init__(
+        self,
+        positive_ttl: Optional[float] = None,
+        negative_ttl: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+    ):
+        """
+        Args:
+            positive_ttl: Seconds until a positive entry expires, or None for never.
+            negative_ttl: Seconds until a negative entry expires, or None for never.
+            max_bytes: Maximum total size of the entries, or None for unbounded.
+        """
+        self.positive_ttl = positive_ttl
+        self.negative_ttl = negative_ttl
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def is_negative(value: Any) -> bool:
+        """
+        Checks whether an entry records a failed lookup rather than data.
+        """
+        if isinstance(value, dict):
+            if not value or "error" in value or "missing" in value:
+                return True
+            # A SPARQL response without results
+            results = value.get("results")
+            return isinstance(results, dict) and not results.get("bindings")
+        return not value
+
+    def is_expired(self, value: Any, written_at: float, now: Optional[float] = None) -> bool:
+        """
+        Checks whether an entry written at `written_at` (a Unix timestamp) has expired.
+        """
+        ttl = self.negative_ttl if self.is_negative(value) else self.positive_ttl
+        if ttl is None:
+            return False
+        return (now or time.time()) - written_at > ttl
+
+
+@lru_cache(maxsize=None)
+def get_cache_policy(name: str) -> CachePolicy:
+    """
+    Returns the policy of a named cache, as configured in CACHE_POLICIES.
+    Unknown caches never expire and are unbounded.
+    """
+    return CachePolicy(**CACHE_POLICIES.get(name, {}))
+
+
+def is_cache_file_expired(path: Path, value: Any, policy: CachePolicy) -> bool:
+    """
+    Checks a cache file read outside a backend against a policy, using its
+    modification time as the write time. Files that cannot be stat'ed are
+    treated as fresh.
+    """
+    try:
+        written_at = path.stat().st_mtime
+    except OSError:
+        return False
+    return policy.is_expired(value, written_at)
+
+
+class CacheEntryInfo(NamedTuple):
+    """Bookkeeping of a cache entry, used for expiry and eviction."""
+    key: str
+    written_at: float
+    accessed_at: float
+    size: int
+
+
+def train_cache_dictionary(
+    samples: List[bytes], dict_size: int = CACHE_DICTIONARY_SIZE
+) -> bytes:
+    """
+    Trains a zstd dictionary on uncompressed cache entries.
+
+    Small records (single entities, Last.fm responses) share most of their keys
+    and structure, which a dictionary captures once instead of in every entry.
+
+    Args:
+        samples: Uncompressed entries, ideally a few thousand of them.
+        dict_size: The maximum dictionary size in bytes.
+
+    Returns:
+        The dictionary, ready to be saved as CACHE_DICTIONARY_FILENAME.
+    """
+    import zstandard
+
+    return zstandard.train_dictionary(dict_size, samples).as_bytes()
+
+
+class CacheBackend(ABC):
+    """
+    Abstract key-value store for JSON-serializable cache entries.
+
+    Backends implement the raw storage (`_load_many`, `put_many`, ...), while
+    expiry under `policy` and compaction are shared.
+    """
+
+    policy: CachePolicy = CachePolicy()
+
+    @abstractmethod
+    def _load_many(self, keys: List[str]) -> Dict[str, Tuple[Any, CacheEntryInfo]]:
+        """
+        Reads entries with their bookkeeping, expired or not. Missing and
+        unreadable entries are omitted.
+        """
+
+    @abstractmethod
+    def _touch_many(self, keys: List[str], now: float) -> None:
+        """
+        Records an access to the given keys at `now`.
+        """
+
+    @abstractmethod
+    def put_many(self, items: Dict[str, Any]) -> None:
+        """
+        Stores (or overwrites) all the given key-value pairs.
+        """
+
+    @abstractmethod
+    def delete_many(self, keys: Iterable[str]) -> None:
+        """
+        Removes the given keys from the cache. Missing keys are ignored.
+        """
+
+    @abstractmethod
+    def renew_many(self, keys: Iterable[str]) -> None:
+        """
+        Restarts the TTL of the given entries without rewriting them (e.g.,
+        after confirming they are still up to date).
+        """
+
+    @abstractmethod
+    def iter_entry_info(self) -> Iterator[CacheEntryInfo]:
+        """
+        Iterates over the bookkeeping of all entries currently stored.
+        """
+
+    def iter_keys(self) -> Iterator[str]:
+        """
+        Iterates over all keys currently stored in the cache.
+        """
+        for info in self.iter_entry_info():
+            yield info.key
+
+    def get_many(self, keys: Iterable[str], include_expired: bool = False) -> Dict[str, Any]:
+        """
+        Returns the cached values for the given keys. Missing keys are omitted,
+        and so are expired ones unless `include_expired` is set.
+        """
+        now = time.time()
+        results = {}
+        stale_keys = []
+        for key, (value, info) in self._load_many(list(dict.fromkeys(keys))).items():
+            if not include_expired and self.policy.is_expired(value, info.written_at, now):
+                continue
+            results[key] = value
+            if info.accessed_at < now - ACCESS_TIME_RESOLUTION:
+                stale_keys.append(key)
+        if stale_keys:
+            self._touch_many(stale_keys, now)
+        return results
+
+    def get(self, key: str) -> Optional[Any]:
+        """Returns the cached value for a single key, or None on a miss."""
+        return self.get_many([key]).get(key)
+
+    def peek_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """
+        Returns the values that can be served without I/O (e.g., from memory),
+        so async callers can skip a worker thread on a full hit.
+        """
+        return {}
+
+    def put(self, key: str, value: Any) -> None:
+        """Stores a single key-value pair."""
+        self.put_many({key: value})
+
+    def compact(
+        self,
+        max_bytes: Optional[int] = None,
+        revalidate: Optional[Callable[[Dict[str, Any]], Iterable[str]]] = None,
+        batch_size: int = 1000,
+    ) -> Dict[str, int]:
+        """
+        Deletes expired and unreadable entries, then evicts the least recently
+        used entries until the cache fits in `max_bytes`.
+
+        Args:
+            max_bytes: Maximum total size of the entries. Defaults to the
+                policy's limit.
+            revalidate: Optional callback receiving expired positive entries
+                and returning the keys whose upstream data has not changed.
+                Those entries are renewed instead of deleted.
+            batch_size: Number of entries read at a time.
+
+        Returns:
+            The number of expired, renewed and evicted entries, and the number
+            of entries and bytes left.
+        """
+        if max_bytes is None:
+            max_bytes = self.policy.max_bytes
+        now = time.time()
+        stats = {"expired": 0, "renewed": 0, "evicted": 0}
+        remaining: List[CacheEntryInfo] = []
+
+        for info_chunk in chunk_list(list(self.iter_entry_info()), batch_size):
+            loaded = self._load_many([info.key for info in info_chunk])
+            expired_keys = []
+            candidates = {}
+            for info in info_chunk:
+                if info.key not in loaded:
+                    expired_keys.append(info.key)  # Unreadable entry
+                    continue
+                value = loaded[info.key][0]
+                if not self.policy.is_expired(value, info.written_at, now):
+                    remaining.append(info)
+                elif revalidate is not None and not self.policy.is_negative(value):
+                    candidates[info.key] = value
+                else:
+                    expired_keys.append(info.key)
+
+            if candidates:
+                unchanged = set(revalidate(candidates)) & candidates.keys()
+                self.renew_many(unchanged)
+                stats["renewed"] += len(unchanged)
+                # Renewing an entry also records it as accessed
+                remaining.extend(
+                    info._replace(written_at=now, accessed_at=now)
+                    for info in info_chunk
+                    if info.key in unchanged
+                )
+                expired_keys.extend(key for key in candidates if key not in unchanged)
+            self.delete_many(expired_keys)
+            stats["expired"] += len(expired_keys)
+
+        total_bytes = sum(info.size for info in remaining)
+        if max_bytes is not None and total_bytes > max_bytes:
+            evicted = set()
+            for info in sorted(remaining, key=lambda info: info.accessed_at):
+                if total_bytes <= max_bytes:
+                    break
+                evicted.add(info.key)
+                total_bytes -= info.size
+            self.delete_many(evicted)
+            stats["evicted"] = len(evicted)
+            remaining = [info for info in remaining if info.key not in evicted]
+
+        stats["entries"] = len(remaining)
+        stats["bytes"] = total_bytes
+        return stats
+
+    def close(self) -> None:
+        """Releases any resources held by the backend."""
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """
+    Cache backend storing all entries in a single SQLite database in WAL mode.
+
+    A single connection is shared across threads and guarded by a lock, so the
+    backend can be used from `asyncio.to_thread` workers.
+    """
+
+    # Bookkeeping columns, added in place to databases created without them
+    METADATA_COLUMNS = {"written_at": "REAL", "accessed_at": "REAL", "size": "INTEGER"}
+
+    def __init__(
+        self,
+        db_path: Path,
+        codec: Optional[CacheCodec] = None,
+        policy: Optional[CachePolicy] = None,
+    ):
+        """
+        Opens (or creates) the cache database.
+
+        Args:
+            db_path: Path to the SQLite database file.
+            codec: The entry codec. Defaults to uncompressed entries.
+            policy: The expiry policy. Defaults to entries that never expire.
+        """
+        self.db_path = db_path
+        self.codec = codec or CacheCodec()
+        self.policy = policy or CachePolicy()
+        self._lock = threading.Lock()
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            str(db_path), check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL;")
+        self._conn.execute("PRAGMA synchronous=NORMAL;")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "written_at REAL, accessed_at REAL, size INTEGER);"
+        )
+        self._add_metadata_columns()
+
+    def _get_missing_columns(self) -> List[str]:
+        """Returns the bookkeeping columns the cache table doesn't have yet."""
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(cache);")}
+        return [name for name in self.METADATA_COLUMNS if name not in columns]
+
+    def _add_metadata_columns(self) -> None:
+        """
+        Upgrades a database created before entries had bookkeeping. Existing
+        entries are treated as written now.
+
+        Several processes may open the same legacy database at once, so the
+        upgrade holds the write lock and checks the columns again once it has it.
+        """
+        if not self._get_missing_columns():
+            return
+        self._conn.execute("BEGIN IMMEDIATE;")
+        try:
+            missing_columns = self._get_missing_columns()
+            for name in missing_columns:
+                self._conn.execute(
+                    f"ALTER TABLE cache ADD COLUMN {name} {self.METADATA_COLUMNS[name]};"
+                )
+            if missing_columns:
+                now = time.time()
+                self._conn.execute(
+                    "UPDATE cache SET written_at = ?, accessed_at = ?, size = length(value) "
+                    "WHERE written_at IS NULL;",
+                    (now, now),
+                )
+            self._conn.execute("COMMIT;")
+        except Exception:
+            self._conn.execute("ROLLBACK;")
+            raise
+
+    def _load_many(self, keys: List[str]) -> Dict[str, Tuple[Any, CacheEntryInfo]]:
+        results = {}
+        with self._lock:
+            for key_chunk in chunk_list(keys, SQLITE_MAX_VARIABLES):
+                placeholders = ",".join("?" * len(key_chunk))
+                rows = self._conn.execute(
+                    "SELECT key, value, written_at, accessed_at, size FROM cache "
+                    f"WHERE key IN ({placeholders});",
+                    key_chunk,
+                ).fetchall()
+                for key, value, written_at, accessed_at, size in rows:
+                    try:
+                        results[key] = (
+                            self.codec.loads(value),
+                            CacheEntryInfo(key, written_at, accessed_at, size),
+                        )
+                    except ValueError:
+                        continue  # Corrupted entry, treat as a miss
+        return results
+
+    def _touch_many(self, keys: List[str], now: float) -> None:
+        self._update_many(keys, "accessed_at = ?", (now,))
+
+    def renew_many(self, keys: Iterable[str]) -> None:
+        now = time.time()
+        self._update_many(list(keys), "written_at = ?, accessed_at = ?", (now, now))
+
+    def _update_many(self, keys: List[str], assignments: str, values: Tuple) -> None:
+        """Runs an UPDATE of the given columns on a list of keys."""
+        with self._lock:
+            for key_chunk in chunk_list(keys, SQLITE_MAX_VARIABLES):
+                placeholders = ",".join("?" * len(key_chunk))
+                self._conn.execute(
+                    f"UPDATE cache SET {assignments} WHERE key IN ({placeholders});",
+                    (*values, *key_chunk),
+                )
+
+    def put_many(self, items: Dict[str, Any]) -> None:
+        if not items:
+            return
+        now = time.time()
+        # Values are stored as BLOBs; entries written before are TEXT
+        rows = []
+        for key, value in items.items():
+            data = self.codec.dumps(value)
+            rows.append((key, data, now, now, len(data)))
+        with self._lock:
+            self._conn.execute("BEGIN;")
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO cache (key, value, written_at, accessed_at, size) "
+                    "VALUES (?, ?, ?, ?, ?);",
+                    rows,
+                )
+                self._conn.execute("COMMIT;")
+            except Exception:
+                self._conn.execute("ROLLBACK;")
+                raise
+
+    def delete_many(self, keys: Iterable[str]) -> None:
+        with self._lock:
+            for key_chunk in chunk_list(list(keys), SQLITE_MAX_VARIABLES):
+                placeholders = ",".join("?" * len(key_chunk))
+                self._conn.execute(
+                    f"DELETE FROM cache WHERE key IN ({placeholders});", key_chunk
+                )
+
+    def iter_entry_info(self) -> Iterator[CacheEntryInfo]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, written_at, accessed_at, size FROM cache;"
+            ).fetchall()
+        for row in rows:
+            yield CacheEntryInfo(*row)
+
+    def vacuum(self) -> None:
+        """
+        Returns the free pages left by deleted entries to the filesystem. The
+        VACUUM goes through the WAL, so the WAL is truncated afterwards.
+        """
+        with self._lock:
+            self._conn.execute("VACUUM;")
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE);")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class FileCacheBackend(CacheBackend):
+    """
+    Legacy cache backend storing each entry as `{directory}/{key}.json`.
+
+    The modification time of a file is its write time and its access time is
+    the last recorded access (set explicitly, so `noatime` mounts work too).
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        suffix: str = ".json",
+        codec: Optional[CacheCodec] = None,
+        policy: Optional[CachePolicy] = None,
+        text: bool = False,
+    ):
+        """
+        Args:
+            directory: The directory holding one file per cache key.
+            suffix: The file extension used for cache files.
+            codec: The entry codec. Defaults to uncompressed entries.
+            policy: The expiry policy. Defaults to entries that never expire.
+            text: Whether entries are plain text (e.g., Wikipedia articles)
+                rather than JSON.
+        """
+        self.directory = directory
+        self.suffix = suffix
+        self.codec = codec or CacheCodec()
+        self.policy = policy or CachePolicy()
+        self.text = text
+
+    def _path_for(self, key: str) -> Path:
+        return self.directory / f"{key}{self.suffix}"
+
+    def _load_many(self, keys: List[str]) -> Dict[str, Tuple[Any, CacheEntryInfo]]:
+        results = {}
+        for key in keys:
+            try:
+                with open(self._path_for(key), "rb") as f:
+                    data = f.read()
+                    stat = os.fstat(f.fileno())
+                if self.text:
+                    value = self.codec.decode(data).decode("utf-8")
+                else:
+                    value = self.codec.loads(data)
+            except (ValueError, OSError):
+                continue  # Missing or unreadable entry, treat as a miss
+            results[key] = (
+                value,
+                CacheEntryInfo(key, stat.st_mtime, stat.st_atime, stat.st_size),
+            )
+        return results
+
+    def _touch_many(self, keys: List[str], now: float) -> None:
+        for key in keys:
+            path = self._path_for(key)
+            try:
+                os.utime(path, (now, path.stat().st_mtime))
+            except OSError:
+                continue
+
+    def renew_many(self, keys: Iterable[str]) -> None:
+        now = time.time()
+        for key in keys:
+            try:
+                os.utime(self._path_for(key), (now, now))
+            except OSError:
+                continue
+
+    def put_many(self, items: Dict[str, Any]) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for key, value in items.items():
+            if self.text:
+                data = self.codec.encode(value.encode("utf-8"))
+            else:
+                data = self.codec.dumps(value)
+            with open(self._path_for(key), "wb") as f:
+                f.write(data)
+
+    def delete_many(self, keys: Iterable[str]) -> None:
+        for key in keys:
+            self._path_for(key).unlink(missing_ok=True)
+
+    def iter_entry_info(self) -> Iterator[CacheEntryInfo]:
+        if not self.directory.exists():
+            return
+        for cache_file in self.directory.glob(f"*{self.suffix}"):
+            try:
+                stat = cache_file.stat()
+            except OSError:
+                continue  # Deleted meanwhile
+            yield CacheEntryInfo(
+                cache_file.name[: -len(self.suffix)], stat.st_mtime, stat.st_atime, stat.st_size
+            )
+
+
+def _estimate_size(value: Any) -> int:
+    """Estimates the footprint of a cache value as its serialized size."""
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    return len(json_dumps(value))
+
+
+class MemoryCache:
+    """
+    A thread-safe LRU map bounded by the total size of its values.
+
+    Sizes are the serialized JSON (or text) length of each value, which tracks
+    the on-disk footprint rather than the exact Python object size. Values are
+    shared between callers and must not be mutated.
+    """
+
+    def __init__(self, max_bytes: int):
+        """
+        Args:
+            max_bytes: The maximum total size of the values; 0 disables the cache.
+        """
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, Tuple[Any, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, keys: Iterable[str], count_misses: bool = True) -> Dict[str, Any]:
+        """
+        Returns the values held for the given keys, marking them recently used.
+
+        Args:
+            keys: The keys to look up.
+            count_misses: Whether absent keys count as misses (False for a peek
+                that is followed by a lookup in the next tier).
+        """
+        if self.max_bytes <= 0:
+            return {}
+        results = {}
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is None:
+                    if count_misses:
+                        self.misses += 1
+                    continue
+                self._entries.move_to_end(key)
+                self.hits += 1
+                results[key] = entry[0]
+        return results
+
+    def get(self, key: str) -> Optional[Any]:
+        """Returns the value held for a key, or None on a miss."""
+        return self.get_many([key]).get(key)
+
+    def put_many(self, items: Dict[str, Any]) -> None:
+        """
+        Stores the given values, evicting the least recently used ones as needed.
+        Values larger than the whole budget are not stored.
+        """
+        if self.max_bytes <= 0:
+            return
+        sized_items = [(key, value, _estimate_size(value)) for key, value in items.items()]
+        with self._lock:
+            for key, value, size in sized_items:
+                previous = self._entries.pop(key, None)
+                if previous is not None:
+                    self.current_bytes -= previous[1]
+                if size > self.max_bytes:
+                    continue
+                self._entries[key] = (value, size)
+                self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _, (_, size) = self._entries.popitem(last=False)
+                self.current_bytes -= size
+                self.evictions += 1
+
+    def put(self, key: str, value: Any) -> None:
+        """Stores a single value."""
+        self.put_many({key: value})
+
+    def delete_many(self, keys: Iterable[str]) -> None:
+        """Removes the given keys. Missing keys are ignored."""
+        with self._lock:
+            for key in keys:
+                entry = self._entries.pop(key, None)
+                if entry is not None:
+                    self.current_bytes -= entry[1]
+
+    def clear(self) -> None:
+        """Removes all entries."""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the counters and current size of the cache."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+            }
+
+
+class MemoryCacheRegistry:
+    """
+    A registry of named, process-wide memory caches, created lazily on first use.
+    """
+
+    def __init__(self, limits: Dict[str, int]):
+        """
+        Args:
+            limits: The byte budget of each named cache (see MEMORY_CACHE_LIMITS).
+        """
+        self.limits = limits
+        self._caches: Dict[str, MemoryCache] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> MemoryCache:
+        """Returns the memory cache with the given name."""
+        with self._lock:
+            if name not in self._caches:
+                self._caches[name] = MemoryCache(self.limits.get(name, 0))
+            return self._caches[name]
+
+    def metadata(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns the statistics of every memory cache used so far, for Dagster metadata.
+        """
+        with self._lock:
+            caches = dict(self._caches)
+        return {name: cache.stats() for name, cache in caches.items()}
+
+
+# Process-wide memory tiers of the on-disk caches (see MEMORY_CACHE_LIMITS)
+memory_caches = MemoryCacheRegistry(MEMORY_CACHE_LIMITS)
+
+
+class MemoryTierBackend(CacheBackend):
+    """
+    Cache backend serving hot entries from a MemoryCache in front of another
+    backend. Reads fill the memory tier and writes go through to both.
+
+    Expiry and compaction are those of the persistent backend; entries
+    that expire while held in memory are served until the process ends.
+    """
+
+    def __init__(self, backend: CacheBackend, memory: MemoryCache):
+        """
+        Args:
+            backend: The persistent backend.
+            memory: The memory tier in front of it.
+        """
+        self.backend = backend
+        self.memory = memory
+        self.policy = backend.policy
+
+    def peek_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        return self.memory.get_many(keys, count_misses=False)
+
+    def get_many(self, keys: Iterable[str], include_expired: bool = False) -> Dict[str, Any]:
+        if include_expired:
+            return self.backend.get_many(keys, include_expired=True)
+        keys = list(keys)
+        results = self.memory.get_many(keys)
+        missing_keys = [key for key in keys if key not in results]
+        if missing_keys:
+            loaded = self.backend.get_many(missing_keys)
+            self.memory.put_many(loaded)
+            results.update(loaded)
+        return results
+
+    def _load_many(self, keys: List[str]) -> Dict[str, Tuple[Any, CacheEntryInfo]]:
+        return self.backend._load_many(keys)
+
+    def _touch_many(self, keys: List[str], now: float) -> None:
+        self.backend._touch_many(keys, now)
+
+    def put_many(self, items: Dict[str, Any]) -> None:
+        self.backend.put_many(items)
+        self.memory.put_many(items)
+
+    def delete_many(self, keys: Iterable[str]) -> None:
+        keys = list(keys)
+        self.backend.delete_many(keys)
+        self.memory.delete_many(keys)
+
+    def renew_many(self, keys: Iterable[str]) -> None:
+        self.backend.renew_many(keys)
+
+    def iter_entry_info(self) -> Iterator[CacheEntryInfo]:
+        return self.backend.iter_entry_info()
+
+    def close(self) -> None:
+        self.memory.clear()
+        self.backend.close()
+
+
+async def async_get_many(cache: CacheBackend, keys: Iterable[str]) -> Dict[str, Any]:
+    """
+    Looks up keys from async code. Entries held in memory are returned directly
+    and only the remaining keys are read in a worker thread.
+    """
+    keys = list(keys)
+    results = cache.peek_many(keys)
+    missing_keys = [key for key in keys if key not in results]
+    if missing_keys:
+        results.update(await asyncio.to_thread(cache.get_many, missing_keys))
+    return results
+
+
+def create_cache_backend(
+    kind: str,
+    location: Path,
+    codec: Optional[CacheCodec] = None,
+    policy: Optional[CachePolicy] = None,
+) -> CacheBackend:
+    """
+    Instantiates a cache backend by name.
+
+    Args:
+        kind: The backend type, either "sqlite" or "file".
+        location: The database file (sqlite) or cache directory (file).
+        codec: The entry codec. Defaults to uncompressed entries.
+        policy: The expiry policy. Defaults to entries that never expire.
+
+    Returns:
+        The configured CacheBackend instance.
+
+    Raises:
+        ValueError: If the backend type is unknown.
+    """
+    if kind == "sqlite":
+        return SQLiteCacheBackend(location, codec, policy)
+    if kind == "file":
+        return FileCacheBackend(location, codec=codec, policy=policy)
+    raise ValueError(f"Unknown cache backend: {kind}")
+
+
+def copy_cache_entries(
+    source: CacheBackend,
+    target: CacheBackend,
+    batch_size: int = 1000,
+    delete_source: bool = False,
+) -> int:
+    """
+    Copies every readable entry of one cache backend into another.
+
+    Source and target may point to the same location with different codecs,
+    which rewrites (e.g., recompresses) the cache in place.
+
+    Args:
+        source: The backend to read the entries from.
+        target: The backend to write the entries to.
+        batch_size: Number of entries written per `put_many` call.
+        delete_source: Whether to delete each entry from the source once copied.
+
+    Returns:
+        The number of entries copied.
+    """
+    copied = 0
+    keys: List[str] = list(source.iter_keys())
+    for key_chunk in chunk_list(keys, batch_size):
+        entries = source.get_many(key_chunk)
+        target.put_many(entries)
+        if delete_source:
+            source.delete_many(entries.keys())
+        copied += len(entries)
+    return copied
+
+
+def migrate_file_cache(
+    source_dir: Path,
+    target: CacheBackend,
+    batch_size: int = 1000,
+    delete_source: bool = False,
+) -> int:
+    """
+    Imports a legacy one-file-per-key JSON cache directory into another backend.
+
+    Unreadable files are skipped and left in place.
+
+    Args:
+        source_dir: The directory containing the legacy `{key}.json` files.
+        target: The backend to import the entries into.
+        batch_size: Number of entries written per `put_many` call.
+        delete_source: Whether to delete each file after it has been imported.
+
+    Returns:
+        The number of entries imported.
+    """
+    source = FileCacheBackend(source_dir)
+    return copy_cache_entries(source, target, batch_size, delete_source)
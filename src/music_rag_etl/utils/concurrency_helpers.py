@@ -3,30 +3,648 @@ import sys
 import threading
 import asyncio
 import time
+from collections import deque
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Any, Callable, Iterable, Optional, Awaitable
+from typing import (
+    Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Dict, Hashable, Iterable, List,
+    Optional, Set, Tuple, Union
+)
+from urllib.parse import urlparse
 
+from music_rag_etl.settings import (
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+    CIRCUIT_BREAKER_RESET_TIMEOUT,
+    HOST_CONCURRENCY_LIMITS,
+    HOST_RATE_LIMITS,
+    RETRY_BUDGET_BURST,
+    RETRY_BUDGET_RATE,
+)
 
-class AsyncRateLimiter:
+
+class TokenBucketRateLimiter:
+    """
+    An asyncio token-bucket rate limiter.
+
+    Tokens refill continuously at `rate` per second up to `capacity`, so idle
+    periods allow bursts of up to `capacity` requests. Waiters are served in
+    strict FIFO order, and no lock is held while sleeping: a single timer wakes
+    the head of the queue as soon as enough tokens have accumulated.
+    """
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Args:
+            rate: Tokens added per second (may be fractional, e.g. 0.5).
+            capacity: Maximum burst size. Defaults to max(1, rate).
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+        self._waiters: deque[Tuple[float, asyncio.Future]] = deque()
+        self._wakeup_handle: Optional[asyncio.TimerHandle] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    def _bind_loop(self) -> asyncio.AbstractEventLoop:
+        # The limiter is process-wide, but waiters belong to one event loop.
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._waiters.clear()
+            self._wakeup_handle = None
+        return loop
+
+    def _wake_waiters(self) -> None:
+        self._wakeup_handle = None
+        self._refill()
+        while self._waiters:
+            needed, future = self._waiters[0]
+            if future.done():  # Cancelled while waiting
+                self._waiters.popleft()
+                continue
+            if self._tokens < needed:
+                break
+            self._tokens -= needed
+            self._waiters.popleft()
+            future.set_result(None)
+        self._schedule_wakeup()
+
+    def _schedule_wakeup(self) -> None:
+        if self._wakeup_handle is not None or not self._waiters:
+            return
+        needed = self._waiters[0][0]
+        delay = max(0.0, (needed - self._tokens) / self.rate)
+        self._wakeup_handle = self._loop.call_later(delay, self._wake_waiters)
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        """
+        Waits until `tokens` are available and consumes them.
+        """
+        if tokens > self.capacity:
+            raise ValueError("Cannot acquire more tokens than the bucket capacity")
+        loop = self._bind_loop()
+        self._refill()
+        if not self._waiters and self._tokens >= tokens:
+            self._tokens -= tokens
+            return
+
+        future = loop.create_future()
+        self._waiters.append((tokens, future))
+        self._schedule_wakeup()
+        await future
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """
+        Consumes `tokens` if they are available right now, without waiting.
+
+        Returns:
+            True if the tokens were consumed, False otherwise.
+        """
+        self._refill()
+        if self._waiters or self._tokens < tokens:
+            return False
+        self._tokens -= tokens
+        return True
+
+
+class HostRegistry:
+    """
+    A thread-safe registry of per-host objects (rate limiters, concurrency
+    limiters, circuit breakers), created lazily the first time a host is seen.
+    Subclasses implement `_create`, returning None for hosts they don't manage.
+    """
+    def __init__(self):
+        self._items: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def _create(self, host: str) -> Optional[Any]:
+        raise NotImplementedError
+
+    def get(self, host: Optional[str]) -> Optional[Any]:
+        """
+        Returns the object for a host, or None if the host is not managed.
+        """
+        if not host:
+            return None
+        with self._lock:
+            if host not in self._items:
+                self._items[host] = self._create(host)
+            return self._items[host]
+
+    def for_url(self, url: str) -> Optional[Any]:
+        """
+        Returns the object for the host of a URL, if any.
+        """
+        return self.get(urlparse(url).hostname)
+
+    def active(self) -> Dict[str, Any]:
+        """
+        Returns the objects created so far, keyed by host.
+        """
+        with self._lock:
+            return {host: item for host, item in self._items.items() if item is not None}
+
+
+class RateLimiterRegistry(HostRegistry):
+    """
+    A registry of token-bucket rate limiters keyed by host, so every request to
+    the same service draws from one shared budget.
+    """
+    def __init__(self, limits: Dict[str, Tuple[float, float]]):
+        """
+        Args:
+            limits: Maps a host name to its (rate, burst capacity).
+        """
+        super().__init__()
+        self.limits = dict(limits)
+
+    def _create(self, host: str) -> Optional[TokenBucketRateLimiter]:
+        if host not in self.limits:
+            return None
+        rate, capacity = self.limits[host]
+        return TokenBucketRateLimiter(rate, capacity)
+
+
+# Process-wide registry shared by all async requests (see HOST_RATE_LIMITS)
+rate_limiters = RateLimiterRegistry(HOST_RATE_LIMITS)
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    An asyncio concurrency limiter whose limit follows AIMD (additive increase,
+    multiplicative decrease), like TCP congestion control.
+
+    The limit grows by about one slot per "window" of healthy requests and is
+    cut by `decrease_factor` when the endpoint signals overload (HTTP 429/503 or
+    timeouts). Growth pauses while latency exceeds `latency_tolerance` times the
+    fastest latency observed, so the limit settles near the endpoint's capacity.
+
+    The fastest latency is taken over the current and the previous
+    `latency_window` seconds only, so the baseline follows an endpoint that has
+    become slower for good instead of holding growth forever.
+    """
+    def __init__(
+        self,
+        initial: int,
+        minimum: int = 1,
+        maximum: Optional[int] = None,
+        decrease_factor: float = 0.5,
+        latency_tolerance: float = 2.0,
+        latency_window: float = 60.0,
+    ):
+        self.minimum = minimum
+        self.maximum = maximum if maximum is not None else initial
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance
+        self.latency_window = latency_window
+        self.limit = float(min(max(initial, minimum), self.maximum))
+        self.peak = self.current
+        self.overloads = 0
+        self._in_flight = 0
+        self._min_latency: Optional[float] = None
+        self._previous_min_latency: Optional[float] = None
+        self._window_started = time.monotonic()
+        self._last_decrease = float("-inf")
+        self._waiters: deque[asyncio.Future] = deque()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def current(self) -> int:
+        """The current number of allowed concurrent requests."""
+        return int(self.limit)
+
+    def _bind_loop(self) -> asyncio.AbstractEventLoop:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._waiters.clear()
+            self._in_flight = 0
+        return loop
+
+    def _wake_waiters(self) -> None:
+        while self._waiters and self._in_flight < self.current:
+            future = self._waiters.popleft()
+            if not future.done():
+                self._in_flight += 1
+                future.set_result(None)
+
+    async def acquire(self) -> None:
+        """
+        Waits for a free slot under the current limit (FIFO).
+        """
+        loop = self._bind_loop()
+        if not self._waiters and self._in_flight < self.current:
+            self._in_flight += 1
+            return
+
+        future = loop.create_future()
+        self._waiters.append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            # The slot may have been granted just before the cancellation
+            if future.done() and not future.cancelled():
+                self.release()
+            raise
+
+    def release(self) -> None:
+        """
+        Frees a slot acquired with `acquire`.
+        """
+        self._in_flight = max(0, self._in_flight - 1)
+        self._wake_waiters()
+
+    def on_success(self, started_at: float) -> None:
+        """
+        Records a successful request started at `started_at` (time.monotonic()).
+        """
+        now = time.monotonic()
+        latency = now - started_at
+        if now - self._window_started >= self.latency_window:
+            self._previous_min_latency = self._min_latency
+            self._min_latency = None
+            self._window_started = now
+        if self._min_latency is None or latency < self._min_latency:
+            self._min_latency = latency
+        baseline = self._min_latency
+        if self._previous_min_latency is not None:
+            baseline = min(baseline, self._previous_min_latency)
+        if latency > baseline * self.latency_tolerance:
+            return  # Latency is degrading: hold the current limit
+        self.limit = min(float(self.maximum), self.limit + 1 / self.limit)
+        self.peak = max(self.peak, self.current)
+        self._wake_waiters()
+
+    def on_overload(self, started_at: float) -> None:
+        """
+        Records an overload signal for a request started at `started_at`.
+
+        Requests that were already in flight when the limit was last cut belong
+        to the same congestion event and do not cut it again.
+        """
+        if started_at < self._last_decrease:
+            return
+        self.overloads += 1
+        self.limit = max(float(self.minimum), self.limit * self.decrease_factor)
+        self._last_decrease = time.monotonic()
+
+
+class ConcurrencyLimiterRegistry(HostRegistry):
     """
-    A simple rate limiter to enforce a maximum number of requests per second.
+    A registry of adaptive concurrency limiters keyed by host.
     """
-    def __init__(self, max_rps: float):
-        self.max_rps = max_rps
-        self.min_interval = 1.0 / max_rps
-        self.last_request_time = 0.0
-        self.lock = asyncio.Lock()
+    def __init__(self, limits: Dict[str, Tuple[int, int]]):
+        """
+        Args:
+            limits: Maps a host name to its (initial, maximum) concurrency.
+        """
+        super().__init__()
+        self.limits = dict(limits)
 
-    async def wait(self):
+    def _create(self, host: str) -> Optional[AdaptiveConcurrencyLimiter]:
+        if host not in self.limits:
+            return None
+        initial, maximum = self.limits[host]
+        return AdaptiveConcurrencyLimiter(initial, maximum=maximum)
+
+    def metadata(self) -> Dict[str, Dict[str, int]]:
         """
-        Wait until it's safe to make the next request.
+        Returns the state of every limiter used so far, for Dagster metadata.
         """
-        async with self.lock:
-            current_time = asyncio.get_event_loop().time()
-            elapsed = current_time - self.last_request_time
-            if elapsed < self.min_interval:
-                await asyncio.sleep(self.min_interval - elapsed)
-            self.last_request_time = asyncio.get_event_loop().time()
+        return {
+            host: {
+                "limit": limiter.current,
+                "peak": limiter.peak,
+                "overloads": limiter.overloads,
+            }
+            for host, limiter in self.active().items()
+        }
+
+
+# Process-wide registry shared by all async requests (see HOST_CONCURRENCY_LIMITS)
+concurrency_limiters = ConcurrencyLimiterRegistry(HOST_CONCURRENCY_LIMITS)
+
+
+class CircuitBreaker:
+    """
+    A circuit breaker for a remote host.
+
+    After `failure_threshold` consecutive failures the circuit opens and
+    requests fail fast for `reset_timeout` seconds. Then a single probe request
+    is let through (half-open): its success closes the circuit, its failure
+    opens it again. If the probe is not resolved within `reset_timeout` (e.g.,
+    it was cancelled), another probe is let through.
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        """
+        Returns True if a request may be sent now.
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            now = time.monotonic()
+            if now - self._opened_at >= self.reset_timeout:
+                # Let this request through as the probe (a new one if the
+                # previous probe was never resolved)
+                self.state = self.HALF_OPEN
+                self._opened_at = now
+                return True
+            return False
+
+    def record_success(self) -> None:
+        """
+        Records a successful request, closing the circuit.
+        """
+        with self._lock:
+            self._failures = 0
+            self.state = self.CLOSED
+
+    def record_failure(self) -> None:
+        """
+        Records a failed request, opening the circuit when the threshold is hit
+        or when the half-open probe fails.
+        """
+        with self._lock:
+            self._failures += 1
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+class CircuitBreakerRegistry(HostRegistry):
+    """
+    A registry of circuit breakers, one for every host.
+    """
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        super().__init__()
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+    def _create(self, host: str) -> CircuitBreaker:
+        return CircuitBreaker(self.failure_threshold, self.reset_timeout)
+
+
+# Process-wide circuit breakers and retry budget shared by all async requests.
+# A retry is only attempted if a token is available, so a degraded endpoint
+# cannot trigger a retry storm from many concurrent tasks.
+circuit_breakers = CircuitBreakerRegistry(
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD, CIRCUIT_BREAKER_RESET_TIMEOUT
+)
+retry_budget = TokenBucketRateLimiter(RETRY_BUDGET_RATE, RETRY_BUDGET_BURST)
+
+
+class AdaptiveBatchSize:
+    """
+    A batch size controller that halves on failures and grows back additively,
+    so batched requests shrink while an endpoint is timing out.
+    """
+    def __init__(self, initial: int, minimum: int = 1, increase: int = 1):
+        self.maximum = initial
+        self.minimum = minimum
+        self.increase = increase
+        self.current = initial
+
+    def on_success(self) -> int:
+        """
+        Grows the batch size by `increase`, up to the initial size.
+        """
+        self.current = min(self.maximum, self.current + self.increase)
+        return self.current
+
+    def on_failure(self) -> int:
+        """
+        Halves the batch size, down to `minimum`.
+        """
+        self.current = max(self.minimum, self.current // 2)
+        return self.current
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent async fetches of the same keys ("single-flight"), so
+    tasks that miss the cache for the same entity at the same time issue one
+    request instead of one each.
+
+    The first caller for a set of keys starts the fetch as a task; callers
+    arriving while it is in flight await that task for the keys it covers and
+    only fetch the remaining ones. The task is shielded, so a cancelled caller
+    does not cancel a fetch others are waiting for. Keys are released as soon
+    as the fetch finishes: results are not memoized, the caches are.
+    """
+    def __init__(self):
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+        self.coalesced = 0
+
+    def _get_in_flight(self, key: Hashable) -> Optional[asyncio.Task]:
+        task = self._in_flight.get(key)
+        # Tasks left over from another (e.g., a finished) event loop are ignored
+        if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+            return None
+        return task
+
+    def _release(self, keys: List[Hashable], task: asyncio.Task) -> None:
+        for key in keys:
+            if self._in_flight.get(key) is task:
+                del self._in_flight[key]
+        if not task.cancelled():
+            # Marks the exception as retrieved if every caller was cancelled
+            task.exception()
+
+    async def do_many(
+        self,
+        keys: Iterable[Hashable],
+        fetch: Callable[[List[Hashable]], Awaitable[Dict[Hashable, Any]]],
+    ) -> Dict[Hashable, Any]:
+        """
+        Fetches several keys, joining the in-flight fetches that cover some of
+        them and passing the rest to a single `fetch` call.
+
+        Args:
+            keys: The keys to fetch.
+            fetch: Fetches a list of keys, returning a dictionary of the keys
+                it resolved.
+
+        Returns:
+            The results of all keys resolved by this or the joined fetches.
+        """
+        tasks: Dict[Hashable, asyncio.Task] = {}
+        own_keys = []
+        for key in dict.fromkeys(keys):
+            task = self._get_in_flight(key)
+            if task is None:
+                own_keys.append(key)
+            else:
+                tasks[key] = task
+        self.coalesced += len(tasks)
+
+        if own_keys:
+            own_task = asyncio.ensure_future(fetch(own_keys))
+            for key in own_keys:
+                self._in_flight[key] = own_task
+                tasks[key] = own_task
+            own_task.add_done_callback(lambda task: self._release(own_keys, task))
+
+        unique_tasks = list(dict.fromkeys(tasks.values()))
+        fetched = await asyncio.gather(*(asyncio.shield(task) for task in unique_tasks))
+        task_results = dict(zip(unique_tasks, fetched))
+        return {
+            key: task_results[task][key]
+            for key, task in tasks.items()
+            if key in task_results[task]
+        }
+
+    async def do(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Fetches a single key, joining the in-flight fetch of the same key if any.
+
+        If the joined fetch is a `do_many` group that did not resolve the key,
+        `fetch` is called for it directly.
+
+        Returns:
+            The result of `fetch`, as returned to the caller that started it.
+        """
+        async def fetch_one(keys: List[Hashable]) -> Dict[Hashable, Any]:
+            return {key: await fetch()}
+
+        results = await self.do_many([key], fetch_one)
+        if key in results:
+            return results[key]
+        return await fetch()
+
+
+class MicroBatcher:
+    """
+    Collects single-key lookups from any number of coroutines into shared
+    batch requests.
+
+    Keys are queued until `max_batch_size` of them are waiting or `max_delay`
+    seconds have passed since the first one, and are then fetched with one
+    `fetch_batch` call that resolves every waiting caller. A key queued by
+    several callers before its batch is sent is only fetched once.
+
+    A batcher is bound to the event loop it is first used on.
+    """
+    def __init__(
+        self,
+        fetch_batch: Callable[[List[Hashable]], Awaitable[Dict[Hashable, Any]]],
+        max_batch_size: int,
+        max_delay: float,
+    ):
+        """
+        Args:
+            fetch_batch: Fetches a list of keys, returning a dictionary of the
+                keys it resolved.
+            max_batch_size: Maximum number of keys sent in one batch.
+            max_delay: Maximum seconds a key waits for its batch to fill up.
+        """
+        self.fetch_batch = fetch_batch
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.batches = 0
+        self.batched_keys = 0
+        self._pending: Dict[Hashable, asyncio.Future] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    def submit(self, key: Hashable) -> asyncio.Future:
+        """
+        Queues a key for the next batch.
+
+        Returns:
+            A future resolved with the key's result, or None if the batch
+            did not resolve the key.
+        """
+        future = self._pending.get(key)
+        if future is not None:
+            return future
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending[key] = future
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_delay, self._flush)
+        return future
+
+    async def get(self, key: Hashable) -> Any:
+        """
+        Fetches a single key as part of the next batch.
+        """
+        return await asyncio.shield(self.submit(key))
+
+    async def get_many(self, keys: Iterable[Hashable]) -> Dict[Hashable, Any]:
+        """
+        Fetches several keys, which may be spread over consecutive batches.
+
+        Returns:
+            The results of the resolved keys.
+        """
+        futures = {key: self.submit(key) for key in dict.fromkeys(keys)}
+        results = await asyncio.gather(*(asyncio.shield(future) for future in futures.values()))
+        return {key: result for key, result in zip(futures, results) if result is not None}
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns the number of batches sent and their average size.
+        """
+        return {
+            "batches": self.batches,
+            "keys": self.batched_keys,
+            "avg_batch_size": self.batched_keys / self.batches if self.batches else 0.0,
+        }
+
+    def _flush(self) -> None:
+        """Sends the waiting keys as one batch."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, {}
+        task = asyncio.ensure_future(self._run_batch(batch))
+        # Keeps a reference so the task is not garbage-collected while running
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch: Dict[Hashable, asyncio.Future]) -> None:
+        self.batches += 1
+        self.batched_keys += len(batch)
+        try:
+            results = await self.fetch_batch(list(batch))
+        except Exception as e:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+        except BaseException:
+            # Callers await the futures through a shield, so they must be
+            # resolved even when the batch itself is cancelled
+            for future in batch.values():
+                if not future.done():
+                    future.cancel()
+            raise
+        for key, future in batch.items():
+            if not future.done():
+                future.set_result(results.get(key))
 
 
 def process_items_concurrently_with_lock(
@@ -141,17 +759,104 @@ async def process_items_concurrently_async(
     return results
 
 
+def _aiter_items(items: Union[Iterable[Any], AsyncIterable[Any]]) -> AsyncIterator[Any]:
+    """
+    Returns an async iterator over a sync or async iterable, pulling lazily.
+    """
+    if hasattr(items, "__aiter__"):
+        return items.__aiter__()
+
+    async def iterate():
+        for item in items:
+            yield item
+
+    return iterate()
+
+
+async def process_items_streaming_async(
+    items: Union[Iterable[Any], AsyncIterable[Any]],
+    process_func: Callable[[Any], Awaitable[Any]],
+    max_concurrent_tasks: int = 5,
+    ordered: bool = False,
+    logger: Optional[logging.Logger] = None,
+) -> AsyncIterator[Any]:
+    """
+    Processes items with a bounded number of in-flight tasks and yields results
+    as they complete.
+
+    Items are pulled lazily from `items` (which may be a generator or an async
+    iterable), so at most `max_concurrent_tasks` coroutines exist at any time.
+    New items are only scheduled when the consumer asks for the next result,
+    so a slow consumer (e.g., a file writer) applies backpressure upstream.
+
+    Args:
+        items: An iterable or async iterable of items to process.
+        process_func: An async function that takes one item and returns a result.
+        max_concurrent_tasks: The maximum number of tasks in flight.
+        ordered: If True, results are yielded in input order. A slow item then
+                 holds back the results behind it (head-of-line blocking).
+        logger: A logger instance for structured logging.
+
+    Yields:
+        Results from processing items, skipping None results and failures.
+    """
+    async def safe_task(item: Any):
+        try:
+            return await process_func(item)
+        except Exception as e:
+            error_message = f"Error processing item: {e}"
+            if logger:
+                logger.error(error_message)
+            else:
+                print(error_message, file=sys.stderr)
+            return None
+
+    iterator = _aiter_items(items)
+    in_flight: deque[asyncio.Task] = deque()
+    exhausted = False
+
+    try:
+        while True:
+            while not exhausted and len(in_flight) < max_concurrent_tasks:
+                try:
+                    item = await iterator.__anext__()
+                except StopAsyncIteration:
+                    exhausted = True
+                    break
+                in_flight.append(asyncio.ensure_future(safe_task(item)))
+
+            if not in_flight:
+                return
+
+            if ordered:
+                done = [in_flight.popleft()]
+                await done[0]
+            else:
+                done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    in_flight.remove(task)
+
+            for task in done:
+                result = task.result()
+                if result is not None:
+                    yield result
+    finally:
+        # The consumer stopped early (or failed): don't leave orphaned tasks
+        for task in in_flight:
+            task.cancel()
+
+
 async def process_items_incrementally_async(
-    items: Iterable[Any],
+    items: Union[Iterable[Any], AsyncIterable[Any]],
     process_func: Callable[[Any], Awaitable[Any]],
     max_concurrent_tasks: int = 5,
     logger: Optional[logging.Logger] = None,
-) -> Iterable[Any]:
+) -> AsyncIterator[Any]:
     """
     Processes items concurrently and yields results as they complete.
 
     Args:
-        items: An iterable of items to process.
+        items: An iterable or async iterable of items to process.
         process_func: An async function that takes one item and returns a result.
         max_concurrent_tasks: The maximum number of concurrent tasks.
         logger: A logger instance for structured logging.
@@ -159,24 +864,7 @@ async def process_items_incrementally_async(
     Yields:
         Results from processing items as they become available.
     """
-    semaphore = asyncio.Semaphore(max_concurrent_tasks)
-
-    async def sem_task(item: Any):
-        async with semaphore:
-            try:
-                result = await process_func(item)
-                return result
-            except Exception as e:
-                error_message = f"Error processing item: {e}"
-                if logger:
-                    logger.error(error_message)
-                else:
-                    print(error_message, file=sys.stderr)
-                return None
-
-    tasks = [sem_task(item) for item in items]
-    
-    for future in asyncio.as_completed(tasks):
-        result = await future
-        if result is not None:
-            yield result
+    async for result in process_items_streaming_async(
+        items, process_func, max_concurrent_tasks=max_concurrent_tasks, logger=logger
+    ):
+        yield result
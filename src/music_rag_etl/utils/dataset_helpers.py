@@ -0,0 +1,221 @@
+"""
+Columnar (Parquet) storage for the intermediate datasets.
+
+Every dataset in `DATASET_FILES` is kept as a zstd-compressed Parquet file next
+to its JSONL file, which stays as the export format for the loaders and other
+consumers of JSONL. Downstream assets read datasets through `scan_dataset`,
+which returns a Polars LazyFrame so column projections and filters are pushed
+down into the Parquet reader.
+"""
+
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+import polars as pl
+from dagster import ConfigurableIOManager, InputContext, OutputContext
+from pydantic import Field
+
+from music_rag_etl.settings import (
+    DATASET_FILES,
+    PARQUET_COMPRESSION,
+    PARQUET_COMPRESSION_LEVEL,
+    PATH_DATASETS,
+)
+
+
+def get_parquet_path(jsonl_path: Path) -> Path:
+    """
+    Returns the path of the Parquet file stored next to a JSONL dataset.
+    """
+    return Path(jsonl_path).with_suffix(".parquet")
+
+
+def is_parquet_fresh(jsonl_path: Path) -> bool:
+    """
+    Checks whether the Parquet copy of a dataset exists and is not older than
+    its JSONL file (e.g., after the JSONL was rewritten by another process).
+    """
+    jsonl_path = Path(jsonl_path)
+    parquet_path = get_parquet_path(jsonl_path)
+    if not parquet_path.exists():
+        return False
+    if not jsonl_path.exists():
+        return True
+    return parquet_path.stat().st_mtime >= jsonl_path.stat().st_mtime
+
+
+def _temporary_path(path: Path) -> Path:
+    """Returns a hidden sibling path used to write `path` atomically."""
+    return path.with_name(f".{path.name}.{os.getpid()}.tmp")
+
+
+def write_parquet(
+    data: Union[pl.DataFrame, pl.LazyFrame],
+    parquet_path: Path,
+    compression: str = PARQUET_COMPRESSION,
+    compression_level: Optional[int] = PARQUET_COMPRESSION_LEVEL,
+) -> Path:
+    """
+    Writes a DataFrame (or streams a LazyFrame) to a Parquet file atomically.
+
+    Args:
+        data: The DataFrame or LazyFrame to write.
+        parquet_path: The destination Parquet file.
+        compression: The Parquet compression codec.
+        compression_level: The codec level, or None for the codec default.
+
+    Returns:
+        The path of the written Parquet file.
+    """
+    parquet_path = Path(parquet_path)
+    parquet_path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = _temporary_path(parquet_path)
+    try:
+        if isinstance(data, pl.LazyFrame):
+            data.sink_parquet(
+                temp_path, compression=compression, compression_level=compression_level
+            )
+        else:
+            data.write_parquet(
+                temp_path, compression=compression, compression_level=compression_level
+            )
+        os.replace(temp_path, parquet_path)
+    finally:
+        temp_path.unlink(missing_ok=True)
+    return parquet_path
+
+
+def _scan_jsonl(jsonl_path: Path) -> pl.LazyFrame:
+    """
+    Lazily scans a JSONL file, inferring the schema from every record.
+
+    Sparse fields (e.g., a property that is null for the first few hundred
+    records) would otherwise be typed from the leading rows only and fail to
+    parse once a value shows up.
+    """
+    return pl.scan_ndjson(jsonl_path, infer_schema_length=None)
+
+
+def export_jsonl_to_parquet(jsonl_path: Path) -> Optional[Path]:
+    """
+    Converts a JSONL dataset into its Parquet copy, streaming the records.
+
+    Returns:
+        The Parquet path, or None if the JSONL file is empty (Polars cannot infer
+        a schema without records).
+    """
+    jsonl_path = Path(jsonl_path)
+    if jsonl_path.stat().st_size == 0:
+        return None
+    return write_parquet(_scan_jsonl(jsonl_path), get_parquet_path(jsonl_path))
+
+
+def write_dataset(
+    df: pl.DataFrame,
+    jsonl_path: Path,
+    export_jsonl: bool = True,
+) -> Path:
+    """
+    Writes a dataset as Parquet and, for compatibility, as a JSONL export.
+
+    The JSONL export is written first, so the Parquet copy is never older.
+
+    Args:
+        df: The dataset to write.
+        jsonl_path: The JSONL path of the dataset (the Parquet path is derived).
+        export_jsonl: Whether to also write the JSONL export.
+
+    Returns:
+        The path of the Parquet file.
+    """
+    jsonl_path = Path(jsonl_path)
+    if export_jsonl:
+        jsonl_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = _temporary_path(jsonl_path)
+        try:
+            df.write_ndjson(temp_path)
+            os.replace(temp_path, jsonl_path)
+        finally:
+            temp_path.unlink(missing_ok=True)
+    return write_parquet(df, get_parquet_path(jsonl_path))
+
+
+def scan_dataset(
+    jsonl_path: Path, schema: Optional[Dict[str, Any]] = None
+) -> pl.LazyFrame:
+    """
+    Lazily scans a dataset, preferring its Parquet copy when it is fresh.
+
+    Args:
+        jsonl_path: The JSONL path of the dataset, as defined in settings.
+        schema: The schema of the empty frame returned when the dataset is
+            missing or has no records (Polars cannot infer one).
+
+    Returns:
+        A LazyFrame; select columns and filter before collecting to benefit
+        from projection and predicate pushdown.
+    """
+    jsonl_path = Path(jsonl_path)
+    if is_parquet_fresh(jsonl_path):
+        return pl.scan_parquet(get_parquet_path(jsonl_path))
+    if not jsonl_path.exists() or jsonl_path.stat().st_size == 0:
+        return pl.LazyFrame(schema=schema)
+    return _scan_jsonl(jsonl_path)
+
+
+class ParquetDatasetIOManager(ConfigurableIOManager):
+    """
+    Stores asset outputs as zstd-compressed Parquet datasets.
+
+    Assets may return either a DataFrame/LazyFrame, which is written as Parquet
+    plus a JSONL export, or the path of a JSONL file they streamed themselves,
+    which is converted to Parquet. Inputs are loaded as LazyFrames.
+
+    Dataset paths come from `DATASET_FILES`; other assets are stored in
+    `base_dir` under their asset name.
+    """
+    base_dir: str = Field(
+        str(PATH_DATASETS), description="Directory for datasets not in DATASET_FILES."
+    )
+    export_jsonl: bool = Field(
+        True, description="Also write a JSONL export of DataFrame outputs."
+    )
+
+    def _get_jsonl_path(self, asset_name: str) -> Path:
+        """Resolves the JSONL path of the dataset produced by an asset."""
+        default_path = Path(self.base_dir) / f"{asset_name}.jsonl"
+        return Path(DATASET_FILES.get(asset_name, default_path))
+
+    def handle_output(self, context: OutputContext, obj: Any) -> None:
+        asset_name = context.asset_key.path[-1]
+        if isinstance(obj, (pl.DataFrame, pl.LazyFrame)):
+            df = obj.collect() if isinstance(obj, pl.LazyFrame) else obj
+            parquet_path = write_dataset(
+                df, self._get_jsonl_path(asset_name), export_jsonl=self.export_jsonl
+            )
+        elif isinstance(obj, (str, Path)):
+            jsonl_path = Path(obj)
+            if is_parquet_fresh(jsonl_path):
+                parquet_path = get_parquet_path(jsonl_path)
+            else:
+                parquet_path = export_jsonl_to_parquet(jsonl_path)
+            if parquet_path is None:
+                context.log.warning(f"{jsonl_path} is empty; no Parquet dataset written.")
+                return
+        else:
+            raise TypeError(
+                f"Unsupported output type for '{asset_name}': {type(obj).__name__}"
+            )
+
+        metadata: Dict[str, Any] = {
+            "path": str(parquet_path),
+            "num_rows": pl.scan_parquet(parquet_path).select(pl.len()).collect().item(),
+            "size_bytes": parquet_path.stat().st_size,
+        }
+        context.add_output_metadata(metadata)
+        context.log.info(f"Stored '{asset_name}' as Parquet at {parquet_path}")
+
+    def load_input(self, context: InputContext) -> pl.LazyFrame:
+        asset_name = context.upstream_output.asset_key.path[-1]
+        return scan_dataset(self._get_jsonl_path(asset_name))
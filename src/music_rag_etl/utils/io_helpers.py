@@ -1,8 +1,116 @@
+import asyncio
 import json
+import mmap
+import os
+import queue
 import shutil
 import threading
+import time
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable, Iterable, Iterator, Optional, Tuple, Union
+
+from music_rag_etl.settings import JSON_CODEC, JSONL_SINK_BUFFER_SIZE, JSONL_SINK_FLUSH_INTERVAL
+
+
+@dataclass(frozen=True)
+class JsonCodec:
+    """
+    A JSON implementation used for caches and datasets.
+
+    All codecs emit compact UTF-8 JSON (non-ASCII characters are kept as-is,
+    like `ensure_ascii=False`), so files are identical whichever one is used.
+    Compact means no spaces after separators (`{"id":1}`, not `{"id": 1}`), as
+    orjson and msgspec cannot emit them; datasets and caches written before the
+    codecs existed differ only in that whitespace.
+    Decode errors are raised as `json.JSONDecodeError`.
+    """
+    name: str
+    dumps: Callable[[Any], str]
+    loads: Callable[[Union[str, bytes]], Any]
+
+
+def _make_stdlib_codec() -> JsonCodec:
+    def dumps(obj: Any) -> str:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+    return JsonCodec("json", dumps, json.loads)
+
+
+def _make_orjson_codec() -> JsonCodec:
+    import orjson
+
+    def dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode("utf-8")
+
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError
+    return JsonCodec("orjson", dumps, orjson.loads)
+
+
+def _make_msgspec_codec() -> JsonCodec:
+    import msgspec
+
+    encoder = msgspec.json.Encoder()
+    decoder = msgspec.json.Decoder()
+
+    def dumps(obj: Any) -> str:
+        return encoder.encode(obj).decode("utf-8")
+
+    def loads(data: Union[str, bytes]) -> Any:
+        try:
+            return decoder.decode(data)
+        except msgspec.DecodeError as error:
+            document = data if isinstance(data, str) else data.decode("utf-8", "replace")
+            raise json.JSONDecodeError(str(error), document, 0) from error
+
+    return JsonCodec("msgspec", dumps, loads)
+
+
+# Codec factories in order of preference
+JSON_CODEC_FACTORIES: Dict[str, Callable[[], JsonCodec]] = {
+    "orjson": _make_orjson_codec,
+    "msgspec": _make_msgspec_codec,
+    "json": _make_stdlib_codec,
+}
+
+
+def get_json_codec(name: Optional[str] = None) -> JsonCodec:
+    """
+    Returns a JSON codec by name, or the fastest installed one.
+
+    Args:
+        name: "orjson", "msgspec" or "json". If None, the first importable codec
+              in JSON_CODEC_FACTORIES order is used.
+
+    Raises:
+        ValueError: If the name is unknown.
+        ImportError: If the requested library is not installed.
+    """
+    if name is not None:
+        if name not in JSON_CODEC_FACTORIES:
+            raise ValueError(
+                f"Unknown JSON codec '{name}'. Expected one of {list(JSON_CODEC_FACTORIES)}."
+            )
+        return JSON_CODEC_FACTORIES[name]()
+    for factory in JSON_CODEC_FACTORIES.values():
+        try:
+            return factory()
+        except ImportError:
+            continue
+    return _make_stdlib_codec()
+
+
+json_codec = get_json_codec(JSON_CODEC)
+
+
+def json_dumps(obj: Any) -> str:
+    """Serializes an object to a JSON string with the configured codec."""
+    return json_codec.dumps(obj)
+
+
+def json_loads(data: Union[str, bytes]) -> Any:
+    """Parses a JSON string or bytes with the configured codec."""
+    return json_codec.loads(data)
 
 
 def initialize_jsonl_file(file_path: Path):
@@ -20,6 +128,9 @@ def initialize_jsonl_file(file_path: Path):
 def load_jsonl(file_path: Path) -> List[Dict[str, Any]]:
     """
     Reads a JSONL file and returns a list of dictionaries.
+
+    Prefer `iter_jsonl` or `iter_jsonl_batches` for large files, which keep
+    only one record (or batch) in memory at a time.
     
     Args:
         file_path: The Path object for the file to read.
@@ -30,15 +141,131 @@ def load_jsonl(file_path: Path) -> List[Dict[str, Any]]:
     Raises:
         FileNotFoundError: If the file does not exist.
     """
-    data = []
+    return list(iter_jsonl(file_path))
+
+
+def get_jsonl_shard_bounds(file_path: Path, shard_index: int, num_shards: int) -> Tuple[int, int]:
+    """
+    Computes the byte range of one shard of a JSONL file.
+
+    The file is split into `num_shards` ranges of roughly equal size, and every
+    boundary is moved forward to the start of the next line, so each line
+    belongs to exactly one shard.
+
+    Args:
+        file_path: The Path object for the file to shard.
+        shard_index: The index of the shard, from 0 to num_shards - 1.
+        num_shards: The total number of shards.
+
+    Returns:
+        A (start, end) tuple of byte offsets; the range is half-open.
+    """
+    if not 0 <= shard_index < num_shards:
+        raise ValueError(f"shard_index must be in [0, {num_shards}), got {shard_index}.")
+    size = file_path.stat().st_size
+
+    def align(offset: int) -> int:
+        if offset <= 0 or offset >= size:
+            return min(max(offset, 0), size)
+        with open(file_path, "rb") as f:
+            # Finish the line containing the byte before the boundary
+            f.seek(offset - 1)
+            f.readline()
+            return f.tell()
+
+    start = align(size * shard_index // num_shards)
+    end = align(size * (shard_index + 1) // num_shards)
+    return start, end
+
+
+def _iter_jsonl_lines(file_path: Path, start: int, end: int, use_mmap: bool) -> Iterator[bytes]:
+    """
+    Yields the raw lines of a file within the byte range [start, end).
+    """
+    if start >= end:
+        return
+    with open(file_path, "rb") as f:
+        if use_mmap:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                position = start
+                while position < end:
+                    newline = mapped.find(b"\n", position, end)
+                    if newline == -1:
+                        newline = end
+                    yield mapped[position:newline]
+                    position = newline + 1
+        else:
+            f.seek(start)
+            position = start
+            while position < end:
+                line = f.readline()
+                if not line:
+                    break
+                position += len(line)
+                yield line
+
+
+def iter_jsonl(
+    file_path: Path,
+    use_mmap: bool = False,
+    shard_index: int = 0,
+    num_shards: int = 1,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily reads a JSONL file, yielding one dictionary per line.
+
+    With `num_shards` > 1 only the lines of one byte-range shard are read, so
+    several workers can each process a disjoint slice of the same file.
+
+    Args:
+        file_path: The Path object for the file to read.
+        use_mmap: Read through a memory map instead of buffered file reads.
+        shard_index: The index of the shard to read (see `get_jsonl_shard_bounds`).
+        num_shards: The total number of shards.
+
+    Yields:
+        The records of the file (or shard), in file order.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+    """
     if not file_path.exists():
         raise FileNotFoundError(f"File not found: {file_path}")
-    
-    with open(file_path, "r", encoding="utf-8") as f:
-        for line in f:
-            if line.strip():
-                data.append(json.loads(line))
-    return data
+
+    start, end = get_jsonl_shard_bounds(file_path, shard_index, num_shards)
+    for line in _iter_jsonl_lines(file_path, start, end, use_mmap):
+        if line.strip():
+            yield json_loads(line)
+
+
+def iter_jsonl_batches(
+    file_path: Path,
+    batch_size: int,
+    use_mmap: bool = False,
+    shard_index: int = 0,
+    num_shards: int = 1,
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Lazily reads a JSONL file in lists of up to `batch_size` records.
+
+    Args:
+        file_path: The Path object for the file to read.
+        batch_size: The maximum number of records per batch.
+        use_mmap: Read through a memory map instead of buffered file reads.
+        shard_index: The index of the shard to read (see `get_jsonl_shard_bounds`).
+        num_shards: The total number of shards.
+
+    Yields:
+        Lists of records, in file order.
+    """
+    batch = []
+    for record in iter_jsonl(file_path, use_mmap, shard_index, num_shards):
+        batch.append(record)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
 
 
 def append_record_to_jsonl(record: Dict, file_path: Path, lock: threading.Lock):
@@ -52,7 +279,7 @@ def append_record_to_jsonl(record: Dict, file_path: Path, lock: threading.Lock):
     """
     with lock:
         with open(file_path, "a", encoding="utf-8") as f:
-            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.write(json_dumps(record) + "\n")
 
 
 def save_to_jsonl(data: List[Dict], file_path: Path, mode: str = "w"):
@@ -67,8 +294,7 @@ def save_to_jsonl(data: List[Dict], file_path: Path, mode: str = "w"):
     file_path.parent.mkdir(parents=True, exist_ok=True)
     with open(file_path, mode, encoding="utf-8") as f:
         for record in data:
-            json_string = json.dumps(record, ensure_ascii=False)
-            f.write(json_string + "\n")
+            f.write(json_dumps(record) + "\n")
 
 
 def merge_jsonl_files(input_paths: List[Path], output_path: Path):
@@ -117,6 +343,200 @@ def jsonl_writer(file_path: Path):
     with open(file_path, "w", encoding="utf-8") as f:
 
         def writer(d: dict):
-            f.write(json.dumps(d, ensure_ascii=False) + "\n")
+            f.write(json_dumps(d) + "\n")
 
         yield writer
+
+
+class JsonlSink:
+    """
+    A buffered JSONL writer that keeps its output file open for a whole run.
+
+    Records are serialized into an in-memory buffer that is written out when it
+    reaches `buffer_size` bytes or `flush_interval` seconds have passed. With
+    `background=True` the writes happen on a dedicated thread, so an asyncio
+    event loop never blocks on disk. With `atomic=True` the records go to a
+    temporary file that replaces `file_path` only when the sink closes without
+    an error, so a failed run never leaves a half-written dataset behind.
+
+    Usage:
+        async with JsonlSink(ALBUMS_FILE, background=True) as sink:
+            await sink.awrite_many(records)
+    """
+    # Maximum number of buffers queued for the background writer (backpressure)
+    MAX_PENDING_BUFFERS = 16
+
+    def __init__(
+        self,
+        file_path: Path,
+        buffer_size: int = JSONL_SINK_BUFFER_SIZE,
+        flush_interval: float = JSONL_SINK_FLUSH_INTERVAL,
+        background: bool = False,
+        atomic: bool = True,
+    ):
+        self.file_path = Path(file_path)
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.background = background
+        self.atomic = atomic
+        self.records_written = 0
+        self._target_path = (
+            self.file_path.with_name(f".{self.file_path.name}.{os.getpid()}.tmp")
+            if atomic
+            else self.file_path
+        )
+        self._file = None
+        self._buffer: List[bytes] = []
+        self._buffered_bytes = 0
+        self._last_flush = time.monotonic()
+        self._queue: Optional[queue.Queue] = None
+        self._writer_thread: Optional[threading.Thread] = None
+        self._writer_error: Optional[BaseException] = None
+
+    def open(self) -> "JsonlSink":
+        """
+        Opens (and truncates) the output file.
+        """
+        self.file_path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self._target_path, "wb", buffering=self.buffer_size)
+        if self.background:
+            self._queue = queue.Queue(maxsize=self.MAX_PENDING_BUFFERS)
+            self._writer_thread = threading.Thread(
+                target=self._background_writer, name=f"jsonl-sink-{self.file_path.name}", daemon=True
+            )
+            self._writer_thread.start()
+        return self
+
+    def _background_writer(self) -> None:
+        while True:
+            data = self._queue.get()
+            if data is None:
+                return
+            try:
+                self._file.write(data)
+            except BaseException as error:  # Surfaced to the caller on flush/close
+                self._writer_error = error
+
+    def _raise_writer_error(self) -> None:
+        if self._writer_error is not None:
+            raise self._writer_error
+
+    def _append(self, records: Iterable[Dict]) -> bool:
+        """
+        Serializes and encodes records into the buffer, so its size is counted
+        in bytes. Returns True if a flush is due.
+        """
+        for record in records:
+            line = (json_dumps(record) + "\n").encode("utf-8")
+            self._buffer.append(line)
+            self._buffered_bytes += len(line)
+            self.records_written += 1
+        return (
+            self._buffered_bytes >= self.buffer_size
+            or time.monotonic() - self._last_flush >= self.flush_interval
+        )
+
+    def _take_buffer(self) -> bytes:
+        data = b"".join(self._buffer)
+        self._buffer = []
+        self._buffered_bytes = 0
+        self._last_flush = time.monotonic()
+        return data
+
+    def write(self, record: Dict) -> None:
+        """
+        Buffers a single record.
+        """
+        self.write_many([record])
+
+    def write_many(self, records: Iterable[Dict]) -> None:
+        """
+        Buffers records, writing the buffer out if it is full or stale.
+        """
+        if self._append(records):
+            self.flush()
+
+    async def awrite_many(self, records: Iterable[Dict]) -> None:
+        """
+        Buffers records like `write_many`, without blocking the event loop:
+        full buffers are handed to the writer thread, or written in a worker
+        thread when the sink has no background writer.
+        """
+        if not self._append(records):
+            return
+        self._raise_writer_error()
+        data = self._take_buffer()
+        if not data:
+            return
+        if self.background:
+            try:
+                self._queue.put_nowait(data)
+            except queue.Full:
+                # The disk is behind: wait for the writer without blocking the loop
+                await asyncio.to_thread(self._queue.put, data)
+        else:
+            await asyncio.to_thread(self._file.write, data)
+
+    def flush(self) -> None:
+        """
+        Writes out the buffered records.
+        """
+        self._raise_writer_error()
+        data = self._take_buffer()
+        if not data:
+            return
+        if self.background:
+            self._queue.put(data)
+        else:
+            self._file.write(data)
+
+    def close(self, success: bool = True) -> None:
+        """
+        Flushes and closes the file. In atomic mode, the temporary file replaces
+        the output file on success and is discarded otherwise.
+
+        Args:
+            success: Whether the run that produced the records succeeded.
+        """
+        if self._file is None:
+            return
+        error = None
+        try:
+            if success:
+                self.flush()
+        except BaseException as flush_error:
+            error = flush_error
+        finally:
+            if self._writer_thread is not None:
+                self._queue.put(None)
+                self._writer_thread.join()
+                self._writer_thread = None
+            if error is None:
+                error = self._writer_error if success else None
+            try:
+                self._file.flush()
+                if success and error is None and self.atomic:
+                    os.fsync(self._file.fileno())
+            finally:
+                self._file.close()
+                self._file = None
+
+        if self.atomic:
+            if success and error is None:
+                os.replace(self._target_path, self.file_path)
+            else:
+                self._target_path.unlink(missing_ok=True)
+        if error is not None:
+            raise error
+
+    def __enter__(self) -> "JsonlSink":
+        return self.open()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close(success=exc_type is None)
+
+    async def __aenter__(self) -> "JsonlSink":
+        return self.open()
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await asyncio.to_thread(self.close, exc_type is None)
@@ -8,11 +8,22 @@ import requests
 from dagster import AssetExecutionContext
 
 from music_rag_etl.settings import LASTFM_CACHE_DIR, LASTFM_REQUEST_TIMEOUT
+from music_rag_etl.utils.cache_helpers import (
+    get_cache_codec,
+    get_cache_policy,
+    is_cache_file_expired,
+    memory_caches,
+)
+from music_rag_etl.utils.concurrency_helpers import SingleFlight
+from music_rag_etl.utils.io_helpers import json_loads
 from music_rag_etl.utils.request_utils import (
     make_request_with_retries,
     async_make_request_with_retries,
 )
 
+# Concurrent cache misses for the same artist share one artist.getInfo request
+_lastfm_flights = SingleFlight()
+
 
 def get_cache_key(text: str) -> str:
     """Creates a SHA256 hash of a string to use as a cache key."""
@@ -24,8 +35,9 @@ def _cache_lastfm_data(artist_name: str, data: Dict[str, Any]):
     cache_key = get_cache_key(artist_name.lower())
     cache_file = LASTFM_CACHE_DIR / f"{cache_key}.json"
     LASTFM_CACHE_DIR.mkdir(parents=True, exist_ok=True)
-    with open(cache_file, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False)
+    with open(cache_file, "wb") as f:
+        f.write(get_cache_codec(LASTFM_CACHE_DIR).dumps(data))
+    memory_caches.get("lastfm").put(cache_key, data)
 
 
 async def _async_cache_lastfm_data(artist_name: str, data: Dict[str, Any]):
@@ -35,10 +47,11 @@ async def _async_cache_lastfm_data(artist_name: str, data: Dict[str, Any]):
     await asyncio.to_thread(LASTFM_CACHE_DIR.mkdir, parents=True, exist_ok=True)
     
     def write_json():
-        with open(cache_file, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False)
+        with open(cache_file, "wb") as f:
+            f.write(get_cache_codec(LASTFM_CACHE_DIR).dumps(data))
 
     await asyncio.to_thread(write_json)
+    memory_caches.get("lastfm").put(cache_key, data)
 
 
 def get_artist_info_with_fallback(
@@ -98,7 +111,6 @@ async def async_get_artist_info_with_fallback(
     api_key: str,
     api_url: str,
     session: Optional[aiohttp.ClientSession] = None,
-    limiter: Optional[Any] = None,
 ) -> Optional[Dict[str, Any]]:
     """
     Fetches artist data from Last.fm asynchronously, trying the primary name first, then
@@ -106,7 +118,7 @@ async def async_get_artist_info_with_fallback(
     """
     # 1. Try the primary artist name
     main_artist_data = await async_fetch_lastfm_data_with_cache(
-        context, artist_name, api_key, api_url, artist_mbid, session, limiter
+        context, artist_name, api_key, api_url, artist_mbid, session
     )
     if main_artist_data:
         return main_artist_data
@@ -116,7 +128,7 @@ async def async_get_artist_info_with_fallback(
         for alias in aliases:
             context.log.info(f"Trying alias '{alias}' for artist '{artist_name}'.")
             alias_data = await async_fetch_lastfm_data_with_cache(
-                context, alias, api_key, api_url, artist_mbid, session, limiter
+                context, alias, api_key, api_url, artist_mbid, session
             )
             if alias_data:
                 context.log.info(
@@ -157,16 +169,24 @@ def fetch_lastfm_data_with_cache(
 
     cache_key = get_cache_key(artist_name.lower())
     cache_file = LASTFM_CACHE_DIR / f"{cache_key}.json"
+    memory_cache = memory_caches.get("lastfm")
+
+    data = memory_cache.get(cache_key)
+    if data is not None:
+        return None if "error" in data else data
 
     if cache_file.exists():
         try:
-            with open(cache_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            with open(cache_file, "rb") as f:
+                data = get_cache_codec(LASTFM_CACHE_DIR).loads(f.read())
+            # Expired entries (e.g., an old cached error) are refetched
+            if not is_cache_file_expired(cache_file, data, get_cache_policy("lastfm")):
+                memory_cache.put(cache_key, data)
                 if "error" in data:
                     return None  # Cached error, treat as not found
                 context.log.info(f"Using cached Last.fm data for '{artist_name}'.")
                 return data
-        except (IOError, json.JSONDecodeError) as e:
+        except (IOError, ValueError) as e:
             context.log.warning(f"Could not read cache for '{artist_name}'. Refetching. Error: {e}")
 
     params = {
@@ -182,7 +202,7 @@ def fetch_lastfm_data_with_cache(
             context=context, url=api_url, method="GET", params=params, timeout=LASTFM_REQUEST_TIMEOUT
         )
         response.raise_for_status()
-        data = response.json()
+        data = json_loads(response.content)
 
         if "error" in data:
             context.log.warning(
@@ -220,7 +240,6 @@ async def async_fetch_lastfm_data_with_cache(
     api_url: str,
     artist_mbid: Optional[str] = None,
     session: Optional[aiohttp.ClientSession] = None,
-    limiter: Optional[Any] = None,
 ) -> Optional[Dict[str, Any]]:
     """
     Fetches artist data from the Last.fm API asynchronously, using a local file cache.
@@ -232,6 +251,12 @@ async def async_fetch_lastfm_data_with_cache(
 
     cache_key = get_cache_key(artist_name.lower())
     cache_file = LASTFM_CACHE_DIR / f"{cache_key}.json"
+    memory_cache = memory_caches.get("lastfm")
+
+    # Hot entries are served from memory without touching the disk
+    data = memory_cache.get(cache_key)
+    if data is not None:
+        return None if "error" in data else data
 
     # Async check for existence
     exists = await asyncio.to_thread(cache_file.exists)
@@ -239,20 +264,69 @@ async def async_fetch_lastfm_data_with_cache(
     if exists:
         try:
             def read_json():
-                with open(cache_file, "r", encoding="utf-8") as f:
-                    return json.load(f)
+                with open(cache_file, "rb") as f:
+                    return get_cache_codec(LASTFM_CACHE_DIR).loads(f.read())
             data = await asyncio.to_thread(read_json)
-            if "error" in data:
-                return None
-            context.log.info(f"Using cached Last.fm data for '{artist_name}'.")
-            return data
+            # Expired entries (e.g., an old cached error) are refetched
+            expired = await asyncio.to_thread(
+                is_cache_file_expired, cache_file, data, get_cache_policy("lastfm")
+            )
+            if not expired:
+                memory_cache.put(cache_key, data)
+                if "error" in data:
+                    return None
+                context.log.info(f"Using cached Last.fm data for '{artist_name}'.")
+                return data
         except Exception as e:
             context.log.warning(f"Could not read cache for '{artist_name}'. Refetching. Error: {e}")
 
-    # Rate limit check BEFORE making the request
-    if limiter:
-        await limiter.wait()
+    # Concurrent misses for the same artist await the first caller's request;
+    # the MBID is validated per caller
+    data = await _lastfm_flights.do(
+        cache_key,
+        lambda: _async_request_lastfm_data(
+            context, artist_name, api_key, api_url, artist_mbid, session
+        ),
+    )
+    if data is None or "error" in data:
+        return None
 
+    # MBID Validation
+    response_mbid = _get_mismatched_mbid(data, artist_mbid)
+    if response_mbid:
+        context.log.warning(
+            f"MBID mismatch for '{artist_name}'. Wikidata MBID: {artist_mbid}, "
+            f"Last.fm MBID: {response_mbid}. Skipping."
+        )
+        return None
+
+    return data
+
+
+def _get_mismatched_mbid(data: Dict[str, Any], artist_mbid: Optional[str]) -> Optional[str]:
+    """Returns the MBID of a Last.fm response if it contradicts the expected MBID."""
+    if not artist_mbid:
+        return None
+    response_mbid = data.get("artist", {}).get("mbid")
+    if response_mbid and response_mbid != artist_mbid:
+        return response_mbid
+    return None
+
+
+async def _async_request_lastfm_data(
+    context: AssetExecutionContext,
+    artist_name: str,
+    api_key: str,
+    api_url: str,
+    artist_mbid: Optional[str] = None,
+    session: Optional[aiohttp.ClientSession] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Requests artist data from the Last.fm API and caches the response, including
+    API errors but not responses contradicting `artist_mbid`. Returns None if
+    the request failed.
+    """
+    # Requests are rate-limited per host inside async_make_request_with_retries
     params = {
         "method": "artist.getInfo",
         "artist": artist_name,
@@ -273,7 +347,7 @@ async def async_fetch_lastfm_data_with_cache(
         
         # async_make_request_with_retries might return string or dict
         if isinstance(response_data, str):
-            data = json.loads(response_data)
+            data = json_loads(response_data)
         else:
             data = response_data
 
@@ -282,18 +356,9 @@ async def async_fetch_lastfm_data_with_cache(
                 f"Last.fm API error for '{artist_name}': {data.get('message', 'Unknown error')} "
                 f"(Code: {data['error']})"
             )
-            await _async_cache_lastfm_data(artist_name, data)
-            return None
-
-        # MBID Validation
-        if artist_mbid:
-            response_mbid = data.get("artist", {}).get("mbid")
-            if response_mbid and response_mbid != artist_mbid:
-                context.log.warning(
-                    f"MBID mismatch for '{artist_name}'. Wikidata MBID: {artist_mbid}, "
-                    f"Last.fm MBID: {response_mbid}. Skipping."
-                )
-                return None
+        elif _get_mismatched_mbid(data, artist_mbid):
+            # Cache hits are not validated, so a mismatching artist is not cached
+            return data
 
         await _async_cache_lastfm_data(artist_name, data)
         return data
@@ -316,8 +381,9 @@ def _cache_lastfm_data(artist_name: str, data: Dict[str, Any]):
     cache_key = get_cache_key(artist_name.lower())
     cache_file = LASTFM_CACHE_DIR / f"{cache_key}.json"
     LASTFM_CACHE_DIR.mkdir(parents=True, exist_ok=True)
-    with open(cache_file, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False)
+    with open(cache_file, "wb") as f:
+        f.write(get_cache_codec(LASTFM_CACHE_DIR).dumps(data))
+    memory_caches.get("lastfm").put(cache_key, data)
 
 
 def get_artist_info_with_fallback(
@@ -396,16 +462,24 @@ def fetch_lastfm_data_with_cache(
 
     cache_key = get_cache_key(artist_name.lower())
     cache_file = LASTFM_CACHE_DIR / f"{cache_key}.json"
+    memory_cache = memory_caches.get("lastfm")
+
+    data = memory_cache.get(cache_key)
+    if data is not None:
+        return None if "error" in data else data
 
     if cache_file.exists():
         try:
-            with open(cache_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            with open(cache_file, "rb") as f:
+                data = get_cache_codec(LASTFM_CACHE_DIR).loads(f.read())
+            # Expired entries (e.g., an old cached error) are refetched
+            if not is_cache_file_expired(cache_file, data, get_cache_policy("lastfm")):
+                memory_cache.put(cache_key, data)
                 if "error" in data:
                     return None  # Cached error, treat as not found
                 context.log.info(f"Using cached Last.fm data for '{artist_name}'.")
                 return data
-        except (IOError, json.JSONDecodeError) as e:
+        except (IOError, ValueError) as e:
             context.log.warning(f"Could not read cache for '{artist_name}'. Refetching. Error: {e}")
 
     params = {
@@ -421,7 +495,7 @@ def fetch_lastfm_data_with_cache(
             context=context, url=api_url, method="GET", params=params, timeout=LASTFM_REQUEST_TIMEOUT
         )
         response.raise_for_status()
-        data = response.json()
+        data = json_loads(response.content)
 
         if "error" in data:
             context.log.warning(
@@ -1,12 +1,87 @@
+import hashlib
+import json
+import random
+import threading
+import time
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
 from dagster import Config, AssetExecutionContext
 from pydantic import Field
 from gqlalchemy import Memgraph
 
+from music_rag_etl.settings import (
+    MEMGRAPH_BATCH_SIZE,
+    MEMGRAPH_MAX_RETRIES,
+    MEMGRAPH_RETRY_DELAY,
+    MEMGRAPH_WORKERS,
+)
+
 
 class MemgraphConfig(Config):
     """Configuration for Memgraph connection."""
     host: str = Field("127.0.0.1", description="Memgraph host address.")
     port: int = Field(7687, description="Memgraph port number.")
+    batch_size: int = Field(
+        MEMGRAPH_BATCH_SIZE,
+        ge=1,
+        description="Rows sent per UNWIND query when loading nodes and relationships.",
+    )
+    edge_mode: str = Field(
+        "client",
+        description=(
+            "'client' builds the relationship lists from the datasets and creates "
+            "them by node id; 'server' matches them from temporary node properties."
+        ),
+    )
+    incremental: bool = Field(
+        False,
+        description=(
+            "Apply only the differences between the datasets and the graph instead "
+            "of clearing and reloading it. Requires the 'client' edge mode."
+        ),
+    )
+    analytical_mode: Optional[bool] = Field(
+        None,
+        description=(
+            "Write the data in IN_MEMORY_ANALYTICAL storage mode, which skips "
+            "transaction bookkeeping, and switch back to IN_MEMORY_TRANSACTIONAL "
+            "afterwards. Faster, but concurrent readers lose isolation, a failed "
+            "load can't be rolled back, and the switch fails while other "
+            "transactions are open. Defaults (None) to full reloads only, so "
+            "incremental loads update a served database transactionally."
+        ),
+    )
+    workers: int = Field(
+        MEMGRAPH_WORKERS,
+        ge=1,
+        description="Connections writing nodes and relationships in parallel.",
+    )
+
+
+# Node property holding the hash of the other properties, used to detect changes
+CONTENT_HASH_PROPERTY = "content_hash"
+
+STORAGE_MODE_ANALYTICAL = "IN_MEMORY_ANALYTICAL"
+STORAGE_MODE_TRANSACTIONAL = "IN_MEMORY_TRANSACTIONAL"
+
+# Error messages of transactions aborted by a concurrent write, which succeed
+# when retried
+TRANSIENT_ERROR_MESSAGES = ["conflicting transactions", "serialization error"]
 
 
 def get_memgraph_client(config: MemgraphConfig) -> Memgraph:
@@ -22,13 +97,57 @@ def get_memgraph_client(config: MemgraphConfig) -> Memgraph:
     return Memgraph(host=config.host, port=config.port)
 
 
+def set_storage_mode(memgraph: Memgraph, mode: str) -> None:
+    """
+    Switches the storage mode of the database.
+
+    Memgraph only switches modes when no other transaction is running.
+
+    Args:
+        memgraph: The Memgraph client instance.
+        mode: STORAGE_MODE_ANALYTICAL or STORAGE_MODE_TRANSACTIONAL.
+    """
+    memgraph.execute(f"STORAGE MODE {mode};")
+
+
+def _get_constraint_properties(constraint: Dict[str, Any]) -> List[str]:
+    """Returns the properties of a SHOW CONSTRAINT INFO row as a list."""
+    properties = constraint.get("properties") or []
+    return [properties] if isinstance(properties, str) else list(properties)
+
+
+def fetch_indexes(memgraph: Memgraph) -> Set[Tuple[str, str]]:
+    """
+    Returns the (label, property) pairs of the label+property indexes.
+    """
+    return {
+        (idx["label"], idx["property"])
+        for idx in memgraph.execute_and_fetch("SHOW INDEX INFO;")
+        if idx.get("label") and idx.get("property")
+    }
+
+
+def fetch_unique_constraints(memgraph: Memgraph) -> Set[Tuple[str, str]]:
+    """
+    Returns the (label, property) pairs of the single-property uniqueness
+    constraints.
+    """
+    constraints = set()
+    for constraint in memgraph.execute_and_fetch("SHOW CONSTRAINT INFO;"):
+        properties = _get_constraint_properties(constraint)
+        if constraint.get("constraint type") == "unique" and len(properties) == 1:
+            constraints.add((constraint["label"], properties[0]))
+    return constraints
+
+
 def clear_database(memgraph: Memgraph, context: AssetExecutionContext) -> None:
     """
-    Clears all nodes, relationships, and indexes from the database.
+    Clears all nodes, relationships, indexes and uniqueness constraints from
+    the database.
     
     This function performs a complete cleanup of the Memgraph database instance,
-    removing all data and dropping all indexes. It is typically used as a 
-    preparatory step before a fresh data ingestion.
+    removing all data and dropping all indexes and uniqueness constraints. It is
+    typically used as a preparatory step before a fresh data ingestion.
 
     Args:
         memgraph: The Memgraph client instance to execute queries.
@@ -54,4 +173,526 @@ def clear_database(memgraph: Memgraph, context: AssetExecutionContext) -> None:
             except Exception as e:
                 context.log.warning(
                     f"Failed to drop index :{label}({property_name}). Error: {e}"
-                )
\ No newline at end of file
+                )
+
+    # 3. Drop all uniqueness constraints
+    constraints = list(memgraph.execute_and_fetch("SHOW CONSTRAINT INFO;"))
+    for constraint in constraints:
+        label = constraint.get("label")
+        properties = _get_constraint_properties(constraint)
+        if constraint.get("constraint type") != "unique" or not label or not properties:
+            continue
+        assertion = ", ".join(f"n.{property_name}" for property_name in properties)
+        query = f"DROP CONSTRAINT ON (n:{label}) ASSERT {assertion} IS UNIQUE;"
+        try:
+            memgraph.execute(query)
+            context.log.info(f"Dropped constraint: {assertion} IS UNIQUE on :{label}")
+        except Exception as e:
+            context.log.warning(
+                f"Failed to drop constraint {assertion} IS UNIQUE on :{label}. Error: {e}"
+            )
+
+
+def iter_batches(rows: Iterable[Any], batch_size: int) -> Iterator[List[Any]]:
+    """
+    Groups a stream of rows into lists of at most `batch_size` rows.
+
+    Args:
+        rows: The rows to group, consumed lazily.
+        batch_size: The maximum number of rows per batch.
+
+    Yields:
+        Lists of rows, the last one possibly shorter.
+    """
+    batch: List[Any] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def is_transient_error(error: Exception) -> bool:
+    """
+    Checks whether a query failed because of a conflict with a concurrent
+    transaction, in which case it can be retried.
+    """
+    message = str(error).lower()
+    return any(transient in message for transient in TRANSIENT_ERROR_MESSAGES)
+
+
+def get_partition(key: Any, partitions: int) -> int:
+    """
+    Returns the partition of a key, stable across processes (unlike `hash`).
+    """
+    return zlib.crc32(str(key).encode("utf-8")) % partitions
+
+
+class MemgraphPool:
+    """
+    Writes batches of rows in parallel over a pool of Memgraph connections.
+
+    Each partition has its own thread and connection, so the batches of a
+    partition are written in order. Rows are assigned to partitions by the hash
+    of a key (e.g., the node id), and relationships by the hashes of both their
+    endpoints (see `execute_edge_grid`). Writes that would conflict whatever the
+    partitioning (e.g., deleting nodes with shared neighbours) go through
+    `execute_serial`. Queries aborted by a conflicting transaction are retried
+    with jittered exponential backoff.
+
+    The pool can be passed instead of a client to the batched helpers of this
+    module (`create_nodes`, `create_edges`, etc.).
+    """
+
+    def __init__(
+        self,
+        client_factory: Callable[[], Memgraph],
+        workers: int = MEMGRAPH_WORKERS,
+        max_retries: int = MEMGRAPH_MAX_RETRIES,
+        retry_delay: float = MEMGRAPH_RETRY_DELAY,
+    ):
+        """
+        Initializes the pool; connections are opened by each thread on first use.
+
+        Args:
+            client_factory: Creates one Memgraph client per connection.
+            workers: The number of partitions, threads and connections.
+            max_retries: Retries of a query aborted by a conflict.
+            retry_delay: The initial backoff between retries, in seconds.
+        """
+        self.workers = workers
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.retries = 0
+        self._client_factory = client_factory
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._executors = [
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"memgraph-{i}")
+            for i in range(workers)
+        ]
+
+    def __enter__(self) -> "MemgraphPool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Waits for the pending batches and stops the threads."""
+        for executor in self._executors:
+            executor.shutdown(wait=True)
+
+    def _get_client(self) -> Memgraph:
+        """Returns the connection of the current thread."""
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = self._local.client = self._client_factory()
+        return client
+
+    def _execute_with_retry(self, query: str, parameters: Dict[str, Any]) -> None:
+        """Executes a query on the connection of the current thread."""
+        for attempt in range(self.max_retries + 1):
+            try:
+                self._get_client().execute(query, parameters)
+                return
+            except Exception as e:
+                if attempt == self.max_retries or not is_transient_error(e):
+                    raise
+                with self._lock:
+                    self.retries += 1
+                time.sleep(random.uniform(0, self.retry_delay * 2**attempt))
+
+    def _submit(self, partition: int, query: str, parameters: Dict[str, Any]) -> Future:
+        """Queues a query on the thread of a partition."""
+        return self._executors[partition].submit(self._execute_with_retry, query, parameters)
+
+    @staticmethod
+    def _wait_all(futures: Iterable[Future]) -> None:
+        """Waits for all queries, then raises the first error, if any."""
+        done, _ = wait(list(futures))
+        for future in done:
+            future.result()
+
+    def execute(self, query: str, parameters: Optional[Dict[str, Any]] = None) -> None:
+        """Executes a single query on the first connection and waits for it."""
+        self._submit(0, query, parameters or {}).result()
+
+    def execute_and_fetch(self, query: str) -> List[Dict[str, Any]]:
+        """Executes a read query on the first connection and returns all rows."""
+        future = self._executors[0].submit(
+            lambda: list(self._get_client().execute_and_fetch(query))
+        )
+        return future.result()
+
+    def execute_partitioned(
+        self,
+        query: str,
+        rows: Iterable[Any],
+        batch_size: int = MEMGRAPH_BATCH_SIZE,
+        parameter: str = "rows",
+        key: Optional[Callable[[Any], Any]] = None,
+    ) -> int:
+        """
+        Executes a query once per batch of rows, spreading the batches over the
+        partitions, and waits for all of them.
+
+        Rows are consumed lazily and at most two batches per partition are in
+        flight, so memory use doesn't grow with the number of rows.
+
+        Args:
+            query: The query, which typically UNWINDs the list parameter.
+            rows: The rows to send.
+            batch_size: The maximum number of rows per query.
+            parameter: The name of the list parameter.
+            key: Returns the partition key of a row; rows are spread round-robin
+                without one.
+
+        Returns:
+            The number of rows sent.
+        """
+        buffers: List[List[Any]] = [[] for _ in range(self.workers)]
+        pending: Deque[Future] = deque()
+        count = 0
+        try:
+            for index, row in enumerate(rows):
+                partition = (
+                    get_partition(key(row), self.workers) if key else index % self.workers
+                )
+                buffers[partition].append(row)
+                if len(buffers[partition]) >= batch_size:
+                    pending.append(
+                        self._submit(partition, query, {parameter: buffers[partition]})
+                    )
+                    count += len(buffers[partition])
+                    buffers[partition] = []
+                    while len(pending) > 2 * self.workers:
+                        pending.popleft().result()
+            for partition, buffer in enumerate(buffers):
+                if buffer:
+                    pending.append(self._submit(partition, query, {parameter: buffer}))
+                    count += len(buffer)
+        finally:
+            self._wait_all(pending)
+        return count
+
+    def execute_serial(
+        self,
+        query: str,
+        rows: Iterable[Any],
+        batch_size: int = MEMGRAPH_BATCH_SIZE,
+        parameter: str = "rows",
+    ) -> int:
+        """
+        Executes a query once per batch of rows, one batch at a time on the
+        first connection.
+
+        Args:
+            query: The query, which typically UNWINDs the list parameter.
+            rows: The rows to send, consumed lazily.
+            batch_size: The maximum number of rows per query.
+            parameter: The name of the list parameter.
+
+        Returns:
+            The number of rows sent.
+        """
+        count = 0
+        for batch in iter_batches(rows, batch_size):
+            self.execute(query, {parameter: batch})
+            count += len(batch)
+        return count
+
+    def execute_edge_grid(
+        self,
+        query: str,
+        edges: Iterable[Dict[str, Any]],
+        batch_size: int = MEMGRAPH_BATCH_SIZE,
+        parameter: str = "edges",
+    ) -> int:
+        """
+        Executes a relationship query on batches of edges, scheduled so that no
+        two connections write edges between the same nodes at the same time.
+
+        Edges are placed in a grid by the partitions of their `source` and
+        `target` ids, and written in as many rounds as there are workers. In
+        round r, worker i writes the cell (i, (i + r) % workers), so within a
+        round no two workers share a source or a target partition.
+
+        This only holds if sources and targets are different nodes. For edges
+        within one label, a node is the source in one cell and the target in
+        another of the same round, so the workers conflict on every such node;
+        write those edges with `execute_serial` instead.
+
+        Args:
+            query: The query, which UNWINDs the list parameter of edges.
+            edges: Maps with the `source` and `target` node ids.
+            batch_size: The maximum number of edges per query.
+            parameter: The name of the list parameter.
+
+        Returns:
+            The number of edges sent.
+        """
+        grid: List[List[List[Dict[str, Any]]]] = [
+            [[] for _ in range(self.workers)] for _ in range(self.workers)
+        ]
+        for edge in edges:
+            source = get_partition(edge["source"], self.workers)
+            target = get_partition(edge["target"], self.workers)
+            grid[source][target].append(edge)
+
+        count = 0
+        for round_index in range(self.workers):
+            futures = []
+            for worker in range(self.workers):
+                cell = grid[worker][(worker + round_index) % self.workers]
+                for batch in iter_batches(cell, batch_size):
+                    futures.append(self._submit(worker, query, {parameter: batch}))
+                    count += len(batch)
+            self._wait_all(futures)
+        return count
+
+
+def execute_batched(
+    memgraph: Union[Memgraph, MemgraphPool],
+    query: str,
+    rows: Iterable[Any],
+    batch_size: int = MEMGRAPH_BATCH_SIZE,
+    parameter: str = "rows",
+    key: Optional[Callable[[Any], Any]] = None,
+) -> int:
+    """
+    Executes a query once per batch of rows, passed as a list parameter.
+
+    Args:
+        memgraph: The Memgraph client instance, or a pool to write in parallel.
+        query: The query, which typically UNWINDs the list parameter.
+        rows: The rows to send, consumed lazily.
+        batch_size: The maximum number of rows per query.
+        parameter: The name of the list parameter.
+        key: Returns the partition key of a row, when writing with a pool.
+
+    Returns:
+        The number of rows sent.
+    """
+    if isinstance(memgraph, MemgraphPool):
+        return memgraph.execute_partitioned(query, rows, batch_size, parameter, key)
+    count = 0
+    for batch in iter_batches(rows, batch_size):
+        memgraph.execute(query, {parameter: batch})
+        count += len(batch)
+    return count
+
+
+def _execute_edges(
+    memgraph: Union[Memgraph, MemgraphPool],
+    query: str,
+    edges: Iterable[Dict[str, Any]],
+    batch_size: int,
+    same_label: bool,
+) -> int:
+    """
+    Executes a relationship query on batches of edges.
+
+    With a pool, edges between two labels are written in parallel on the edge
+    grid, and edges within one label (e.g., SIMILAR_TO) serially, as the grid
+    cannot keep their endpoints apart.
+    """
+    if isinstance(memgraph, MemgraphPool):
+        if same_label:
+            return memgraph.execute_serial(query, edges, batch_size, parameter="edges")
+        return memgraph.execute_edge_grid(query, edges, batch_size)
+    return execute_batched(memgraph, query, edges, batch_size, parameter="edges")
+
+
+def _get_row_id(row: Dict[str, Any]) -> Any:
+    """Returns the partition key of a node row."""
+    return row["id"]
+
+
+def create_nodes(
+    memgraph: Union[Memgraph, MemgraphPool],
+    label: str,
+    rows: Iterable[Dict[str, Any]],
+    batch_size: int = MEMGRAPH_BATCH_SIZE,
+) -> int:
+    """
+    Creates one node per row, sending the rows in batches of parameter maps.
+
+    Each batch is a single `UNWIND $rows AS row CREATE ...` query, so the number
+    of round trips is the number of rows divided by `batch_size`. Every key of a
+    row becomes a property of its node (null values are not stored).
+
+    Args:
+        memgraph: The Memgraph client instance, or a pool to write in parallel.
+        label: The label of the created nodes.
+        rows: The node properties, one map per node.
+        batch_size: The maximum number of rows per query.
+
+    Returns:
+        The number of nodes created.
+    """
+    query = f"UNWIND $rows AS row CREATE (n:{label}) SET n = row;"
+    return execute_batched(memgraph, query, rows, batch_size, key=_get_row_id)
+
+
+def create_edges(
+    memgraph: Union[Memgraph, MemgraphPool],
+    rel_type: str,
+    source_label: str,
+    target_label: str,
+    edges: Iterable[Dict[str, Any]],
+    batch_size: int = MEMGRAPH_BATCH_SIZE,
+) -> int:
+    """
+    Creates relationships between existing nodes, matched by their `id`.
+
+    Each batch is a single `UNWIND $edges AS edge MATCH ... CREATE ...` query.
+    Edges are created as given, so duplicates must be removed beforehand; edges
+    whose endpoints don't exist are skipped by the MATCH.
+
+    Args:
+        memgraph: The Memgraph client instance, or a pool to write in parallel.
+        rel_type: The relationship type.
+        source_label: The label of the source nodes.
+        target_label: The label of the target nodes.
+        edges: Maps with the `source` and `target` node ids of each relationship.
+        batch_size: The maximum number of edges per query.
+
+    Returns:
+        The number of edges sent.
+    """
+    query = (
+        "UNWIND $edges AS edge "
+        f"MATCH (a:{source_label} {{id: edge.source}}) "
+        f"MATCH (b:{target_label} {{id: edge.target}}) "
+        f"CREATE (a)-[:{rel_type}]->(b);"
+    )
+    return _execute_edges(
+        memgraph, query, edges, batch_size, same_label=source_label == target_label
+    )
+
+
+def compute_content_hash(row: Dict[str, Any]) -> str:
+    """
+    Returns a fingerprint of a node's properties.
+
+    The stdlib JSON encoder with sorted keys is used, so the hash doesn't depend
+    on the key order or on the configured JSON codec.
+
+    Args:
+        row: The node properties, without the content hash itself.
+
+    Returns:
+        The SHA-256 hex digest of the properties.
+    """
+    text = json.dumps(row, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def fetch_node_hashes(memgraph: Union[Memgraph, MemgraphPool], label: str) -> Dict[str, str]:
+    """
+    Returns the content hash of every node with a label, keyed by node id.
+
+    Nodes loaded before content hashes were stored map to an empty string, so
+    they are always considered changed.
+    """
+    query = f"MATCH (n:{label}) RETURN n.id AS id, n.{CONTENT_HASH_PROPERTY} AS hash;"
+    return {
+        row["id"]: row["hash"] or ""
+        for row in memgraph.execute_and_fetch(query)
+        if row["id"] is not None
+    }
+
+
+def update_nodes(
+    memgraph: Union[Memgraph, MemgraphPool],
+    label: str,
+    rows: Iterable[Dict[str, Any]],
+    batch_size: int = MEMGRAPH_BATCH_SIZE,
+) -> int:
+    """
+    Replaces the properties of existing nodes, matched by their `id`.
+
+    Relationships of the updated nodes are kept.
+
+    Args:
+        memgraph: The Memgraph client instance, or a pool to write in parallel.
+        label: The label of the nodes.
+        rows: The new node properties, one map per node.
+        batch_size: The maximum number of rows per query.
+
+    Returns:
+        The number of rows sent.
+    """
+    query = f"UNWIND $rows AS row MATCH (n:{label} {{id: row.id}}) SET n = row;"
+    return execute_batched(memgraph, query, rows, batch_size, key=_get_row_id)
+
+
+def delete_nodes(
+    memgraph: Union[Memgraph, MemgraphPool],
+    label: str,
+    ids: Iterable[str],
+    batch_size: int = MEMGRAPH_BATCH_SIZE,
+) -> int:
+    """
+    Deletes nodes by `id`, together with their relationships.
+
+    With a pool, the batches are still run one at a time: detaching nodes that
+    share a neighbour (e.g., two albums of one artist) from several connections
+    would conflict on that neighbour.
+
+    Returns:
+        The number of ids sent.
+    """
+    query = f"UNWIND $ids AS id MATCH (n:{label} {{id: id}}) DETACH DELETE n;"
+    if isinstance(memgraph, MemgraphPool):
+        return memgraph.execute_serial(query, ids, batch_size, parameter="ids")
+    return execute_batched(memgraph, query, ids, batch_size, parameter="ids")
+
+
+def fetch_edges(
+    memgraph: Union[Memgraph, MemgraphPool], rel_type: str, source_label: str, target_label: str
+) -> List[Tuple[str, str]]:
+    """
+    Returns the (source id, target id) pairs of every relationship of a type.
+    """
+    query = (
+        f"MATCH (a:{source_label})-[:{rel_type}]->(b:{target_label}) "
+        "RETURN a.id AS source, b.id AS target;"
+    )
+    return [(row["source"], row["target"]) for row in memgraph.execute_and_fetch(query)]
+
+
+def delete_edges(
+    memgraph: Union[Memgraph, MemgraphPool],
+    rel_type: str,
+    source_label: str,
+    target_label: str,
+    edges: Iterable[Dict[str, Any]],
+    batch_size: int = MEMGRAPH_BATCH_SIZE,
+) -> int:
+    """
+    Deletes the relationships of a type between nodes matched by their `id`.
+
+    Args:
+        memgraph: The Memgraph client instance, or a pool to write in parallel.
+        rel_type: The relationship type.
+        source_label: The label of the source nodes.
+        target_label: The label of the target nodes.
+        edges: Maps with the `source` and `target` node ids of each relationship.
+        batch_size: The maximum number of edges per query.
+
+    Returns:
+        The number of edges sent.
+    """
+    query = (
+        "UNWIND $edges AS edge "
+        f"MATCH (a:{source_label} {{id: edge.source}})-[r:{rel_type}]->"
+        f"(b:{target_label} {{id: edge.target}}) "
+        "DELETE r;"
+    )
+    return _execute_edges(
+        memgraph, query, edges, batch_size, same_label=source_label == target_label
+    )
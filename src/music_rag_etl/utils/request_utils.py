@@ -1,22 +1,98 @@
 import time
 import asyncio
+import random
 import ssl
+import threading
 import certifi
-from typing import Any, Dict, Optional
+from http.cookiejar import DefaultCookiePolicy
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Union
 import requests
 import aiohttp
+from requests.adapters import HTTPAdapter
 
 from dagster import AssetExecutionContext
 
+from music_rag_etl.settings import (
+    HTTP_CONNECTION_LIMIT,
+    HTTP_CONNECTION_LIMIT_PER_HOST,
+    HTTP_DNS_CACHE_TTL,
+    HTTP_KEEPALIVE_TIMEOUT,
+    HTTP_POOL_CONNECTIONS,
+    HTTP_POOL_MAXSIZE,
+    RETRY_MAX_BACKOFF,
+)
+from music_rag_etl.utils.io_helpers import chunk_list, json_dumps, json_loads
+from music_rag_etl.utils.concurrency_helpers import (
+    circuit_breakers,
+    concurrency_limiters,
+    rate_limiters,
+    retry_budget,
+)
+
+# 4xx statuses worth retrying: request timeout and rate limiting
+RETRYABLE_CLIENT_STATUSES = (408, 429)
+# Headers sent on every pooled connection
+DEFAULT_HTTP_HEADERS = {
+    "Accept-Encoding": "gzip, deflate",
+    "Connection": "keep-alive",
+}
+
+_requests_session: Optional[requests.Session] = None
+_requests_session_lock = threading.Lock()
+
+
+class CircuitOpenError(aiohttp.ClientError):
+    """Raised when a request is rejected because the host's circuit is open."""
+
 
 def create_aiohttp_session() -> aiohttp.ClientSession:
     """
     Creates an aiohttp ClientSession with SSL verification configured using certifi.
     This resolves ClientConnectorCertificateError on some systems (like macOS).
+
+    The connector pools keep-alive connections with total and per-host limits
+    and caches DNS lookups, so an asset sharing one session reuses connections.
     """
     ssl_context = ssl.create_default_context(cafile=certifi.where())
-    connector = aiohttp.TCPConnector(ssl=ssl_context)
-    return aiohttp.ClientSession(connector=connector)
+    connector = aiohttp.TCPConnector(
+        ssl=ssl_context,
+        limit=HTTP_CONNECTION_LIMIT,
+        limit_per_host=HTTP_CONNECTION_LIMIT_PER_HOST,
+        ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+        keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+    )
+    return aiohttp.ClientSession(
+        connector=connector, headers=DEFAULT_HTTP_HEADERS, json_serialize=json_dumps
+    )
+
+
+def get_requests_session() -> requests.Session:
+    """
+    Returns the process-wide requests Session used by the synchronous request path.
+
+    The session is created lazily and keeps a pool of keep-alive connections
+    per host (HTTP_POOL_CONNECTIONS hosts, HTTP_POOL_MAXSIZE connections each),
+    so repeated calls to the same API skip the TCP and TLS handshakes. Cookies
+    are disabled, which leaves no shared mutable state between threads.
+    """
+    global _requests_session
+    if _requests_session is None:
+        with _requests_session_lock:
+            if _requests_session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=HTTP_POOL_CONNECTIONS,
+                    pool_maxsize=HTTP_POOL_MAXSIZE,
+                    pool_block=False,
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers.update(DEFAULT_HTTP_HEADERS)
+                session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+                _requests_session = session
+    return _requests_session
 
 
 def make_request_with_retries(
@@ -58,7 +134,7 @@ def make_request_with_retries(
             else:
                 raise ValueError("Method must be 'GET' or 'POST'")
 
-            response = requests.request(method, url, **request_args)
+            response = get_requests_session().request(method, url, **request_args)
             response.raise_for_status()
             return response
         except requests.exceptions.RequestException as error:
@@ -74,6 +150,97 @@ def make_request_with_retries(
     )
 
 
+def fetch_latest_revisions(
+    api_url: str,
+    headers: Dict[str, str],
+    titles: Optional[List[str]] = None,
+    pageids: Optional[List[int]] = None,
+    batch_size: int = 50,
+    timeout: int = 60,
+) -> Dict[Union[str, int], int]:
+    """
+    Looks up the latest revision ID of MediaWiki pages with `prop=info`, e.g.,
+    Wikidata items by QID (their page title) or Wikipedia articles by page ID.
+
+    Args:
+        api_url: The MediaWiki API endpoint.
+        headers: Request headers (a descriptive User-Agent is required).
+        titles: Page titles to look up.
+        pageids: Page IDs to look up.
+        batch_size: Pages per request (50 is the API maximum).
+        timeout: Timeout per request in seconds.
+
+    Returns:
+        A dictionary mapping each title or page ID found to its `lastrevid`.
+        Missing pages are omitted.
+
+    Raises:
+        requests.exceptions.RequestException: If a request fails.
+    """
+    revisions: Dict[Union[str, int], int] = {}
+    for param, values in (("titles", titles or []), ("pageids", pageids or [])):
+        for chunk in chunk_list(list(values), batch_size):
+            response = get_requests_session().get(
+                api_url,
+                params={
+                    "action": "query",
+                    "prop": "info",
+                    param: "|".join(str(value) for value in chunk),
+                    "format": "json",
+                },
+                headers=headers,
+                timeout=timeout,
+            )
+            response.raise_for_status()
+            pages = json_loads(response.content).get("query", {}).get("pages", {})
+            for page in pages.values():
+                if "missing" in page or "lastrevid" not in page:
+                    continue
+                key = page["title"] if param == "titles" else page["pageid"]
+                revisions[key] = page["lastrevid"]
+    return revisions
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parses a Retry-After header, given either in seconds or as an HTTP date.
+
+    Returns:
+        The number of seconds to wait, or None if the header is missing or invalid.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def _is_retryable_error(error: Exception) -> bool:
+    """
+    Returns False for 4xx responses that will fail again (e.g., 400, 404).
+    """
+    if isinstance(error, aiohttp.ClientResponseError):
+        return error.status >= 500 or error.status in RETRYABLE_CLIENT_STATUSES
+    return True
+
+
+def _is_overload_error(error: Exception) -> bool:
+    """
+    Returns True if an error signals that the remote endpoint is overloaded.
+    """
+    if isinstance(error, asyncio.TimeoutError):
+        return True
+    return isinstance(error, aiohttp.ClientResponseError) and error.status in (429, 503)
+
+
 async def async_make_request_with_retries(
     context: AssetExecutionContext,
     url: str,
@@ -84,6 +251,7 @@ async def async_make_request_with_retries(
     initial_backoff: int = 2,
     timeout: int = 60,
     session: Optional[aiohttp.ClientSession] = None,
+    max_backoff: float = RETRY_MAX_BACKOFF,
 ) -> Any:
     """
     Make an async request with exponential backoff for retries using aiohttp.
@@ -98,6 +266,18 @@ async def async_make_request_with_retries(
         initial_backoff: Initial backoff in seconds.
         timeout: Timeout per request in seconds.
         session: Optional aiohttp ClientSession. If None, one will be created per request.
+        max_backoff: Upper bound of the exponential backoff in seconds.
+
+    Every attempt first draws a token from the host's rate limiter (see
+    HOST_RATE_LIMITS), so all callers hitting the same host share one budget.
+    It then waits for a slot of the host's adaptive concurrency limiter (see
+    HOST_CONCURRENCY_LIMITS), which backs off on 429/503 responses and timeouts.
+
+    Retries wait for the server's Retry-After header when present (capped at
+    `max_backoff`), otherwise a random time between 0 and the exponential
+    backoff ("full jitter"), so that concurrent tasks don't retry in lockstep. Each retry draws from the shared
+    retry budget, and a host failing repeatedly trips its circuit breaker so
+    further requests fail fast. 4xx responses other than 408/429 are not retried.
 
     Returns:
         The response object (or its content depending on usage, currently returns the client response context).
@@ -106,15 +286,31 @@ async def async_make_request_with_retries(
         **For this implementation, we return the text content to be safe as the session might close.**
 
     Raises:
-        aiohttp.ClientError if retries are exhausted.
+        aiohttp.ClientError if retries are exhausted, the retry budget is spent,
+        the host's circuit is open (CircuitOpenError) or the response is a
+        non-retryable 4xx (aiohttp.ClientResponseError).
     """
     should_close_session = False
     if session is None:
         session = create_aiohttp_session()
         should_close_session = True
 
+    limiter = rate_limiters.for_url(url)
+    concurrency = concurrency_limiters.for_url(url)
+    breaker = circuit_breakers.for_url(url)
     try:
         for attempt in range(max_retries):
+            if limiter:
+                await limiter.acquire()
+            if concurrency:
+                await concurrency.acquire()
+            # The probe of a half-open circuit is only taken once the request
+            # can be sent, so waiting for the limiters can't strand it
+            if breaker and not breaker.allow_request():
+                if concurrency:
+                    concurrency.release()
+                raise CircuitOpenError(f"Circuit open for {url}; failing fast.")
+            started_at = time.monotonic()
             try:
                 request_args = {
                     "headers": headers,
@@ -138,17 +334,60 @@ async def async_make_request_with_retries(
                     # Given the usage in this project, it's mostly JSON.
                     # Let's try to parse JSON, fall back to text.
                     try:
-                        return await response.json()
+                        data = await response.json(loads=json_loads)
                     except Exception:
-                        return await response.text()
+                        data = await response.text()
+                if concurrency:
+                    concurrency.on_success(started_at)
+                if breaker:
+                    breaker.record_success()
+                return data
 
             except (aiohttp.ClientError, asyncio.TimeoutError) as error:
-                wait_time = initial_backoff * (2**attempt)
+                if not _is_retryable_error(error):
+                    # The host answered; the request itself is at fault
+                    if breaker:
+                        breaker.record_success()
+                    context.log.warning(
+                        f"{method} {url} failed with non-retryable status {error.status}: {error.message}."
+                    )
+                    raise
+                if breaker:
+                    breaker.record_failure()
+                if concurrency and _is_overload_error(error):
+                    concurrency.on_overload(started_at)
+
+                backoff = min(max_backoff, initial_backoff * (2**attempt))
+                retry_after = None
+                if isinstance(error, aiohttp.ClientResponseError) and error.headers:
+                    retry_after = parse_retry_after(error.headers.get("Retry-After"))
+                if retry_after is not None:
+                    # Bounded, so a far-off Retry-After can't hold the task for hours
+                    wait_time = min(retry_after, max_backoff)
+                else:
+                    wait_time = random.uniform(0, backoff)
+
                 log_message = f"Attempt {attempt + 1}/{max_retries} for {method} {url} failed ({type(error).__name__}). "
                 if isinstance(error, aiohttp.ClientResponseError):
                     log_message += f"WIKIDATA_SPARQL_ERROR: Status={error.status}, Message={error.message}. "
-                
-                context.log.warning(log_message + f"Retrying in {wait_time}s.")
+                if attempt + 1 < max_retries and not retry_budget.try_acquire():
+                    context.log.warning(log_message + "Retry budget exhausted, giving up.")
+                    raise aiohttp.ClientError(
+                        f"Retry budget exhausted while fetching {url}."
+                    ) from error
+
+                context.log.warning(log_message + f"Retrying in {wait_time:.1f}s.")
+            except BaseException:
+                # Any other outcome (cancellation, decoding errors, etc.) must
+                # resolve a half-open probe too, or the circuit stays half-open
+                if breaker:
+                    breaker.record_failure()
+                raise
+            finally:
+                # Don't hold the concurrency slot while backing off
+                if concurrency:
+                    concurrency.release()
+            if attempt + 1 < max_retries:
                 await asyncio.sleep(wait_time)
     finally:
         if should_close_session:
@@ -1,3 +1,61 @@
+from typing import Dict, List
+
+# ==============================================================================
+#  ARTIST SELECTION CRITERIA
+# ==============================================================================
+# Shared by the artist index SPARQL query and the offline Wikidata dump parser.
+
+# Artists must have a genre that is a (transitive) subclass of one of these.
+ARTIST_ROOT_GENRES: Dict[str, str] = {
+    "Q11399": "Rock music",
+    "Q9778": "Electronic music",
+    "Q37073": "Pop music",
+    "Q11366": "Alternative rock",
+    "Q187760": "New wave",
+    "Q1298934": "Synth-pop",
+    "Q598929": "Post-punk",
+    "Q178526": "Gothic rock",
+    "Q846083": "Dark wave",
+    "Q193606": "Trip hop",
+    "Q163891": "Experimental music",
+    "Q272167": "Shoegaze",
+    "Q596877": "Electronic body music (EBM)",
+    "Q170068": "Industrial music",
+    "Q38848": "Heavy metal music",
+    "Q786638": "Psychedelic music",
+    "Q76058": "Glam rock",
+    "Q58339": "Disco",
+}
+
+# Humans (Q5) must also have one of these occupations; groups always qualify.
+MUSICIAN_OCCUPATIONS: Dict[str, str] = {
+    "Q639669": "Musician",
+    "Q177220": "Singer",
+    "Q130857": "Disc jockey (DJ)",
+    "Q486748": "Composer",
+    "Q183945": "Record producer",
+}
+
+MUSICAL_GROUP_QID = "Q215380"
+HUMAN_QID = "Q5"
+
+# Artists need strictly more sitelinks than this to be selected.
+MIN_ARTIST_SITELINKS = 7
+
+
+def _format_qid_lines(
+    qids: Dict[str, str], indent: int, separator: str = ""
+) -> str:
+    """
+    Format QIDs as commented SPARQL lines, one entity per line.
+    """
+    lines = []
+    for index, (qid, name) in enumerate(qids.items()):
+        sep = separator if index < len(qids) - 1 else " " * len(separator)
+        lines.append(" " * indent + f"wd:{qid}{sep}".ljust(13) + f"# {name}")
+    return "\n".join(lines)
+
+
 def get_tracks_by_album_query(album_qid: str) -> str:
     """
     Build the SPARQL query to fetch tracks for an album.
@@ -17,6 +75,29 @@ def get_tracks_by_album_query(album_qid: str) -> str:
     """
     
 
+def get_tracks_by_albums_query(album_qids: List[str]) -> str:
+    """
+    Build the SPARQL query to fetch tracks for several albums in one request.
+
+    Each result row carries `?album`, so the response can be split back out
+    per album.
+
+    Args:
+        album_qids: Wikidata QIDs of the albums.
+
+    Returns:
+        A SPARQL query string selecting tracks that are part of any of the albums.
+    """
+    return f"""
+    SELECT ?album ?track ?trackLabel ?trackNumber WHERE {{
+      {format_values_block("album", album_qids)}
+      ?track wdt:P361 ?album.  # Track is "part of" the album
+      OPTIONAL {{ ?track wdt:P1545 ?trackNumber. }}
+      SERVICE wikibase:label {{ bd:serviceParam wikibase:language "en". }}
+    }}
+    """
+
+
 def get_albums_by_artist_query(artist_qid: str) -> str:
     """
     Build the SPARQL query to fetch albums for an artist.
@@ -40,6 +121,48 @@ def get_albums_by_artist_query(artist_qid: str) -> str:
     """
 
 
+def format_values_block(variable: str, qids: List[str]) -> str:
+    """
+    Build a SPARQL VALUES block binding a variable to a list of Wikidata entities.
+
+    Args:
+        variable: The SPARQL variable name without the leading "?".
+        qids: Wikidata QIDs to bind (e.g., ["Q42", "Q1299"]).
+
+    Returns:
+        A VALUES clause such as `VALUES ?artist { wd:Q42 wd:Q1299 }`.
+    """
+    entities = " ".join(f"wd:{qid}" for qid in qids)
+    return f"VALUES ?{variable} {{ {entities} }}"
+
+
+def get_albums_by_artists_query(artist_qids: List[str]) -> str:
+    """
+    Build the SPARQL query to fetch albums for several artists in one request.
+
+    Each result row carries `?artist`, so the response can be split back out
+    per artist.
+
+    Args:
+        artist_qids: Wikidata QIDs of the artists.
+
+    Returns:
+        A SPARQL query string selecting albums performed by any of the artists.
+    """
+    return f"""
+    SELECT ?artist ?album ?albumLabel ?releaseDate WHERE {{
+      {format_values_block("artist", artist_qids)}
+      ?album wdt:P175 ?artist.
+      FILTER NOT EXISTS {{ ?album wdt:P31 wd:Q134556. }}   # exclude singles
+      FILTER NOT EXISTS {{ ?album wdt:P7937 wd:Q222910. }}  # exclude compilations
+      FILTER NOT EXISTS {{ ?album wdt:P7937 wd:Q209939. }}  # exclude live albums
+      FILTER NOT EXISTS {{ ?album wdt:P31 wd:Q10590726. }}  # exclude video albums
+      OPTIONAL {{ ?album wdt:P577 ?releaseDate. }}
+      SERVICE wikibase:label {{ bd:serviceParam wikibase:language "en". }}
+    }}
+    """
+
+
 def get_artists_by_year_range_query(
     start_year: int, end_year: int, limit: int, offset: int
 ) -> str:
@@ -55,6 +178,41 @@ def get_artists_by_year_range_query(
     Returns:
         A formatted SPARQL query string.
     """
+    date_filter = (
+        f'?date >= "{start_year}-01-01"^^xsd:dateTime && '
+        f'?date <= "{end_year}-12-31"^^xsd:dateTime'
+    )
+    return _build_artists_query(date_filter, limit, offset)
+
+
+def get_artists_by_date_range_query(
+    start_date: str, end_date: str, limit: int, offset: int = 0
+) -> str:
+    """
+    Generate a SPARQL query to fetch artists whose inception falls within a
+    half-open date window. Adjacent windows never overlap, so a period can be
+    split into independent partitions.
+
+    Args:
+        start_date: The first day of the window (inclusive, "YYYY-MM-DD").
+        end_date: The day after the window (exclusive, "YYYY-MM-DD").
+        limit: The maximum number of results to return.
+        offset: The offset from which to start fetching results.
+
+    Returns:
+        A formatted SPARQL query string.
+    """
+    date_filter = (
+        f'?date >= "{start_date}T00:00:00Z"^^xsd:dateTime && '
+        f'?date < "{end_date}T00:00:00Z"^^xsd:dateTime'
+    )
+    return _build_artists_query(date_filter, limit, offset)
+
+
+def _build_artists_query(date_filter: str, limit: int, offset: int) -> str:
+    """
+    Fill the artist query template with a date filter and paging clauses.
+    """
     # This query template is formatted with all necessary parameters.
     # Note the use of f-string interpolation for all dynamic values.
     return f"""
@@ -77,49 +235,28 @@ WHERE {{
   hint:Query hint:optimizer "None" .
 
   VALUES ?root_genre {{
-    wd:Q11399    # Rock music
-    wd:Q9778     # Electronic music
-    wd:Q37073    # Pop music
-    wd:Q11366    # Alternative rock
-    wd:Q187760   # New wave
-    wd:Q1298934  # Synth-pop
-    wd:Q598929   # Post-punk
-    wd:Q178526   # Gothic rock
-    wd:Q846083   # Dark wave
-    wd:Q193606   # Trip hop
-    wd:Q163891   # Experimental music
-    wd:Q272167   # Shoegaze
-    wd:Q596877   # Electronic body music (EBM)
-    wd:Q170068   # Industrial music
-    wd:Q38848    # Heavy metal music
-    wd:Q786638   # Psychedelic music
-    wd:Q76058    # Glam rock
-    wd:Q58339    # Disco
+{_format_qid_lines(ARTIST_ROOT_GENRES, indent=4)}
   }}
 
   ?genre wdt:P279* ?root_genre .
   ?artist wdt:P136 ?genre .
   BIND(STRAFTER(STR(?genre), STR(wd:)) AS ?genre_id)
   ?artist wikibase:sitelinks ?linkcount .
-  FILTER(?linkcount > 7)
+  FILTER(?linkcount > {MIN_ARTIST_SITELINKS})
   ?artist wdt:P31 ?type .
-  FILTER(?type IN (wd:Q215380, wd:Q5))
+  FILTER(?type IN (wd:{MUSICAL_GROUP_QID}, wd:{HUMAN_QID}))
 
   OPTIONAL {{ ?artist wdt:P571 ?inception . }}
   OPTIONAL {{ ?artist wdt:P2031 ?work_start . }}
   BIND(COALESCE(?inception, ?work_start) AS ?date)
-  FILTER(?date >= "{start_year}-01-01"^^xsd:dateTime && ?date <= "{end_year}-12-31"^^xsd:dateTime)
+  FILTER({date_filter})
 
   FILTER(
-    ?type = wd:Q215380 ||
+    ?type = wd:{MUSICAL_GROUP_QID} ||
     EXISTS {{
       ?artist wdt:P106 ?occ .
       FILTER(?occ IN (
-        wd:Q639669,  # Musician
-        wd:Q177220,  # Singer
-        wd:Q130857,  # Disc jockey (DJ)
-        wd:Q486748,  # Composer
-        wd:Q183945   # Record producer
+{_format_qid_lines(MUSICIAN_OCCUPATIONS, indent=8, separator=",")}
       ))
     }}
   )
@@ -0,0 +1,344 @@
+"""
+Utility functions for building the artist index from a local Wikidata JSON dump.
+
+The dump (`latest-all.json.gz`/`.bz2`, or a pre-filtered subset in the same
+one-entity-per-line format) is streamed through a pool of worker processes that
+apply the same filters as `get_artists_by_year_range_query`. Matching entities
+are converted to SPARQL-style bindings and formatted with
+`format_artist_record_from_sparql`, so both paths emit identical records.
+"""
+
+import bz2
+import gzip
+import json
+import logging
+import urllib.parse
+from collections import defaultdict
+from functools import partial
+from itertools import islice
+from multiprocessing import Pool
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, TextIO, Tuple
+
+from dagster import Config
+from pydantic import Field
+
+from music_rag_etl.utils.sparql_queries import (
+    ARTIST_ROOT_GENRES,
+    HUMAN_QID,
+    MIN_ARTIST_SITELINKS,
+    MUSICAL_GROUP_QID,
+    MUSICIAN_OCCUPATIONS,
+)
+from music_rag_etl.utils.io_helpers import json_loads
+from music_rag_etl.utils.wikidata_helpers import format_artist_record_from_sparql
+from music_rag_etl.settings import WIKIDATA_ENTITY_URL
+
+logger = logging.getLogger(__name__)
+
+# Languages requested as `artistLabel_{lang}` by the artist index query
+LABEL_LANGUAGES = ["en", "es", "fr", "de"]
+# Fallback chain of the SPARQL label service ("en,es,en-gb,fr,de")
+LABEL_SERVICE_LANGUAGES = ["en", "es", "en-gb", "fr", "de"]
+DUMP_LINES_PER_TASK = 1000
+
+
+class WikidataDumpConfig(Config):
+    """Configuration for building the artist index from a local Wikidata dump."""
+    dump_path: Optional[str] = Field(
+        None,
+        description="Path to a Wikidata JSON dump (.json, .json.gz or .json.bz2). "
+        "When empty, the artist index is merged from the SPARQL decade extracts.",
+    )
+    processes: int = Field(4, description="Number of parser worker processes.")
+
+
+def open_dump(dump_path: Path) -> TextIO:
+    """
+    Opens a Wikidata JSON dump for streaming, decompressing by file extension.
+
+    Args:
+        dump_path: Path to a `.json`, `.json.gz` or `.json.bz2` dump.
+
+    Returns:
+        A text file handle yielding one dump line at a time.
+    """
+    if dump_path.suffix == ".gz":
+        return gzip.open(dump_path, "rt", encoding="utf-8")
+    if dump_path.suffix == ".bz2":
+        return bz2.open(dump_path, "rt", encoding="utf-8")
+    return open(dump_path, "r", encoding="utf-8")
+
+
+def parse_dump_line(line: str) -> Optional[Dict[str, Any]]:
+    """
+    Parses one line of a Wikidata JSON dump into an entity dictionary.
+
+    The dump is a JSON array with one entity per line, so the array brackets
+    and the trailing commas are stripped.
+
+    Returns:
+        The entity, or None for the array brackets, blank or malformed lines.
+    """
+    line = line.strip().rstrip(",")
+    if not line or line in ("[", "]"):
+        return None
+    try:
+        return json_loads(line)
+    except json.JSONDecodeError:
+        return None
+
+
+def get_truthy_claim_values(entity: Dict[str, Any], property_id: str) -> List[Any]:
+    """
+    Returns the values of the "truthy" statements for a property, mirroring the
+    `wdt:` prefix in SPARQL: preferred-rank statements if any exist, otherwise
+    normal-rank ones. Deprecated statements and novalue/somevalue are skipped.
+
+    Item values are returned as QIDs; all other values are returned as-is.
+    """
+    statements = [
+        claim
+        for claim in entity.get("claims", {}).get(property_id, [])
+        if claim.get("rank") != "deprecated"
+    ]
+    preferred = [claim for claim in statements if claim.get("rank") == "preferred"]
+
+    values = []
+    for claim in preferred or statements:
+        main_snak = claim.get("mainsnak", {})
+        if main_snak.get("snaktype") != "value":
+            continue
+        value = main_snak.get("datavalue", {}).get("value")
+        if isinstance(value, dict) and "id" in value:
+            value = value["id"]
+        values.append(value)
+    return values
+
+
+def wikidata_time_to_datetime(time_value: Dict[str, Any]) -> Optional[str]:
+    """
+    Converts a Wikidata time value (e.g., "+1965-00-00T00:00:00Z") into the
+    xsd:dateTime string returned by the SPARQL endpoint ("1965-01-01T00:00:00Z").
+
+    Returns:
+        The normalized date string, or None for BCE or unparsable dates.
+    """
+    if not isinstance(time_value, dict):
+        return None
+    raw_time = time_value.get("time", "")
+    if not raw_time.startswith("+"):
+        return None
+    try:
+        date_part, time_part = raw_time[1:].split("T")
+        year, month, day = date_part.split("-")
+    except ValueError:
+        return None
+    return f"{int(year):04d}-{max(int(month), 1):02d}-{max(int(day), 1):02d}T{time_part}"
+
+
+def build_wikipedia_url(title: str) -> str:
+    """Builds the English Wikipedia article URL for a sitelink title."""
+    quoted_title = urllib.parse.quote(title.replace(" ", "_"), safe="/:(),'!*$@;")
+    return f"https://en.wikipedia.org/wiki/{quoted_title}"
+
+
+def extract_subclass_edges(lines: List[str]) -> List[Tuple[str, List[str]]]:
+    """
+    Worker function returning (qid, superclass QIDs) for every entity in a
+    chunk of dump lines that has "subclass of" (P279) statements.
+    """
+    edges = []
+    for line in lines:
+        entity = parse_dump_line(line)
+        if not entity:
+            continue
+        parents = [value for value in get_truthy_claim_values(entity, "P279") if value]
+        if parents:
+            edges.append((entity["id"], parents))
+    return edges
+
+
+def compute_genre_closure(
+    subclass_edges: Iterable[Tuple[str, List[str]]], root_genres: Iterable[str]
+) -> Set[str]:
+    """
+    Computes all QIDs that are a (transitive) subclass of any root genre,
+    including the roots themselves, like `?genre wdt:P279* ?root_genre`.
+    """
+    children_by_parent: Dict[str, List[str]] = defaultdict(list)
+    for child, parents in subclass_edges:
+        for parent in parents:
+            children_by_parent[parent].append(child)
+
+    closure = set(root_genres)
+    stack = list(closure)
+    while stack:
+        for child in children_by_parent.get(stack.pop(), []):
+            if child not in closure:
+                closure.add(child)
+                stack.append(child)
+    return closure
+
+
+def entity_to_sparql_bindings(
+    entity: Dict[str, Any],
+    genre_qids: Set[str],
+    date_ranges: List[Tuple[int, int]],
+) -> List[Dict[str, Any]]:
+    """
+    Evaluates the artist index query filters on a single dump entity.
+
+    Args:
+        entity: A Wikidata entity from the dump.
+        genre_qids: The closure of accepted genre QIDs.
+        date_ranges: Inclusive (start_year, end_year) ranges to accept.
+
+    Returns:
+        One SPARQL-style binding per distinct matching date (as GROUP BY ?date
+        would), or an empty list if the entity does not qualify.
+    """
+    if entity.get("type") != "item":
+        return []
+
+    sitelinks = entity.get("sitelinks", {})
+    if len(sitelinks) <= MIN_ARTIST_SITELINKS:
+        return []
+
+    types = set(get_truthy_claim_values(entity, "P31"))
+    if MUSICAL_GROUP_QID not in types:
+        if HUMAN_QID not in types:
+            return []
+        occupations = set(get_truthy_claim_values(entity, "P106"))
+        if not occupations & set(MUSICIAN_OCCUPATIONS):
+            return []
+
+    genres = sorted(
+        {genre for genre in get_truthy_claim_values(entity, "P136") if genre in genre_qids}
+    )
+    if not genres:
+        return []
+
+    # COALESCE(?inception, ?work_start): work start only counts without inception
+    dates = get_truthy_claim_values(entity, "P571") or get_truthy_claim_values(
+        entity, "P2031"
+    )
+    matching_dates = []
+    for time_value in dates:
+        date_value = wikidata_time_to_datetime(time_value)
+        if not date_value or date_value in matching_dates:
+            continue
+        if any(
+            f"{start}-01-01" <= date_value[:10] <= f"{end}-12-31"
+            for start, end in date_ranges
+        ):
+            matching_dates.append(date_value)
+    if not matching_dates:
+        return []
+
+    labels = entity.get("labels", {})
+    service_label = next(
+        (labels[lang]["value"] for lang in LABEL_SERVICE_LANGUAGES if lang in labels),
+        entity["id"],
+    )
+    aliases = [alias["value"] for alias in entity.get("aliases", {}).get("en", [])]
+
+    base_binding = {
+        "artist": {"value": f"{WIKIDATA_ENTITY_URL}{entity['id']}"},
+        "artistLabel": {"value": service_label},
+        "linkcount": {"value": str(len(sitelinks))},
+        "genres": {"value": "|".join(genres)},
+        "aliases": {"value": "|".join(aliases)},
+    }
+    for lang in LABEL_LANGUAGES:
+        if lang in labels:
+            base_binding[f"artistLabel_{lang}"] = {"value": labels[lang]["value"]}
+    if "enwiki" in sitelinks:
+        base_binding["wikipedia_url"] = {
+            "value": build_wikipedia_url(sitelinks["enwiki"]["title"])
+        }
+
+    return [{**base_binding, "date": {"value": date_value}} for date_value in matching_dates]
+
+
+def extract_artist_records(
+    lines: List[str],
+    genre_qids: Set[str],
+    date_ranges: List[Tuple[int, int]],
+) -> List[Dict[str, Any]]:
+    """
+    Worker function returning the artist index records of a chunk of dump lines.
+    """
+    records = []
+    for line in lines:
+        entity = parse_dump_line(line)
+        if not entity:
+            continue
+        for binding in entity_to_sparql_bindings(entity, genre_qids, date_ranges):
+            record = format_artist_record_from_sparql(binding)
+            if record:
+                records.append(record)
+    return records
+
+
+def _iter_line_chunks(dump_path: Path, chunk_size: int) -> Iterator[List[str]]:
+    """Yields successive chunks of raw lines from a dump file."""
+    with open_dump(dump_path) as dump_file:
+        while True:
+            chunk = list(islice(dump_file, chunk_size))
+            if not chunk:
+                return
+            yield chunk
+
+
+def _map_dump(
+    dump_path: Path,
+    worker: Callable[[List[str]], List[Any]],
+    processes: int,
+) -> Iterator[List[Any]]:
+    """
+    Streams a dump through a worker function, in parallel when processes > 1.
+    Results are yielded in file order.
+    """
+    chunks = _iter_line_chunks(dump_path, DUMP_LINES_PER_TASK)
+    if processes <= 1:
+        yield from map(worker, chunks)
+        return
+    with Pool(processes=processes) as pool:
+        yield from pool.imap(worker, chunks)
+
+
+def iter_artist_records_from_dump(
+    dump_path: Path,
+    date_ranges: List[Tuple[int, int]],
+    genre_qids: Optional[Set[str]] = None,
+    processes: int = 4,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Streams a Wikidata dump and yields artist index records.
+
+    When `genre_qids` is not given, a first pass over the dump collects the
+    "subclass of" graph to resolve the genre closure of ARTIST_ROOT_GENRES.
+
+    Args:
+        dump_path: Path to the Wikidata JSON dump.
+        date_ranges: Inclusive (start_year, end_year) ranges to accept.
+        genre_qids: Optional precomputed closure of accepted genre QIDs.
+        processes: Number of parser worker processes.
+
+    Yields:
+        Records in the format of `format_artist_record_from_sparql`.
+    """
+    if genre_qids is None:
+        logger.info(f"Resolving genre subclass closure from {dump_path}...")
+        subclass_edges = (
+            edge
+            for edges in _map_dump(dump_path, extract_subclass_edges, processes)
+            for edge in edges
+        )
+        genre_qids = compute_genre_closure(subclass_edges, ARTIST_ROOT_GENRES)
+        logger.info(f"Resolved {len(genre_qids)} genre QIDs.")
+
+    worker = partial(extract_artist_records, genre_qids=genre_qids, date_ranges=date_ranges)
+    for records in _map_dump(dump_path, worker, processes):
+        yield from records
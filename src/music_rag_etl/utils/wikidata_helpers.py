@@ -1,8 +1,13 @@
 import json
 import asyncio
+import threading
 import aiohttp
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, timedelta
+from functools import partial
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Generator
+from typing import Any, Callable, Dict, Iterator, List, Optional, Generator, Tuple
 
 import requests
 from dagster import AssetExecutionContext
@@ -11,15 +16,46 @@ from music_rag_etl import settings
 from music_rag_etl.settings import (
     WIKIDATA_ENTITY_URL,
     WIKIDATA_CACHE_DIR,
+    WIKIDATA_CACHE_BACKEND,
+    WIKIDATA_CACHE_DB,
     USER_AGENT,
     WIKIDATA_SPARQL_URL,
     WIKIDATA_HEADERS,
     WIKIDATA_BATCH_SIZE,
+    WIKIDATA_API_MAX_IDS,
+    WIKIDATA_CLAIM_WHITELIST,
+    WIKIDATA_ENTITY_PROPS,
+    WIKIDATA_MICROBATCH_DELAY,
+    SPARQL_PARTITION_WORKERS,
 )
 from music_rag_etl.utils.request_utils import (
     make_request_with_retries,
     async_make_request_with_retries,
+    fetch_latest_revisions,
 )
+from music_rag_etl.utils.cache_helpers import (
+    CacheBackend,
+    MemoryTierBackend,
+    async_get_many,
+    create_cache_backend,
+    get_cache_codec,
+    get_cache_policy,
+    memory_caches,
+)
+from music_rag_etl.utils.concurrency_helpers import (
+    AdaptiveBatchSize,
+    MicroBatcher,
+    SingleFlight,
+)
+from music_rag_etl.utils.io_helpers import chunk_list, json_dumps, json_loads
+
+# Lazily-created, process-wide cache backend (see get_wikidata_cache)
+_wikidata_cache: Optional[CacheBackend] = None
+_wikidata_cache_lock = threading.Lock()
+# Concurrent cache misses for the same SPARQL cache key or (props, QID) share
+# one request
+_sparql_flights = SingleFlight()
+_entity_flights = SingleFlight()
 
 
 ######################################################################
@@ -29,57 +65,71 @@ from music_rag_etl.utils.request_utils import (
 ######################################################################
 
 
-async def async_fetch_sparql_with_cache(
+async def _async_fetch_sparql_cached(
     context: AssetExecutionContext,
-    artist_qid: str,
+    cache_key: str,
     query: str,
+    label: str,
     session: Optional[aiohttp.ClientSession] = None,
 ) -> Dict[str, Any]:
     """
-    Fetches the results of a SPARQL query, using a local file cache in WIKIDATA_CACHE_DIR.
+    Runs a SPARQL query, storing the raw response under `cache_key` in the
+    Wikidata cache backend.
     """
-    await asyncio.to_thread(WIKIDATA_CACHE_DIR.mkdir, parents=True, exist_ok=True)
-    # Prefix the filename to avoid conflict with entity QID files
-    cache_file = WIKIDATA_CACHE_DIR / f"sparql_albums_{artist_qid}.json"
+    cache = get_wikidata_cache()
+    try:
+        cached = (await async_get_many(cache, [cache_key])).get(cache_key)
+        if cached is not None:
+            context.log.debug(f"Using cached SPARQL results for {label}.")
+            return cached
+    except Exception as e:
+        context.log.warning(f"Failed to read cache for {label}, refetching. Error: {e}")
 
-    exists = await asyncio.to_thread(cache_file.exists)
-    if exists:
+    # Cache miss: concurrent misses for the same key share one request
+    async def fetch() -> Dict[str, Any]:
         try:
-            def read_json():
-                with open(cache_file, "r", encoding="utf-8") as f:
-                    return json.load(f)
-            data = await asyncio.to_thread(read_json)
-            context.log.debug(f"Using cached SPARQL results for artist {artist_qid}.")
-            return data
+            response_data = await async_make_request_with_retries(
+                context=context,
+                url=WIKIDATA_SPARQL_URL,
+                method="POST",
+                params={"query": query, "format": "json"},
+                headers=WIKIDATA_HEADERS,
+                session=session,
+                timeout=60,
+            )
+
+            if isinstance(response_data, str):
+                response_data = json_loads(response_data)
+
+            # Cache the successful response
+            await asyncio.to_thread(cache.put, cache_key, response_data)
+            return response_data
+
         except Exception as e:
-            context.log.warning(f"Failed to read cache for {artist_qid}, refetching. Error: {e}")
+            context.log.warning(f"SPARQL request failed for {label}: {e}")
+            return {}
 
-    # Cache miss
-    try:
-        response_data = await async_make_request_with_retries(
-            context=context,
-            url=WIKIDATA_SPARQL_URL,
-            method="POST",
-            params={"query": query, "format": "json"},
-            headers=WIKIDATA_HEADERS,
-            session=session,
-            timeout=60,
-        )
-        
-        if isinstance(response_data, str):
-            response_data = json.loads(response_data)
-
-        # Cache the successful response
-        def write_json(data):
-            with open(cache_file, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False)
-        
-        await asyncio.to_thread(write_json, response_data)
-        return response_data
+    return await _sparql_flights.do(cache_key, fetch)
 
-    except Exception as e:
-        context.log.warning(f"SPARQL request failed for artist {artist_qid}: {e}")
-        return {}
+
+async def async_fetch_sparql_with_cache(
+    context: AssetExecutionContext,
+    artist_qid: str,
+    query: str,
+    session: Optional[aiohttp.ClientSession] = None,
+) -> Dict[str, Any]:
+    """
+    Fetches the results of an album SPARQL query for an artist, using the
+    Wikidata cache backend.
+    """
+    # Prefix the key to avoid conflict with entity QID entries
+    return await _async_fetch_sparql_cached(
+        context,
+        cache_key=f"sparql_albums_{artist_qid}",
+        query=query,
+        label=f"artist {artist_qid}",
+        session=session,
+    )
 
 
 async def async_fetch_tracks_sparql_with_cache(
@@ -89,48 +139,188 @@ async def async_fetch_tracks_sparql_with_cache(
     session: Optional[aiohttp.ClientSession] = None,
 ) -> Dict[str, Any]:
     """
-    Fetches the results of a SPARQL query for tracks, using a local file cache.
+    Fetches the results of a SPARQL query for tracks, using the Wikidata cache
+    backend.
     """
-    await asyncio.to_thread(WIKIDATA_CACHE_DIR.mkdir, parents=True, exist_ok=True)
-    cache_file = WIKIDATA_CACHE_DIR / f"sparql_tracks_{album_qid}.json"
+    return await _async_fetch_sparql_cached(
+        context,
+        cache_key=f"sparql_tracks_{album_qid}",
+        query=query,
+        label=f"album {album_qid}",
+        session=session,
+    )
 
-    exists = await asyncio.to_thread(cache_file.exists)
-    if exists:
-        try:
-            def read_json():
-                with open(cache_file, "r", encoding="utf-8") as f:
-                    return json.load(f)
-            data = await asyncio.to_thread(read_json)
-            context.log.debug(f"Using cached SPARQL results for album {album_qid}.")
-            return data
-        except Exception as e:
-            context.log.warning(f"Failed to read cache for album {album_qid}, refetching. Error: {e}")
 
-    # Cache miss
+async def async_fetch_grouped_sparql_with_cache(
+    context: AssetExecutionContext,
+    qids: List[str],
+    cache_prefix: str,
+    get_query_function: Callable[[List[str]], str],
+    group_variable: str,
+    session: Optional[aiohttp.ClientSession] = None,
+    batch_size: Optional[AdaptiveBatchSize] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Runs batched SPARQL queries for several entities and splits the result
+    rows back out per entity, using per-entity cache entries.
+
+    Only the QIDs missing from the cache are sent to the endpoint, so cached
+    and uncached entities can be mixed freely; QIDs already being fetched by a
+    concurrent call are awaited from it. Each entity is cached under
+    `{cache_prefix}_{qid}` with the same response shape as the single-entity
+    helpers, so batched and single-entity entries are interchangeable.
+    Entities without rows are cached as empty results.
+
+    Args:
+        context: Dagster asset execution context.
+        qids: The Wikidata QIDs to fetch results for.
+        cache_prefix: Cache key prefix (e.g., "sparql_albums").
+        get_query_function: Builds the batched query from a list of QIDs.
+        group_variable: The SPARQL variable identifying the entity in each row.
+        session: Optional shared aiohttp session.
+        batch_size: Optional shared batch size controller. When given, the
+            missing QIDs are sent in sub-batches of its current size, and a
+            failing sub-batch shrinks the size and is split and retried.
+
+    Returns:
+        A dictionary mapping each resolved QID to its SPARQL response. QIDs
+        whose request failed are omitted so they are retried on the next run.
+    """
+    cache = get_wikidata_cache()
+    key_to_qid = {f"{cache_prefix}_{qid}": qid for qid in qids}
+    try:
+        cached = await async_get_many(cache, list(key_to_qid))
+    except Exception as e:
+        context.log.warning(f"Failed to read {cache_prefix} cache, refetching. Error: {e}")
+        cached = {}
+
+    results = {key_to_qid[key]: data for key, data in cached.items()}
+    missing_keys = [key for key, qid in key_to_qid.items() if qid not in results]
+    if not missing_keys:
+        return results
+
+    # Entities already being fetched by a concurrent call (batched or single)
+    # are awaited from that call instead of being queried again
+    fetched = await _sparql_flights.do_many(
+        missing_keys,
+        lambda keys: _async_fetch_sparql_groups(
+            context,
+            [key_to_qid[key] for key in keys],
+            cache_prefix,
+            get_query_function,
+            group_variable,
+            session,
+            batch_size,
+        ),
+    )
+    results.update({key_to_qid[key]: data for key, data in fetched.items()})
+    return results
+
+
+async def _async_fetch_sparql_groups(
+    context: AssetExecutionContext,
+    qids: List[str],
+    cache_prefix: str,
+    get_query_function: Callable[[List[str]], str],
+    group_variable: str,
+    session: Optional[aiohttp.ClientSession] = None,
+    batch_size: Optional[AdaptiveBatchSize] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Fetches and caches the grouped SPARQL results of uncached entities, in
+    sub-batches sized by `batch_size` when given.
+
+    Returns:
+        A dictionary mapping the cache key of each resolved entity to its
+        SPARQL response.
+    """
+    results: Dict[str, Dict[str, Any]] = {}
+    if batch_size is None:
+        fetched = await _async_fetch_sparql_group(
+            context, qids, cache_prefix, get_query_function, group_variable, session
+        )
+        results.update(fetched or {})
+    else:
+        pending = deque(chunk_list(qids, batch_size.current))
+        while pending:
+            sub_batch = pending.popleft()
+            # Fail fast on large batches so a timing-out query is split instead
+            # of being retried at full size.
+            fetched = await _async_fetch_sparql_group(
+                context,
+                sub_batch,
+                cache_prefix,
+                get_query_function,
+                group_variable,
+                session,
+                max_retries=3 if len(sub_batch) > batch_size.minimum else 10,
+            )
+            if fetched is not None:
+                batch_size.on_success()
+                results.update(fetched)
+                continue
+
+            if len(sub_batch) > batch_size.minimum:
+                new_size = min(batch_size.on_failure(), (len(sub_batch) + 1) // 2)
+                context.log.warning(
+                    f"Splitting failed {cache_prefix} batch of {len(sub_batch)} "
+                    f"into batches of {new_size}."
+                )
+                pending.extendleft(reversed(list(chunk_list(sub_batch, new_size))))
+
+    return {f"{cache_prefix}_{qid}": data for qid, data in results.items()}
+
+
+async def _async_fetch_sparql_group(
+    context: AssetExecutionContext,
+    qids: List[str],
+    cache_prefix: str,
+    get_query_function: Callable[[List[str]], str],
+    group_variable: str,
+    session: Optional[aiohttp.ClientSession] = None,
+    max_retries: int = 10,
+) -> Optional[Dict[str, Dict[str, Any]]]:
+    """
+    Runs a single batched SPARQL query, groups its rows by entity and caches
+    one entry per entity. Returns None if the request failed.
+    """
     try:
         response_data = await async_make_request_with_retries(
             context=context,
             url=WIKIDATA_SPARQL_URL,
             method="POST",
-            params={"query": query, "format": "json"},
+            params={"query": get_query_function(qids), "format": "json"},
             headers=WIKIDATA_HEADERS,
             session=session,
             timeout=60,
+            max_retries=max_retries,
         )
-        
         if isinstance(response_data, str):
-            response_data = json.loads(response_data)
+            response_data = json_loads(response_data)
+    except Exception as e:
+        context.log.warning(
+            f"Batched SPARQL request failed for {len(qids)} {cache_prefix} entities: {e}"
+        )
+        return None
 
-        def write_json(data):
-            with open(cache_file, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False)
-        
-        await asyncio.to_thread(write_json, response_data)
-        return response_data
+    grouped_bindings: Dict[str, List[Dict[str, Any]]] = {qid: [] for qid in qids}
+    for item in response_data.get("results", {}).get("bindings", []):
+        qid = extract_qid_from_wikidata_url(get_sparql_binding_value(item, group_variable))
+        if qid in grouped_bindings:
+            grouped_bindings[qid].append(item)
 
+    fetched = {
+        qid: {"results": {"bindings": bindings}}
+        for qid, bindings in grouped_bindings.items()
+    }
+    try:
+        await asyncio.to_thread(
+            get_wikidata_cache().put_many,
+            {f"{cache_prefix}_{qid}": data for qid, data in fetched.items()},
+        )
     except Exception as e:
-        context.log.warning(f"SPARQL request failed for album {album_qid}: {e}")
-        return {}
+        context.log.error(f"Could not write {cache_prefix} cache for batch. Error: {e}")
+    return fetched
 
 
 def execute_sparql_extraction(
@@ -139,16 +329,22 @@ def execute_sparql_extraction(
     get_query_function: Callable,
     record_processor: Callable,
     label: str,
+    paginator: Optional[Callable[..., Iterator[List[Dict[str, Any]]]]] = None,
     **query_params,
 ) -> None:
     """
     Orchestrates fetching, processing, and saving data from a SPARQL endpoint.
+
+    The paginator defaults to `paginate_sparql_query` (LIMIT/OFFSET paging);
+    pass `paginate_sparql_query_by_date` to fetch independent date partitions
+    concurrently instead.
     """
+    paginator = paginator or paginate_sparql_query
     total_written = 0
     output_path.parent.mkdir(parents=True, exist_ok=True)
     with open(output_path, "w", encoding="utf-8") as outfile:
         for batch_num, results_batch in enumerate(
-            paginate_sparql_query(context, get_query_function, **query_params), start=1
+            paginator(context, get_query_function, **query_params), start=1
         ):
             context.log.info(
                 f"Processing batch {batch_num} for {label}: {len(results_batch)} records"
@@ -157,7 +353,7 @@ def execute_sparql_extraction(
                 processed_record = record_processor(item)
                 if processed_record:
                     outfile.write(
-                        json.dumps(processed_record, ensure_ascii=False) + "\n"
+                        json_dumps(processed_record) + "\n"
                     )
                     total_written += 1
 
@@ -192,6 +388,105 @@ def paginate_sparql_query(
         offset += len(results)
 
 
+def build_year_partitions(start_year: int, end_year: int) -> List[Tuple[date, date]]:
+    """
+    Splits an inclusive year range into half-open yearly date windows.
+
+    Args:
+        start_year: The first year of the period (inclusive).
+        end_year: The last year of the period (inclusive).
+
+    Returns:
+        A list of (start, end) windows where `end` is exclusive.
+    """
+    return [(date(year, 1, 1), date(year + 1, 1, 1)) for year in range(start_year, end_year + 1)]
+
+
+def fetch_sparql_date_partition(
+    context: AssetExecutionContext,
+    get_query_function: Callable[..., str],
+    start: date,
+    end: date,
+    limit: int = WIKIDATA_BATCH_SIZE,
+) -> List[Dict[str, Any]]:
+    """
+    Fetches all rows of a half-open date window with cheap, OFFSET-free queries.
+
+    A window that fills a whole page is bisected and both halves are fetched
+    instead, so every query stays small. Only a single day that still fills a
+    page falls back to OFFSET paging within that day.
+
+    Args:
+        context: Dagster asset execution context.
+        get_query_function: Builds a query from `start_date`, `end_date`,
+            `limit` and `offset` (e.g., `get_artists_by_date_range_query`).
+        start: The first day of the window (inclusive).
+        end: The day after the window (exclusive).
+        limit: The page size.
+
+    Returns:
+        All result rows of the window.
+    """
+    def fetch_page(offset: int) -> List[Dict[str, Any]]:
+        query = get_query_function(
+            start_date=start.isoformat(), end_date=end.isoformat(), limit=limit, offset=offset
+        )
+        return fetch_sparql_query(context, query)
+
+    results = fetch_page(0)
+    if len(results) < limit:
+        return results
+
+    span = (end - start).days
+    if span > 1:
+        middle = start + timedelta(days=span // 2)
+        context.log.debug(f"Splitting saturated window {start} - {end} at {middle}.")
+        return fetch_sparql_date_partition(
+            context, get_query_function, start, middle, limit
+        ) + fetch_sparql_date_partition(context, get_query_function, middle, end, limit)
+
+    offset = len(results)
+    while True:
+        page = fetch_page(offset)
+        results.extend(page)
+        if len(page) < limit:
+            return results
+        offset += len(page)
+
+
+def paginate_sparql_query_by_date(
+    context: AssetExecutionContext,
+    get_query_function: Callable[..., str],
+    start_year: int,
+    end_year: int,
+    max_workers: int = SPARQL_PARTITION_WORKERS,
+) -> Generator[List[Dict[str, Any]], None, None]:
+    """
+    A generator that splits a year range into yearly partitions, fetches them
+    concurrently and yields the rows of each partition as it completes.
+
+    Unlike `paginate_sparql_query`, no query re-evaluates and re-sorts the
+    rows of earlier pages, so the cost grows linearly with the result size.
+    """
+    partitions = build_year_partitions(start_year, end_year)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        future_to_partition = {
+            executor.submit(
+                fetch_sparql_date_partition, context, get_query_function, start, end
+            ): (start, end)
+            for start, end in partitions
+        }
+        for future in as_completed(future_to_partition):
+            start, end = future_to_partition[future]
+            try:
+                results = future.result()
+            except Exception as e:
+                context.log.error(f"Failed to fetch SPARQL partition {start} - {end}: {e}")
+                continue
+            if results:
+                yield results
+
+
 def get_best_label(
     record: Dict[str, any],
     base_key: str,
@@ -278,7 +573,7 @@ def resolve_qids_to_labels(
         return {}
 
     # This function is already designed to be efficient by using batching and a file cache.
-    entities_data = fetch_wikidata_entities_batch_with_cache(context, qids)
+    entities_data = fetch_wikidata_entities_batch_with_cache(context, qids, props="labels")
 
     labels_map = {}
     for qid, entity_info in entities_data.items():
@@ -295,14 +590,20 @@ async def async_resolve_qids_to_labels(
     context: AssetExecutionContext,
     qids: List[str],
     session: Optional[aiohttp.ClientSession] = None,
+    batcher: Optional["WikidataEntityBatcher"] = None,
 ) -> Dict[str, str]:
     """
     Efficiently resolves a list of Wikidata QIDs to their English labels asynchronously.
+
+    When a "labels" `batcher` is given, uncached QIDs are fetched together with
+    those of other concurrent callers instead of in a request of their own.
     """
     if not qids:
         return {}
 
-    entities_data = await async_fetch_wikidata_entities_batch_with_cache(context, qids, session)
+    entities_data = await async_fetch_wikidata_entities_batch_with_cache(
+        context, qids, session, props="labels", batcher=batcher
+    )
 
     labels_map = {}
     for qid, entity_info in entities_data.items():
@@ -322,11 +623,177 @@ async def async_resolve_qids_to_labels(
 ######################################################################
 
 
+def get_wikidata_cache() -> CacheBackend:
+    """
+    Returns the process-wide cache backend for Wikidata responses.
+
+    The backend is created lazily on first use, as configured by
+    WIKIDATA_CACHE_BACKEND, CACHE_COMPRESSION and CACHE_POLICIES in settings,
+    behind the process-wide "wikidata" memory tier.
+    """
+    global _wikidata_cache
+    with _wikidata_cache_lock:
+        if _wikidata_cache is None:
+            location = (
+                WIKIDATA_CACHE_DB
+                if WIKIDATA_CACHE_BACKEND == "sqlite"
+                else WIKIDATA_CACHE_DIR
+            )
+            backend = create_cache_backend(
+                WIKIDATA_CACHE_BACKEND,
+                location,
+                get_cache_codec(WIKIDATA_CACHE_DIR),
+                get_cache_policy("wikidata"),
+            )
+            _wikidata_cache = MemoryTierBackend(backend, memory_caches.get("wikidata"))
+        return _wikidata_cache
+
+
 def _get_label_from_entity(entity: Dict[str, Any]) -> Optional[str]:
     """Safely extracts the English label from a single Wikidata entity dictionary."""
     return entity.get("labels", {}).get("en", {}).get("value")
 
 
+def _project_claim(claim: Dict[str, Any]) -> Dict[str, Any]:
+    """Keeps the rank and main value of a statement, dropping qualifiers and references."""
+    main_snak = claim.get("mainsnak", {})
+    projected_snak = {"snaktype": main_snak.get("snaktype")}
+    if "datavalue" in main_snak:
+        projected_snak["datavalue"] = {"value": main_snak["datavalue"].get("value")}
+    return {"rank": claim.get("rank"), "mainsnak": projected_snak}
+
+
+def project_entity(
+    entity: Dict[str, Any],
+    props: str = WIKIDATA_ENTITY_PROPS,
+    claim_whitelist: Optional[List[str]] = WIKIDATA_CLAIM_WHITELIST,
+) -> Dict[str, Any]:
+    """
+    Trims a wbgetentities entity to the parts the pipeline reads.
+
+    The result keeps the API structure, so the parsing helpers work on both:
+    English label and alias values, and for each whitelisted claim only the
+    rank and main value of its statements.
+
+    Args:
+        entity: A raw (or already projected) entity from the API or the cache.
+        props: The "|"-separated entity parts to keep (labels, aliases, claims).
+        claim_whitelist: The claim properties to keep, or None to keep all.
+
+    Returns:
+        The compact entity.
+    """
+    projected: Dict[str, Any] = {"id": entity.get("id")}
+    # The revision lets an expired entry be renewed if the item is unchanged
+    for key in ("missing", "lastrevid"):
+        if key in entity:
+            projected[key] = entity[key]
+    requested = set(props.split("|"))
+
+    if "labels" in requested and "labels" in entity:
+        label = entity["labels"].get("en", {}).get("value")
+        projected["labels"] = {"en": {"value": label}} if label is not None else {}
+    if "aliases" in requested and "aliases" in entity:
+        aliases = entity["aliases"].get("en", [])
+        projected["aliases"] = (
+            {"en": [{"value": alias["value"]} for alias in aliases if "value" in alias]}
+            if aliases
+            else {}
+        )
+    if "claims" in requested and "claims" in entity:
+        projected["claims"] = {
+            property_id: [_project_claim(claim) for claim in claims]
+            for property_id, claims in entity["claims"].items()
+            if claim_whitelist is None or property_id in claim_whitelist
+        }
+    return projected
+
+
+def _get_entity_cache_key(qid: str, props: str) -> str:
+    """
+    Returns the cache key of an entity projected to `props`. Entities with the
+    default props are keyed by their bare QID.
+    """
+    if props == WIKIDATA_ENTITY_PROPS:
+        return qid
+    return f"entity_{props.replace('|', '_')}_{qid}"
+
+
+def _get_entity_lookup_keys(qids: List[str], props: str) -> List[str]:
+    """
+    Returns the cache keys to look up for entities projected to `props`. A
+    request for fewer props can also be served from entities cached with the
+    default props.
+    """
+    keys = [_get_entity_cache_key(qid, props) for qid in qids]
+    if props != WIKIDATA_ENTITY_PROPS:
+        keys.extend(qids)
+    return keys
+
+
+def _select_cached_entities(
+    qids: List[str], props: str, cached: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Picks and projects the cached entity of each QID from a cache lookup."""
+    results = {}
+    for qid in qids:
+        entity = cached.get(_get_entity_cache_key(qid, props)) or cached.get(qid)
+        if entity is not None:
+            results[qid] = project_entity(entity, props)
+    return results
+
+
+def _put_cached_entities(
+    cache: CacheBackend, entities: Dict[str, Any], props: str
+) -> None:
+    """Stores projected entities under their props-specific cache keys."""
+    cache.put_many(
+        {_get_entity_cache_key(qid, props): entity for qid, entity in entities.items()}
+    )
+
+
+def _get_qid_from_entity_cache_key(key: str) -> Optional[str]:
+    """Returns the QID of an entity cache key, or None for other entries (e.g., SPARQL)."""
+    if key.startswith("entity_"):
+        key = key.rsplit("_", 1)[-1]
+    if key[:1] == "Q" and key[1:].isdigit():
+        return key
+    return None
+
+
+def revalidate_wikidata_entities(entries: Dict[str, Any]) -> List[str]:
+    """
+    Checks expired entity cache entries against the latest revision of their
+    items, for `CacheBackend.compact`.
+
+    Entries without a `lastrevid` (cached before revisions were kept) and
+    SPARQL results are never confirmed, so they expire normally.
+
+    Args:
+        entries: Expired cache entries, keyed by cache key.
+
+    Returns:
+        The keys of the entries whose item has not been edited since.
+    """
+    expected: Dict[str, List[Tuple[str, int]]] = {}
+    for key, entity in entries.items():
+        qid = _get_qid_from_entity_cache_key(key)
+        if qid and isinstance(entity, dict) and entity.get("lastrevid"):
+            expected.setdefault(qid, []).append((key, entity["lastrevid"]))
+    if not expected:
+        return []
+
+    latest = fetch_latest_revisions(
+        settings.WIKIDATA_API_URL, WIKIDATA_HEADERS, titles=list(expected)
+    )
+    return [
+        key
+        for qid, key_revisions in expected.items()
+        for key, revision in key_revisions
+        if latest.get(qid) == revision
+    ]
+
+
 def fetch_sparql_query(
     context: AssetExecutionContext, query: str
 ) -> List[Dict[str, Any]]:
@@ -348,7 +815,7 @@ def fetch_sparql_query(
             params={"query": query, "format": "json"},
             headers=WIKIDATA_HEADERS,
         )
-        data = response.json()
+        data = json_loads(response.content)
         return data.get("results", {}).get("bindings", [])
     except requests.exceptions.RequestException as e:
         context.log.error(f"An unrecoverable error occurred during SPARQL query: {e}")
@@ -359,7 +826,7 @@ def fetch_sparql_query(
 
 
 def fetch_wikidata_entities_batch(
-    context: AssetExecutionContext, qids: List[str]
+    context: AssetExecutionContext, qids: List[str], props: str = WIKIDATA_ENTITY_PROPS
 ) -> Dict[str, Any]:
     """
     Fetches a batch of Wikidata entities from the API.
@@ -367,6 +834,7 @@ def fetch_wikidata_entities_batch(
     Args:
         context: Dagster asset execution context.
         qids: A list of Wikidata QIDs (e.g., ["Q123", "Q456"])
+        props: The "|"-separated entity parts to request (e.g., "labels").
 
     Returns:
         The JSON response from the API, typically containing an 'entities' dictionary.
@@ -379,7 +847,8 @@ def fetch_wikidata_entities_batch(
     params = {
         "action": "wbgetentities",
         "ids": id_string,
-        "props": "labels|aliases|claims",
+        # "info" adds the lastrevid used for revision-aware cache refresh
+        "props": f"{props}|info",
         "languages": "en",
         "format": "json",
     }
@@ -392,7 +861,7 @@ def fetch_wikidata_entities_batch(
             params=params,
             headers=settings.WIKIDATA_HEADERS,
         )
-        return response.json()
+        return json_loads(response.content)
     except requests.exceptions.RequestException as e:
         context.log.error(f"Unrecoverable error fetching entity batch: {e}")
         return {}
@@ -405,6 +874,7 @@ async def async_fetch_wikidata_entities_batch(
     context: AssetExecutionContext,
     qids: List[str],
     session: Optional[aiohttp.ClientSession] = None,
+    props: str = WIKIDATA_ENTITY_PROPS,
 ) -> Dict[str, Any]:
     """
     Fetches a batch of Wikidata entities from the API asynchronously.
@@ -417,7 +887,8 @@ async def async_fetch_wikidata_entities_batch(
     params = {
         "action": "wbgetentities",
         "ids": id_string,
-        "props": "labels|aliases|claims",
+        # "info" adds the lastrevid used for revision-aware cache refresh
+        "props": f"{props}|info",
         "languages": "en",
         "format": "json",
     }
@@ -432,51 +903,44 @@ async def async_fetch_wikidata_entities_batch(
             session=session,
         )
         if isinstance(response_data, str):
-            return json.loads(response_data)
+            return json_loads(response_data)
         return response_data
     except Exception as e:
         context.log.error(f"Unrecoverable error fetching entity batch async: {e}")
         return {}
 
 def fetch_wikidata_entities_batch_with_cache(
-    context: AssetExecutionContext, qids: List[str]
+    context: AssetExecutionContext, qids: List[str], props: str = WIKIDATA_ENTITY_PROPS
 ) -> Dict[str, Any]:
     """
-    Fetches a batch of Wikidata entities, utilizing a local file cache to avoid
-    redundant API calls.
-    """
-    results = {}
-    missing_qids = []
-
-    WIKIDATA_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    Fetches a batch of Wikidata entities, utilizing the Wikidata cache backend to
+    avoid redundant API calls. The whole batch is looked up in a single query.
 
-    for qid in qids:
-        cache_file_path = WIKIDATA_CACHE_DIR / f"{qid}.json"
-        if cache_file_path.exists():
-            try:
-                with open(cache_file_path, "r", encoding="utf-8") as f:
-                    results[qid] = json.load(f)
-            except (json.JSONDecodeError, IOError) as e:
-                context.log.warning(
-                    f"Could not read cache file for {qid}, refetching. Error: {e}"
-                )
-                missing_qids.append(qid)
-        else:
-            missing_qids.append(qid)
+    Entities are projected with `project_entity` before they are cached, so only
+    the requested props and the whitelisted claims are stored and returned.
+    """
+    cache = get_wikidata_cache()
+    try:
+        cached = cache.get_many(_get_entity_lookup_keys(qids, props))
+        results = _select_cached_entities(qids, props, cached)
+    except Exception as e:
+        context.log.warning(f"Could not read entity cache, refetching batch. Error: {e}")
+        results = {}
+    missing_qids = [qid for qid in qids if qid not in results]
 
     if missing_qids:
         context.log.info(f"Cache miss for {len(missing_qids)} QIDs. Fetching from API.")
-        api_results = fetch_wikidata_entities_batch(context, missing_qids)
-        fetched_entities = api_results.get("entities", {})
+        api_results = fetch_wikidata_entities_batch(context, missing_qids, props)
+        fetched_entities = {
+            qid: project_entity(entity, props)
+            for qid, entity in api_results.get("entities", {}).items()
+        }
 
-        for qid, entity_data in fetched_entities.items():
-            cache_file_path = WIKIDATA_CACHE_DIR / f"{qid}.json"
-            try:
-                with open(cache_file_path, "w", encoding="utf-8") as f:
-                    json.dump(entity_data, f, ensure_ascii=False)
-                results[qid] = entity_data
-            except IOError as e:
-                context.log.error(f"Could not write cache file for {qid}. Error: {e}")
+        try:
+            _put_cached_entities(cache, fetched_entities, props)
+        except Exception as e:
+            context.log.error(f"Could not write entity cache for batch. Error: {e}")
+        results.update(fetched_entities)
 
     return results
 
@@ -485,58 +949,110 @@ async def async_fetch_wikidata_entities_batch_with_cache(
     context: AssetExecutionContext,
     qids: List[str],
     session: Optional[aiohttp.ClientSession] = None,
+    props: str = WIKIDATA_ENTITY_PROPS,
+    batcher: Optional["WikidataEntityBatcher"] = None,
 ) -> Dict[str, Any]:
     """
-    Fetches a batch of Wikidata entities asynchronously, utilizing a local file cache
-    to avoid redundant API calls.
+    Fetches a batch of Wikidata entities asynchronously, utilizing the Wikidata
+    cache backend to avoid redundant API calls. The whole batch is looked up in
+    a single query, and entities are projected to `props` as in
+    `fetch_wikidata_entities_batch_with_cache`.
+
+    Cache misses go through a single-flight layer keyed by (props, QID): QIDs
+    already requested by a concurrent call are awaited from that call. The
+    remaining ones are sent in this call's request or, when a `batcher` is
+    given, queued in the batcher to share requests with other callers.
+
+    Raises:
+        ValueError: If the batcher fetches different props.
     """
-    results = {}
-    missing_qids = []
+    if batcher is not None and batcher.props != props:
+        raise ValueError(
+            f"Batcher fetches props '{batcher.props}', but '{props}' were requested."
+        )
 
-    # Ensure cache dir exists (sync operation is fine here as it's quick, or use to_thread)
-    await asyncio.to_thread(WIKIDATA_CACHE_DIR.mkdir, parents=True, exist_ok=True)
+    cache = get_wikidata_cache()
+    try:
+        cached = await async_get_many(cache, _get_entity_lookup_keys(qids, props))
+        results = _select_cached_entities(qids, props, cached)
+    except Exception as e:
+        context.log.warning(f"Could not read entity cache, refetching batch. Error: {e}")
+        results = {}
+    missing_qids = [qid for qid in qids if qid not in results]
 
-    # Read cache
-    for qid in qids:
-        cache_file_path = WIKIDATA_CACHE_DIR / f"{qid}.json"
-        
-        # Check existence (fast sync op)
-        exists = await asyncio.to_thread(cache_file_path.exists)
-        if exists:
-            try:
-                def read_json():
-                    with open(cache_file_path, "r", encoding="utf-8") as f:
-                        return json.load(f)
-                
-                results[qid] = await asyncio.to_thread(read_json)
-            except Exception as e:
-                context.log.warning(
-                    f"Could not read cache file for {qid}, refetching. Error: {e}"
-                )
-                missing_qids.append(qid)
+    if missing_qids:
+        if batcher is not None:
+            fetch_entities = batcher.get_many
         else:
-            missing_qids.append(qid)
+            fetch_entities = partial(
+                _async_fetch_and_cache_entities, context, session=session, props=props
+            )
 
-    if missing_qids:
-        context.log.info(f"Cache miss for {len(missing_qids)} QIDs. Fetching from API.")
-        api_results = await async_fetch_wikidata_entities_batch(context, missing_qids, session)
-        fetched_entities = api_results.get("entities", {})
+        async def fetch_missing(keys: List[Tuple[str, str]]) -> Dict[Tuple[str, str], Any]:
+            entities = await fetch_entities([qid for _, qid in keys])
+            return {(props, qid): entity for qid, entity in entities.items()}
 
-        for qid, entity_data in fetched_entities.items():
-            cache_file_path = WIKIDATA_CACHE_DIR / f"{qid}.json"
-            try:
-                def write_json(path, data):
-                    with open(path, "w", encoding="utf-8") as f:
-                        json.dump(data, f, ensure_ascii=False)
-                
-                await asyncio.to_thread(write_json, cache_file_path, entity_data)
-                results[qid] = entity_data
-            except Exception as e:
-                context.log.error(f"Could not write cache file for {qid}. Error: {e}")
+        fetched = await _entity_flights.do_many(
+            [(props, qid) for qid in missing_qids], fetch_missing
+        )
+        results.update({qid: entity for (_, qid), entity in fetched.items()})
 
     return results
 
 
+async def _async_fetch_and_cache_entities(
+    context: AssetExecutionContext,
+    qids: List[str],
+    session: Optional[aiohttp.ClientSession] = None,
+    props: str = WIKIDATA_ENTITY_PROPS,
+) -> Dict[str, Any]:
+    """
+    Fetches uncached entities from the API, projects and caches them.
+
+    Returns:
+        A dictionary mapping each fetched QID to its projected entity.
+    """
+    context.log.info(f"Cache miss for {len(qids)} QIDs. Fetching from API.")
+    api_results = await async_fetch_wikidata_entities_batch(context, qids, session, props)
+    fetched_entities = {
+        qid: project_entity(entity, props)
+        for qid, entity in api_results.get("entities", {}).items()
+    }
+
+    try:
+        await asyncio.to_thread(
+            _put_cached_entities, get_wikidata_cache(), fetched_entities, props
+        )
+    except Exception as e:
+        context.log.error(f"Could not write entity cache for batch. Error: {e}")
+    return fetched_entities
+
+
+class WikidataEntityBatcher(MicroBatcher):
+    """
+    Micro-batches uncached entity lookups from concurrent coroutines into
+    wbgetentities requests of up to WIKIDATA_API_MAX_IDS QIDs.
+
+    Pass it to `async_fetch_wikidata_entities_batch_with_cache` or
+    `async_resolve_qids_to_labels` so that small batches of cache misses (e.g.,
+    a few new country QIDs per artist batch) share the fullest possible
+    requests. Create one per asset run and props.
+    """
+    def __init__(
+        self,
+        context: AssetExecutionContext,
+        session: Optional[aiohttp.ClientSession] = None,
+        props: str = WIKIDATA_ENTITY_PROPS,
+        max_delay: float = WIKIDATA_MICROBATCH_DELAY,
+    ):
+        super().__init__(
+            partial(_async_fetch_and_cache_entities, context, session=session, props=props),
+            max_batch_size=WIKIDATA_API_MAX_IDS,
+            max_delay=max_delay,
+        )
+        self.props = props
+
+
 def fetch_wikidata_entity(
     context: AssetExecutionContext, wikidata_id: str
 ) -> Dict[str, Any] | None:
@@ -549,18 +1065,19 @@ def fetch_wikidata_entity(
         context.log.error(f"Malformed QID: {wikidata_id}")
         return None
 
-    cache_file_path = WIKIDATA_CACHE_DIR / f"{wikidata_id}.json"
+    cache = get_wikidata_cache()
+    # Special:EntityData responses wrap the entity, so keep them apart from
+    # the bare wbgetentities entries keyed by QID.
+    cache_key = f"entitydata_{wikidata_id}"
 
-    if cache_file_path.exists():
-        try:
-            with open(cache_file_path, "r", encoding="utf-8") as file:
-                line = file.readline()
-                if line:
-                    return json.loads(line)
-        except Exception as e:
-            context.log.error(
-                f"Cache read failed for {wikidata_id}, falling back to API: {e}"
-            )
+    try:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+    except Exception as e:
+        context.log.error(
+            f"Cache read failed for {wikidata_id}, falling back to API: {e}"
+        )
 
     try:
         entity_url = f"{WIKIDATA_ENTITY_URL}{wikidata_id}.json"
@@ -570,11 +1087,9 @@ def fetch_wikidata_entity(
             method="GET",
             headers={"User-Agent": USER_AGENT},
         )
-        data = response.json()
+        data = json_loads(response.content)
 
-        cache_file_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(cache_file_path, "w", encoding="utf-8") as file:
-            file.write(json.dumps(data, ensure_ascii=False) + "\n")
+        cache.put(cache_key, data)
         return data
 
     except requests.exceptions.RequestException as e:
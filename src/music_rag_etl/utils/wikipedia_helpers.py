@@ -7,22 +7,39 @@ import random
 import time
 import asyncio
 import aiohttp
-import json
 import urllib.parse
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
 import wikipediaapi
 from dagster import AssetExecutionContext
 
 from music_rag_etl.settings import WIKIPEDIA_CACHE_DIR, WIKIDATA_ENTITY_URL, WIKIPEDIA_HEADERS
+from music_rag_etl.utils.cache_helpers import (
+    FileCacheBackend,
+    get_cache_codec,
+    get_cache_policy,
+    is_cache_file_expired,
+    memory_caches,
+)
+from music_rag_etl.utils.concurrency_helpers import SingleFlight
 from music_rag_etl.utils.transformation_helpers import map_genre_ids_to_labels
-from music_rag_etl.utils.request_utils import async_make_request_with_retries
+from music_rag_etl.utils.io_helpers import json_loads
+from music_rag_etl.utils.request_utils import (
+    async_make_request_with_retries,
+    fetch_latest_revisions,
+)
 
 # Configure logging for this module
 logger = logging.getLogger(__name__)
 
 WIKIPEDIA_API_URL = "https://en.wikipedia.org/w/api.php"
 
+# Concurrent cache misses for the same article share one request
+_wikipedia_flights = SingleFlight()
+# Page ID and latest revision of each cached article, stored next to its text
+# as `{wikidata_id}.rev.json` to revalidate the article once it expires
+wikipedia_revisions = FileCacheBackend(WIKIPEDIA_CACHE_DIR, suffix=".rev.json")
+
 
 def get_wikipedia_page(
     context: AssetExecutionContext,
@@ -37,11 +54,21 @@ def get_wikipedia_page(
         return None
 
     cache_file_path = WIKIPEDIA_CACHE_DIR / f"{wikidata_id}.txt"
+    codec = get_cache_codec(WIKIPEDIA_CACHE_DIR)
+    memory_cache = memory_caches.get("wikipedia")
+
+    cached_text = memory_cache.get(wikidata_id)
+    if cached_text is not None:
+        return cached_text
 
     if cache_file_path.exists():
         try:
-            with open(cache_file_path, "r", encoding="utf-8") as file:
-                cached_text = file.read()
+            with open(cache_file_path, "rb") as file:
+                cached_text = codec.decode(file.read()).decode("utf-8")
+            if not is_cache_file_expired(
+                cache_file_path, cached_text, get_cache_policy("wikipedia")
+            ):
+                memory_cache.put(wikidata_id, cached_text)
                 return cached_text
         except Exception as exc:  # noqa: BLE001
             context.log.error(
@@ -59,8 +86,9 @@ def get_wikipedia_page(
         if page.exists():
             WIKIPEDIA_CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
-            with open(cache_file_path, "w", encoding="utf-8") as file:
-                file.write(page.text)
+            with open(cache_file_path, "wb") as file:
+                file.write(codec.encode(page.text.encode("utf-8")))
+            memory_cache.put(wikidata_id, page.text)
             time.sleep(random.uniform(0.1, 0.5))
             return page.text
 
@@ -82,6 +110,13 @@ async def async_get_wikipedia_page(
         return None
 
     cache_file_path = WIKIPEDIA_CACHE_DIR / f"{wikidata_id}.txt"
+    codec = get_cache_codec(WIKIPEDIA_CACHE_DIR)
+    memory_cache = memory_caches.get("wikipedia")
+
+    # Hot articles are served from memory without touching the disk
+    cached_text = memory_cache.get(wikidata_id)
+    if cached_text is not None:
+        return cached_text
 
     # Async check for existence
     exists = await asyncio.to_thread(cache_file_path.exists)
@@ -89,9 +124,18 @@ async def async_get_wikipedia_page(
     if exists:
         try:
             def read_file():
-                with open(cache_file_path, "r", encoding="utf-8") as file:
-                    return file.read()
-            return await asyncio.to_thread(read_file)
+                with open(cache_file_path, "rb") as file:
+                    return codec.decode(file.read()).decode("utf-8")
+            cached_text = await asyncio.to_thread(read_file)
+            expired = await asyncio.to_thread(
+                is_cache_file_expired,
+                cache_file_path,
+                cached_text,
+                get_cache_policy("wikipedia"),
+            )
+            if not expired:
+                memory_cache.put(wikidata_id, cached_text)
+                return cached_text
         except Exception as exc:
             context.log.error(
                 "Failed to read cache for %s, falling back to API: %s",
@@ -99,14 +143,34 @@ async def async_get_wikipedia_page(
                 exc,
             )
 
+    return await _wikipedia_flights.do(
+        wikidata_id,
+        lambda: _async_request_wikipedia_page(context, url, wikidata_id, session),
+    )
+
+
+async def _async_request_wikipedia_page(
+    context: AssetExecutionContext,
+    url: str,
+    wikidata_id: str,
+    session: Optional[aiohttp.ClientSession] = None,
+) -> str | None:
+    """
+    Requests the plain-text extract of a Wikipedia page and caches it, along
+    with its page ID and latest revision.
+    """
+    cache_file_path = WIKIPEDIA_CACHE_DIR / f"{wikidata_id}.txt"
+    codec = get_cache_codec(WIKIPEDIA_CACHE_DIR)
+
     try:
         raw_title = url.split("/wiki/")[-1]
         decoded_title = urllib.parse.unquote(raw_title)
 
         # https://en.wikipedia.org/w/api.php?action=query&prop=extracts&explaintext&titles={Title}&format=json
+        # "info" adds the page ID and latest revision, kept to revalidate the cache
         params = {
             "action": "query",
-            "prop": "extracts",
+            "prop": "extracts|info",
             "explaintext": 1,
             "titles": decoded_title,
             "format": "json",
@@ -123,7 +187,7 @@ async def async_get_wikipedia_page(
         )
 
         if isinstance(response_data, str):
-            data = json.loads(response_data)
+            data = json_loads(response_data)
         else:
             data = response_data
 
@@ -145,10 +209,17 @@ async def async_get_wikipedia_page(
             await asyncio.to_thread(WIKIPEDIA_CACHE_DIR.mkdir, parents=True, exist_ok=True)
             
             def write_file():
-                with open(cache_file_path, "w", encoding="utf-8") as file:
-                    file.write(page_text)
+                with open(cache_file_path, "wb") as file:
+                    file.write(codec.encode(page_text.encode("utf-8")))
             
             await asyncio.to_thread(write_file)
+            if "lastrevid" in page_data:
+                await asyncio.to_thread(
+                    wikipedia_revisions.put,
+                    wikidata_id,
+                    {"pageid": page_data.get("pageid"), "lastrevid": page_data["lastrevid"]},
+                )
+            memory_caches.get("wikipedia").put(wikidata_id, page_text)
             return page_text
 
     except Exception as exc:
@@ -156,6 +227,39 @@ async def async_get_wikipedia_page(
     return None
 
 
+def revalidate_wikipedia_articles(articles: Dict[str, Any]) -> List[str]:
+    """
+    Checks expired cached articles against the latest revision of their pages,
+    for `CacheBackend.compact`.
+
+    Articles cached without a revision (e.g., by the synchronous path) are
+    never confirmed, so they expire normally.
+
+    Args:
+        articles: Expired cached articles, keyed by Wikidata ID.
+
+    Returns:
+        The Wikidata IDs of the articles whose page has not been edited since.
+    """
+    revisions = wikipedia_revisions.get_many(articles)
+    pageids = {
+        wikidata_id: revision["pageid"]
+        for wikidata_id, revision in revisions.items()
+        if revision.get("pageid")
+    }
+    if not pageids:
+        return []
+
+    latest = fetch_latest_revisions(
+        WIKIPEDIA_API_URL, WIKIPEDIA_HEADERS, pageids=list(pageids.values())
+    )
+    return [
+        wikidata_id
+        for wikidata_id, pageid in pageids.items()
+        if latest.get(pageid) == revisions[wikidata_id]["lastrevid"]
+    ]
+
+
 def fetch_artist_article_payload(
     context: AssetExecutionContext,
     wiki_api: wikipediaapi.Wikipedia,
@@ -2,7 +2,7 @@ import json
 from unittest.mock import MagicMock, patch
 import pytest
 from dagster import build_asset_context, ResourceDefinition
-from music_rag_etl.assets.loading.load_graph_db import load_graph_db
+from music_rag_etl.assets.loading.load_graph_db import build_edge_lists, load_graph_db
 from music_rag_etl.utils.memgraph_helpers import MemgraphConfig
 
 @pytest.fixture
@@ -106,3 +106,209 @@ def test_load_graph_db_with_invalid_data(mock_memgraph, mock_data_dir):
         
         # Valid album should be loaded, invalid one skipped
         assert result.metadata["nodes_loaded"]["albums"] == 1
+
+def test_load_graph_db_batches_nodes(mock_memgraph, mock_data_dir):
+    config = MemgraphConfig(host="localhost", port=7687, batch_size=1, workers=1)
+
+    with patch("music_rag_etl.assets.loading.load_graph_db.LOCAL_DATA_DIR", mock_data_dir), \
+         patch("music_rag_etl.assets.loading.load_graph_db.clear_database"):
+
+        context = build_asset_context()
+        result = load_graph_db(context, config)
+
+        # One UNWIND query per batch of rows
+        unwind_calls = [
+            call for call in mock_memgraph.execute.call_args_list
+            if call.args[0].startswith("UNWIND $rows AS row CREATE (n:Artist)")
+        ]
+        assert [call.args[1]["rows"][0]["id"] for call in unwind_calls] == ["A1", "A2"]
+        assert result.metadata["node_ingestion"]["Artist"]["rows"] == 2
+        assert result.metadata["batch_size"] == 1
+
+
+def test_build_edge_lists(mock_data_dir):
+    # Similar artists are resolved by name first, then by alias
+    artists = [
+        {"id": "A1", "name": "Artist 1", "genres": ["G1", "G2"], "similar_artists": ["Artist 2", "Artist 1"]},
+        {"id": "A2", "name": "Artist 2", "aliases": ["A-Two"], "similar_artists": ["A-Two", "Unknown", "Artist 3"]},
+        {"id": "A3", "name": "Artist 3", "aliases": ["Artist 2"], "genres": []},
+    ]
+    with open(mock_data_dir / "artists.jsonl", "w") as f:
+        for item in artists:
+            f.write(json.dumps(item) + "\n")
+
+    edges = {
+        rel_type: list(frame.iter_rows())
+        for rel_type, frame in build_edge_lists(mock_data_dir).items()
+    }
+
+    assert edges["HAS_GENRE"] == [("A1", "G1"), ("A1", "G2")]
+    # Self-references (A2 -> "A-Two") and unknown names are dropped
+    assert edges["SIMILAR_TO"] == [("A1", "A2"), ("A2", "A3")]
+    assert edges["PERFORMED_BY"] == [("AL1", "A1"), ("AL2", "A2")]
+    assert edges["CONTAINS_TRACK"] == [("AL1", "T1"), ("AL2", "T2")]
+
+
+def test_build_edge_lists_empty_datasets(mock_data_dir):
+    # An empty albums file and a missing tracks file yield no edges
+    (mock_data_dir / "albums.jsonl").write_text("")
+    (mock_data_dir / "tracks.jsonl").unlink()
+
+    edges = build_edge_lists(mock_data_dir)
+
+    assert edges["PERFORMED_BY"].height == 0
+    assert edges["PERFORMED_BY"].columns == ["source", "target"]
+    assert edges["CONTAINS_TRACK"].height == 0
+    assert list(edges["HAS_GENRE"].iter_rows()) == [("A1", "G1")]
+
+
+def test_load_graph_db_client_side_edges(mock_memgraph, mock_data_dir):
+    config = MemgraphConfig(host="localhost", port=7687, workers=1)
+
+    with patch("music_rag_etl.assets.loading.load_graph_db.LOCAL_DATA_DIR", mock_data_dir), \
+         patch("music_rag_etl.assets.loading.load_graph_db.clear_database"):
+
+        context = build_asset_context()
+        result = load_graph_db(context, config)
+
+        queries = [call.args[0] for call in mock_memgraph.execute.call_args_list]
+        # Reference properties are neither stored nor removed
+        artist_call = next(
+            call for call in mock_memgraph.execute.call_args_list
+            if call.args[0].startswith("UNWIND $rows AS row CREATE (n:Artist)")
+        )
+        assert "genres" not in artist_call.args[1]["rows"][0]
+        assert not any("REMOVE" in query for query in queries)
+
+        edge_call = next(
+            call for call in mock_memgraph.execute.call_args_list
+            if "[:PERFORMED_BY]" in call.args[0]
+        )
+        assert edge_call.args[1]["edges"] == [
+            {"source": "AL1", "target": "A1"},
+            {"source": "AL2", "target": "A2"},
+        ]
+        assert result.metadata["edge_ingestion"]["SIMILAR_TO"]["rows"] == 1
+
+
+def test_load_graph_db_incremental(mock_memgraph, mock_data_dir):
+    config = MemgraphConfig(host="localhost", port=7687, workers=1)
+    with patch("music_rag_etl.assets.loading.load_graph_db.LOCAL_DATA_DIR", mock_data_dir), \
+         patch("music_rag_etl.assets.loading.load_graph_db.clear_database"):
+        load_graph_db(build_asset_context(), config)
+
+    # The graph holds the previous load: G2 changed upstream, G_OLD was removed,
+    # and (A2)-[:HAS_GENRE]->(G1) no longer exists in the datasets
+    stored = {}
+    for call in mock_memgraph.execute.call_args_list:
+        if call.args[0].startswith("UNWIND $rows AS row CREATE"):
+            label = call.args[0].split("(n:")[1].split(")")[0]
+            stored[label] = [{"id": row["id"], "hash": row["content_hash"]} for row in call.args[1]["rows"]]
+    stored["Genre"][1]["hash"] = "stale"
+    stored["Genre"].append({"id": "G_OLD", "hash": "stale"})
+
+    def execute_and_fetch(query):
+        if query.startswith("SHOW"):
+            return []
+        if "[:HAS_GENRE]" in query:
+            return [{"source": "A1", "target": "G1"}, {"source": "A2", "target": "G1"}]
+        if "]->" in query:
+            return []
+        return stored[query.split("(n:")[1].split(")")[0]]
+
+    mock_memgraph.reset_mock()
+    mock_memgraph.execute_and_fetch.side_effect = execute_and_fetch
+    config = MemgraphConfig(host="localhost", port=7687, incremental=True, workers=1)
+    with patch("music_rag_etl.assets.loading.load_graph_db.LOCAL_DATA_DIR", mock_data_dir), \
+         patch("music_rag_etl.assets.loading.load_graph_db.clear_database") as mock_clear:
+        result = load_graph_db(build_asset_context(), config)
+
+    mock_clear.assert_not_called()
+    changes = result.metadata["changes"]
+    assert changes["nodes"]["Genre"] == {"inserted": 0, "updated": 1, "unchanged": 1, "deleted": 1}
+    assert changes["nodes"]["Track"] == {"inserted": 0, "updated": 0, "unchanged": 2, "deleted": 0}
+    assert changes["edges"]["HAS_GENRE"] == {"inserted": 0, "deleted": 1, "unchanged": 1}
+    assert changes["edges"]["PERFORMED_BY"]["inserted"] == 2
+
+    calls = {call.args[0]: call.args[1] for call in mock_memgraph.execute.call_args_list if len(call.args) > 1}
+    assert calls["UNWIND $rows AS row MATCH (n:Genre {id: row.id}) SET n = row;"]["rows"][0]["id"] == "G2"
+    assert calls["UNWIND $ids AS id MATCH (n:Genre {id: id}) DETACH DELETE n;"] == {"ids": ["G_OLD"]}
+    assert not any(query.startswith("UNWIND $rows AS row CREATE") for query in calls)
+    # A served database is updated transactionally
+    assert not any(
+        call.args[0].startswith("STORAGE MODE") for call in mock_memgraph.execute.call_args_list
+    )
+
+
+def test_load_graph_db_incremental_requires_client_edges():
+    config = MemgraphConfig(host="localhost", port=7687, edge_mode="server", incremental=True)
+    with pytest.raises(ValueError, match="client"):
+        load_graph_db(build_asset_context(), config)
+
+
+def test_load_graph_db_phases(mock_memgraph, mock_data_dir):
+    # The Artist id index already exists
+    mock_memgraph.execute_and_fetch.side_effect = lambda query: (
+        [{"index type": "label+property", "label": "Artist", "property": "id"}]
+        if query == "SHOW INDEX INFO;" else []
+    )
+    with open(mock_data_dir / "genres.jsonl", "a") as f:
+        f.write(json.dumps({"id": "G1", "genre_label": "Rock again"}) + "\n")
+    config = MemgraphConfig(host="localhost", port=7687)
+
+    with patch("music_rag_etl.assets.loading.load_graph_db.LOCAL_DATA_DIR", mock_data_dir), \
+         patch("music_rag_etl.assets.loading.load_graph_db.clear_database"):
+
+        result = load_graph_db(build_asset_context(), config)
+
+    queries = [call.args[0] for call in mock_memgraph.execute.call_args_list]
+    # Indexes and constraints come first, and the data is written in analytical mode
+    assert queries.index("CREATE CONSTRAINT ON (n:Genre) ASSERT n.id IS UNIQUE;") \
+        < queries.index("STORAGE MODE IN_MEMORY_ANALYTICAL;") \
+        < next(i for i, query in enumerate(queries) if query.startswith("UNWIND"))
+    assert queries[-1] == "STORAGE MODE IN_MEMORY_TRANSACTIONAL;"
+    assert "CREATE INDEX ON :Artist(id);" not in queries
+    assert "CREATE INDEX ON :Genre(id);" in queries
+
+    assert result.metadata["skipped_records"]["Genre"] == {"invalid": 0, "duplicate": 1}
+    assert set(result.metadata["phases"]) == {
+        "clear", "schema", "nodes", "relationships", "storage_mode"
+    }
+
+
+def test_load_graph_db_parallel(mock_memgraph, mock_data_dir):
+    config = MemgraphConfig(host="localhost", port=7687, batch_size=1, workers=3)
+
+    with patch("music_rag_etl.assets.loading.load_graph_db.LOCAL_DATA_DIR", mock_data_dir), \
+         patch("music_rag_etl.assets.loading.load_graph_db.clear_database"):
+
+        result = load_graph_db(build_asset_context(), config)
+
+    track_ids = sorted(
+        call.args[1]["rows"][0]["id"] for call in mock_memgraph.execute.call_args_list
+        if call.args[0].startswith("UNWIND $rows AS row CREATE (n:Track)")
+    )
+    assert track_ids == ["T1", "T2"]
+    assert result.metadata["nodes_loaded"]["tracks"] == 2
+    assert result.metadata["workers"] == 3
+    assert mock_memgraph.execute.call_args_list[-1].args[0] == "STORAGE MODE IN_MEMORY_TRANSACTIONAL;"
+
+
+def test_load_graph_db_keeps_load_error_when_switch_back_fails(mock_memgraph, mock_data_dir):
+    def execute(query, parameters=None):
+        if query.startswith("UNWIND $rows AS row CREATE (n:Album)"):
+            raise RuntimeError("load failed")
+        if query == "STORAGE MODE IN_MEMORY_TRANSACTIONAL;":
+            raise RuntimeError("switch failed")
+
+    mock_memgraph.execute.side_effect = execute
+    config = MemgraphConfig(host="localhost", port=7687, workers=1)
+    context = build_asset_context()
+
+    with patch("music_rag_etl.assets.loading.load_graph_db.LOCAL_DATA_DIR", mock_data_dir), \
+         patch("music_rag_etl.assets.loading.load_graph_db.clear_database"), \
+         patch.object(context.log, "error") as mock_error:
+        with pytest.raises(RuntimeError, match="load failed"):
+            load_graph_db(context, config)
+
+    assert "switch failed" in mock_error.call_args.args[0]
@@ -0,0 +1,295 @@
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from music_rag_etl.utils.cache_helpers import (
+    ZSTD_MAGIC,
+    CacheCodec,
+    CachePolicy,
+    FileCacheBackend,
+    MemoryCache,
+    MemoryTierBackend,
+    SQLiteCacheBackend,
+    async_get_many,
+    create_cache_backend,
+    migrate_file_cache,
+    train_cache_dictionary,
+)
+
+
+@pytest.fixture
+def sqlite_cache(tmp_path: Path):
+    """Fixture for a SQLite cache backend in a temporary directory."""
+    cache = SQLiteCacheBackend(tmp_path / "cache.sqlite3")
+    yield cache
+    cache.close()
+
+
+def test_sqlite_put_many_get_many(sqlite_cache):
+    """Tests that a bulk write can be read back in a single bulk lookup."""
+    entries = {
+        "Q1": {"id": "Q1", "labels": {"en": {"value": "Álvaro"}}},
+        "Q2": {"id": "Q2", "claims": {}},
+    }
+
+    sqlite_cache.put_many(entries)
+    results = sqlite_cache.get_many(["Q1", "Q2", "Q3"])
+
+    assert results == entries
+    assert sqlite_cache.get("Q3") is None
+
+
+def test_sqlite_put_overwrites_and_delete(sqlite_cache):
+    """Tests that writes replace existing values and deletes remove them."""
+    sqlite_cache.put("Q1", {"v": 1})
+    sqlite_cache.put("Q1", {"v": 2})
+    assert sqlite_cache.get("Q1") == {"v": 2}
+
+    sqlite_cache.delete_many(["Q1"])
+    assert sqlite_cache.get("Q1") is None
+    assert list(sqlite_cache.iter_keys()) == []
+
+
+def test_sqlite_get_many_large_batch(sqlite_cache):
+    """Tests lookups larger than the SQLite bound-parameter limit."""
+    entries = {f"Q{i}": {"i": i} for i in range(2500)}
+    sqlite_cache.put_many(entries)
+
+    assert sqlite_cache.get_many(list(entries)) == entries
+
+
+def test_file_backend_roundtrip(tmp_path: Path):
+    """Tests the legacy one-file-per-key layout."""
+    cache = FileCacheBackend(tmp_path / "wikidata")
+    cache.put_many({"Q1": {"id": "Q1"}})
+
+    assert (tmp_path / "wikidata" / "Q1.json").exists()
+    assert cache.get_many(["Q1", "Q2"]) == {"Q1": {"id": "Q1"}}
+    assert list(cache.iter_keys()) == ["Q1"]
+
+
+def test_create_cache_backend_unknown():
+    """Tests that an unknown backend name raises a ValueError."""
+    with pytest.raises(ValueError, match="Unknown cache backend"):
+        create_cache_backend("redis", Path("/tmp"))
+
+
+def test_migrate_file_cache(tmp_path: Path, sqlite_cache):
+    """Tests importing a legacy cache directory, skipping unreadable files."""
+    source_dir = tmp_path / "wikidata"
+    source_dir.mkdir()
+    (source_dir / "Q1.json").write_text(json.dumps({"id": "Q1"}), encoding="utf-8")
+    (source_dir / "sparql_albums_Q1.json").write_text(
+        json.dumps({"results": {"bindings": []}}), encoding="utf-8"
+    )
+    (source_dir / "Q2.json").write_text("{not json", encoding="utf-8")
+
+    imported = migrate_file_cache(source_dir, sqlite_cache, delete_source=True)
+
+    assert imported == 2
+    assert sqlite_cache.get("Q1") == {"id": "Q1"}
+    assert sqlite_cache.get("sparql_albums_Q1") == {"results": {"bindings": []}}
+    # Imported files are removed, unreadable ones are left for inspection
+    assert not (source_dir / "Q1.json").exists()
+    assert (source_dir / "Q2.json").exists()
+
+
+def make_entity(i: int) -> dict:
+    """Builds a small entity record with the structure shared by all entities."""
+    return {
+        "id": f"Q{i}",
+        "labels": {"en": {"language": "en", "value": f"Artist {i}"}},
+        "claims": {"P31": [{"mainsnak": {"datavalue": {"value": {"id": "Q5"}}}}]},
+    }
+
+
+def test_codec_reads_uncompressed_entries():
+    """Tests that a zstd codec compresses new entries and reads legacy ones."""
+    pytest.importorskip("zstandard")
+    codec = CacheCodec("zstd")
+    value = {"text": "Álvaro " * 100}
+
+    encoded = codec.dumps(value)
+    assert encoded.startswith(ZSTD_MAGIC)
+    assert len(encoded) < len(json.dumps(value))
+    assert codec.loads(encoded) == value
+    # Entries written before compression was enabled (bytes or TEXT)
+    assert codec.loads(json.dumps(value).encode("utf-8")) == value
+    assert codec.loads(json.dumps(value)) == value
+    # A codec without compression still reads compressed entries
+    assert CacheCodec().loads(encoded) == value
+
+
+def test_codec_with_trained_dictionary(tmp_path: Path):
+    """Tests compression with a trained dictionary and reading it back from SQLite."""
+    pytest.importorskip("zstandard")
+    samples = [json.dumps(make_entity(i)).encode("utf-8") for i in range(1000)]
+    dictionary = train_cache_dictionary(samples, dict_size=4096)
+    codec = CacheCodec("zstd", dictionary=dictionary)
+
+    plain_size = len(CacheCodec("zstd").dumps(make_entity(5000)))
+    assert len(codec.dumps(make_entity(5000))) < plain_size
+
+    cache = SQLiteCacheBackend(tmp_path / "cache.sqlite3", codec)
+    cache.put("Q1", make_entity(1))
+    assert cache.get("Q1") == make_entity(1)
+    cache.close()
+
+    # Without the dictionary the entry cannot be decoded and counts as a miss
+    cache = SQLiteCacheBackend(tmp_path / "cache.sqlite3", CacheCodec("zstd"))
+    assert cache.get("Q1") is None
+    cache.close()
+
+
+def test_cache_codec_unknown_compression():
+    """Tests that an unknown compression name raises a ValueError."""
+    with pytest.raises(ValueError, match="Unknown cache compression"):
+        CacheCodec("lz4")
+
+
+def test_memory_cache_evicts_least_recently_used():
+    """Tests that the byte budget is enforced by evicting the oldest unused entries."""
+    cache = MemoryCache(max_bytes=25)
+    cache.put_many({"a": "x" * 10, "b": "y" * 10})
+    assert cache.get("a") == "x" * 10  # "a" is now the most recently used
+
+    cache.put("c", "z" * 10)
+
+    assert cache.get("b") is None
+    assert cache.get_many(["a", "c"]) == {"a": "x" * 10, "c": "z" * 10}
+    assert cache.stats() == {
+        "hits": 3, "misses": 1, "hit_rate": 0.75, "evictions": 1, "entries": 2, "bytes": 20,
+    }
+    # Values larger than the whole budget are not kept
+    cache.put("big", "w" * 30)
+    assert cache.get("big") is None
+
+
+@pytest.mark.asyncio
+async def test_memory_tier_backend(sqlite_cache):
+    """Tests that reads fill the memory tier and writes go through to disk."""
+    memory = MemoryCache(max_bytes=1024)
+    cache = MemoryTierBackend(sqlite_cache, memory)
+    sqlite_cache.put("Q1", {"id": "Q1"})
+    cache.put("Q2", {"id": "Q2"})
+
+    assert sqlite_cache.get("Q2") == {"id": "Q2"}
+    assert cache.peek_many(["Q1", "Q2"]) == {"Q2": {"id": "Q2"}}
+
+    # Q1 is read from disk once, then served from memory
+    assert await async_get_many(cache, ["Q1", "Q2", "Q3"]) == {
+        "Q1": {"id": "Q1"}, "Q2": {"id": "Q2"},
+    }
+    sqlite_cache.delete_many(["Q1"])
+    assert cache.get("Q1") == {"id": "Q1"}
+
+    cache.delete_many(["Q1"])
+    assert cache.get("Q1") is None
+
+
+def test_sqlite_policy_expires_negative_entries_first(tmp_path: Path, monkeypatch):
+    """Tests that negative entries expire on their own TTL and are compacted away."""
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now)
+    cache = SQLiteCacheBackend(
+        tmp_path / "cache.sqlite3", policy=CachePolicy(positive_ttl=100, negative_ttl=10)
+    )
+    cache.put_many({
+        "Q1": {"id": "Q1"},
+        "Q2": {"id": "Q2", "missing": ""},
+        "artist": {"error": 6, "message": "The artist you supplied could not be found"},
+    })
+
+    monkeypatch.setattr(time, "time", lambda: now + 50)
+    assert cache.get_many(["Q1", "Q2", "artist"]) == {"Q1": {"id": "Q1"}}
+    assert list(cache.get_many(["Q2"], include_expired=True)) == ["Q2"]
+
+    stats = cache.compact()
+    assert (stats["expired"], stats["entries"]) == (2, 1)
+    assert list(cache.iter_keys()) == ["Q1"]
+    cache.close()
+
+
+def test_sqlite_upgrades_legacy_schema(tmp_path: Path):
+    """Tests that a database without bookkeeping columns is upgraded in place."""
+    db_path = tmp_path / "cache.sqlite3"
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE cache (key TEXT PRIMARY KEY, value TEXT NOT NULL);")
+    conn.execute("INSERT INTO cache VALUES ('Q1', '{\"id\": \"Q1\"}');")
+    conn.commit()
+    conn.close()
+
+    cache = SQLiteCacheBackend(db_path, policy=CachePolicy(positive_ttl=100))
+    assert cache.get("Q1") == {"id": "Q1"}
+    (info,) = cache.iter_entry_info()
+    assert info.written_at is not None and info.size == len('{"id": "Q1"}')
+    cache.close()
+
+
+def test_sqlite_upgrade_rechecks_columns_under_write_lock(tmp_path: Path):
+    """Tests that a legacy database upgraded by another process meanwhile is
+    not altered twice."""
+    db_path = tmp_path / "cache.sqlite3"
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE cache (key TEXT PRIMARY KEY, value TEXT NOT NULL);")
+    conn.commit()
+    conn.close()
+
+    other = SQLiteCacheBackend(db_path)
+    other.put_many({"Q1": {"id": "Q1"}})
+
+    # The columns were seen as missing just before the other process upgraded
+    real_get_missing_columns = SQLiteCacheBackend._get_missing_columns
+    calls = iter([list(SQLiteCacheBackend.METADATA_COLUMNS)])
+
+    def get_missing_columns(backend):
+        return next(calls, None) or real_get_missing_columns(backend)
+
+    with patch.object(SQLiteCacheBackend, "_get_missing_columns", get_missing_columns):
+        cache = SQLiteCacheBackend(db_path)
+    assert cache.get("Q1") == {"id": "Q1"}
+    cache.close()
+    other.close()
+
+
+def test_cache_policy_negative_entries():
+    """Tests which entries count as failed lookups."""
+    assert CachePolicy.is_negative({"results": {"bindings": []}})
+    assert CachePolicy.is_negative({"error": 6, "message": "Not found"})
+    assert CachePolicy.is_negative([])
+    assert not CachePolicy.is_negative({"results": {"bindings": [{"item": {}}]}})
+    assert not CachePolicy.is_negative({"id": "Q1"})
+
+
+def test_compact_revalidates_and_evicts_least_recently_used(tmp_path: Path):
+    """Tests that unchanged expired entries are renewed and the LRU entries evicted."""
+    cache = FileCacheBackend(
+        tmp_path, suffix=".txt", policy=CachePolicy(positive_ttl=100), text=True
+    )
+    cache.put_many({"Q1": "a" * 10, "Q2": "b" * 10, "Q3": "c" * 10, "Q4": "d" * 10})
+    now = time.time()
+    # (access time, write time): Q1 and Q4 have expired, Q2 was used least recently
+    os.utime(tmp_path / "Q1.txt", (now - 200, now - 200))
+    os.utime(tmp_path / "Q2.txt", (now - 50, now - 60))
+    os.utime(tmp_path / "Q3.txt", (now - 10, now - 60))
+    os.utime(tmp_path / "Q4.txt", (now - 200, now - 200))
+
+    revalidated = []
+
+    def revalidate(entries):
+        revalidated.extend(entries)
+        return ["Q1"]  # Q4 has changed upstream
+
+    stats = cache.compact(max_bytes=20, revalidate=revalidate)
+
+    assert sorted(revalidated) == ["Q1", "Q4"]
+    assert stats == {
+        "expired": 1, "renewed": 1, "evicted": 1, "entries": 2, "bytes": 20,
+    }
+    assert sorted(cache.iter_keys()) == ["Q1", "Q3"]
+    assert cache.get("Q1") == "a" * 10
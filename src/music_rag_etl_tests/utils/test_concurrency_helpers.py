@@ -1,5 +1,18 @@
+import asyncio
+import time
+
 import pytest
-from music_rag_etl.utils.concurrency_helpers import process_items_concurrently
+from music_rag_etl.utils.concurrency_helpers import (
+    AdaptiveBatchSize,
+    AdaptiveConcurrencyLimiter,
+    CircuitBreaker,
+    MicroBatcher,
+    RateLimiterRegistry,
+    SingleFlight,
+    TokenBucketRateLimiter,
+    process_items_concurrently,
+    process_items_streaming_async,
+)
 
 
 # --- Tests for process_items_concurrently ---
@@ -40,3 +53,334 @@ def test_process_items_concurrently_with_exceptions(capsys):
     assert sorted(results) == expected_results
     assert "Error processing item" in captured.err
     assert "Negative numbers not allowed" in captured.err
+
+
+# --- Tests for AdaptiveBatchSize ---
+
+
+def test_adaptive_batch_size_halves_and_recovers():
+    """Tests multiplicative decrease on failure and additive recovery."""
+    batch_size = AdaptiveBatchSize(initial=50, minimum=5, increase=10)
+
+    assert batch_size.on_failure() == 25
+    assert batch_size.on_failure() == 12
+    assert batch_size.on_failure() == 6
+    assert batch_size.on_failure() == 5  # Never below the minimum
+
+    assert batch_size.on_success() == 15
+    for _ in range(10):
+        batch_size.on_success()
+    assert batch_size.current == 50  # Never above the initial size
+
+
+# --- Tests for TokenBucketRateLimiter ---
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_allows_burst_then_throttles():
+    """Tests that a full bucket bursts immediately and then refills at the rate."""
+    limiter = TokenBucketRateLimiter(rate=20, capacity=5)
+
+    start = time.monotonic()
+    for _ in range(5):
+        await limiter.acquire()
+    assert time.monotonic() - start < 0.05
+
+    # Two more tokens need 2 / 20 = 0.1 seconds of refill
+    await limiter.acquire()
+    await limiter.acquire()
+    assert time.monotonic() - start >= 0.09
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_wakes_waiters_in_fifo_order():
+    """Tests that queued waiters are served in arrival order."""
+    limiter = TokenBucketRateLimiter(rate=50, capacity=1)
+    await limiter.acquire()  # Empty the bucket
+    order = []
+
+    async def waiter(index):
+        await limiter.acquire()
+        order.append(index)
+
+    await asyncio.gather(*(waiter(i) for i in range(5)))
+    assert order == [0, 1, 2, 3, 4]
+
+
+def test_rate_limiter_registry_shares_limiter_per_host():
+    """Tests that URLs on the same host share one limiter and unknown hosts have none."""
+    registry = RateLimiterRegistry({"query.wikidata.org": (5, 5)})
+
+    limiter = registry.for_url("https://query.wikidata.org/sparql")
+    assert isinstance(limiter, TokenBucketRateLimiter)
+    assert registry.for_url("https://query.wikidata.org/other") is limiter
+    assert limiter.capacity == 5
+    assert registry.for_url("https://example.com/api") is None
+
+
+# --- Tests for process_items_streaming_async ---
+
+
+@pytest.mark.asyncio
+async def test_streaming_executor_bounds_in_flight_tasks_and_pulls_lazily():
+    """Tests that items are pulled on demand and never exceed the concurrency bound."""
+    pulled = []
+    in_flight = 0
+    max_in_flight = 0
+
+    def item_generator():
+        for i in range(20):
+            pulled.append(i)
+            yield i
+
+    async def worker(x):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.001 * (x % 3))
+        in_flight -= 1
+        return None if x == 5 else x
+
+    stream = process_items_streaming_async(item_generator(), worker, max_concurrent_tasks=3)
+    first = await stream.__anext__()
+    # Only the first window has been pulled before the first result arrives
+    assert len(pulled) <= 4
+    results = [first] + [result async for result in stream]
+
+    assert max_in_flight <= 3
+    assert sorted(results) == [i for i in range(20) if i != 5]
+
+
+@pytest.mark.asyncio
+async def test_streaming_executor_ordered_output_from_async_iterable():
+    """Tests input-order output and error handling with an async iterable source."""
+    async def item_source():
+        for i in range(6):
+            yield i
+
+    async def worker(x):
+        if x == 2:
+            raise ValueError("boom")
+        await asyncio.sleep(0.001 * (6 - x))  # Later items finish first
+        return x * 10
+
+    results = [
+        result
+        async for result in process_items_streaming_async(
+            item_source(), worker, max_concurrent_tasks=3, ordered=True
+        )
+    ]
+    assert results == [0, 10, 30, 40, 50]
+
+
+# --- Tests for AdaptiveConcurrencyLimiter ---
+
+
+@pytest.mark.asyncio
+async def test_adaptive_concurrency_limiter_enforces_limit():
+    """Tests that no more than the current limit of tasks hold a slot."""
+    limiter = AdaptiveConcurrencyLimiter(initial=2, maximum=4)
+    active = 0
+    max_active = 0
+
+    async def task():
+        nonlocal active, max_active
+        await limiter.acquire()
+        active += 1
+        max_active = max(max_active, active)
+        await asyncio.sleep(0.001)
+        active -= 1
+        limiter.release()
+
+    await asyncio.gather(*(task() for _ in range(10)))
+    assert max_active == 2
+
+
+def test_adaptive_concurrency_limiter_aimd():
+    """Tests additive increase on success and one multiplicative cut per congestion event."""
+    limiter = AdaptiveConcurrencyLimiter(initial=4, maximum=8)
+
+    # About one slot per window of healthy requests. Requests "started" a second
+    # ago, so timer jitter cannot make the latency look degraded.
+    for _ in range(5):
+        limiter.on_success(time.monotonic() - 1.0)
+    assert limiter.current == 5
+
+    started_at = time.monotonic()
+    limiter.on_overload(started_at)
+    assert limiter.current == 2
+    # A request that was in flight during the same event does not cut again
+    limiter.on_overload(started_at)
+    assert limiter.current == 2
+    assert limiter.overloads == 1
+    assert limiter.peak == 5
+
+
+def test_adaptive_concurrency_limiter_latency_baseline_expires(monkeypatch):
+    """Tests that a stale fastest latency stops holding growth after two windows."""
+    now = 1000.0
+    monkeypatch.setattr(time, "monotonic", lambda: now)
+    limiter = AdaptiveConcurrencyLimiter(initial=4, maximum=8, latency_window=10)
+
+    limiter.on_success(now - 0.1)
+    assert limiter.current == 4  # 1/4 of a slot so far
+
+    # The endpoint is now 10x slower for good: growth holds at first...
+    now += 5
+    limiter.on_success(now - 1.0)
+    now += 10
+    limiter.on_success(now - 1.0)
+    assert limiter.limit == pytest.approx(4.25)
+
+    # ...and resumes once the fast window has rolled out of the baseline
+    now += 10
+    for _ in range(4):
+        limiter.on_success(now - 1.0)
+    assert limiter.current == 5
+
+
+# --- Tests for CircuitBreaker ---
+
+
+def test_circuit_breaker_opens_and_probes():
+    """Tests that the circuit opens after repeated failures and closes after a good probe."""
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.01)
+    breaker.record_failure()
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+
+    time.sleep(0.02)
+    assert breaker.allow_request()  # The probe
+    assert not breaker.allow_request()  # Only one probe at a time
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_circuit_breaker_replaces_unresolved_probe():
+    """Tests that a probe that never reports back doesn't keep the circuit half-open."""
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+    breaker.record_failure()
+    time.sleep(0.02)
+    assert breaker.allow_request()  # The probe, which is then lost
+    assert not breaker.allow_request()
+
+    time.sleep(0.02)
+    assert breaker.allow_request()  # A new probe
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+
+# --- Tests for SingleFlight ---
+
+
+@pytest.mark.asyncio
+async def test_single_flight_coalesces_duplicate_keys():
+    """Tests that concurrent calls for one key share a single fetch."""
+    flights = SingleFlight()
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"artist": "Joy Division"}
+
+    results = await asyncio.gather(*(flights.do("Q1", fetch) for _ in range(5)))
+    assert calls == 1
+    assert all(result == {"artist": "Joy Division"} for result in results)
+    assert flights.coalesced == 4
+
+    # The key is released once the fetch has finished
+    await flights.do("Q1", fetch)
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_single_flight_merges_overlapping_key_sets():
+    """Tests that a batch only fetches keys not already in flight."""
+    flights = SingleFlight()
+    requested = []
+
+    async def fetch(keys):
+        requested.append(list(keys))
+        await asyncio.sleep(0.01)
+        # "Q3" does not exist and is omitted from the results
+        return {key: key.lower() for key in keys if key != "Q3"}
+
+    first, second = await asyncio.gather(
+        flights.do_many(["Q1", "Q2", "Q3"], fetch),
+        flights.do_many(["Q2", "Q3", "Q4"], fetch),
+    )
+    assert requested == [["Q1", "Q2", "Q3"], ["Q4"]]
+    assert first == {"Q1": "q1", "Q2": "q2"}
+    assert second == {"Q2": "q2", "Q4": "q4"}
+
+
+@pytest.mark.asyncio
+async def test_single_flight_do_fetches_keys_missed_by_joined_batch():
+    """Tests that `do` falls back to its own fetch if the joined batch omits the key."""
+    flights = SingleFlight()
+
+    async def fetch_batch(keys):
+        await asyncio.sleep(0.01)
+        return {key: key.lower() for key in keys if key != "Q3"}
+
+    async def fetch_one():
+        return "q3 (direct)"
+
+    batch, single = await asyncio.gather(
+        flights.do_many(["Q1", "Q3"], fetch_batch),
+        flights.do("Q3", fetch_one),
+    )
+    assert batch == {"Q1": "q1"}
+    assert single == "q3 (direct)"
+    assert flights.coalesced == 1
+
+
+# --- Tests for MicroBatcher ---
+
+
+@pytest.mark.asyncio
+async def test_micro_batcher_pools_lookups_from_concurrent_callers():
+    """Tests that lookups are grouped up to the maximum batch size."""
+    sent_batches = []
+
+    async def fetch_batch(keys):
+        sent_batches.append(list(keys))
+        return {key: key.lower() for key in keys if key != "Q404"}
+
+    batcher = MicroBatcher(fetch_batch, max_batch_size=3, max_delay=0.01)
+    first, second, single = await asyncio.gather(
+        batcher.get_many(["Q1", "Q2"]),
+        batcher.get_many(["Q2", "Q3", "Q4", "Q404"]),
+        batcher.get("Q5"),
+    )
+
+    # The first batch is sent as soon as it is full, the rest after the delay
+    assert sent_batches == [["Q1", "Q2", "Q3"], ["Q4", "Q404", "Q5"]]
+    assert first == {"Q1": "q1", "Q2": "q2"}
+    assert second == {"Q2": "q2", "Q3": "q3", "Q4": "q4"}
+    assert single == "q5"
+    assert batcher.stats()["avg_batch_size"] == 3.0
+
+
+@pytest.mark.asyncio
+async def test_micro_batcher_cancelled_batch_releases_callers():
+    """Tests that callers waiting on a cancelled batch don't hang."""
+    started = asyncio.Event()
+
+    async def fetch_batch(keys):
+        started.set()
+        await asyncio.Event().wait()
+
+    batcher = MicroBatcher(fetch_batch, max_batch_size=2, max_delay=0.01)
+    callers = asyncio.gather(
+        batcher.get("Q1"), batcher.get_many(["Q1", "Q2"]), return_exceptions=True
+    )
+    await started.wait()
+    for task in list(batcher._tasks):
+        task.cancel()
+
+    results = await asyncio.wait_for(callers, timeout=1)
+    assert all(isinstance(result, asyncio.CancelledError) for result in results)
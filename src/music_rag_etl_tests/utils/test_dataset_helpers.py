@@ -0,0 +1,121 @@
+import os
+from pathlib import Path
+
+import polars as pl
+import pytest
+from dagster import AssetKey, build_input_context, build_output_context
+
+from music_rag_etl.utils.dataset_helpers import (
+    ParquetDatasetIOManager,
+    export_jsonl_to_parquet,
+    get_parquet_path,
+    scan_dataset,
+    write_dataset,
+)
+
+
+@pytest.fixture
+def artists_df() -> pl.DataFrame:
+    """Fixture for a small dataset with a nested column."""
+    return pl.DataFrame(
+        {
+            "wikidata_id": ["Q1", "Q2", "Q3"],
+            "artist": ["Joy Division", "Álvaro", "New Order"],
+            "genres": [["Q598929"], [], ["Q598929", "Q9778"]],
+        }
+    )
+
+
+def test_write_dataset_roundtrip(tmp_path: Path, artists_df: pl.DataFrame):
+    """Tests that a dataset is written as Parquet plus a matching JSONL export."""
+    jsonl_path = tmp_path / "artists.jsonl"
+
+    parquet_path = write_dataset(artists_df, jsonl_path)
+
+    assert parquet_path == get_parquet_path(jsonl_path) == tmp_path / "artists.parquet"
+    assert pl.read_parquet(parquet_path).equals(artists_df)
+    assert pl.read_ndjson(jsonl_path)["wikidata_id"].to_list() == ["Q1", "Q2", "Q3"]
+    # No temporary files are left behind
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["artists.jsonl", "artists.parquet"]
+
+
+def test_scan_dataset_prefers_fresh_parquet(tmp_path: Path, artists_df: pl.DataFrame):
+    """Tests that a stale Parquet copy is ignored in favour of the JSONL file."""
+    jsonl_path = tmp_path / "artists.jsonl"
+    write_dataset(artists_df, jsonl_path)
+
+    projected = scan_dataset(jsonl_path).select("wikidata_id").collect()
+    assert projected.columns == ["wikidata_id"]
+
+    # The JSONL file is rewritten after the Parquet copy
+    artists_df.head(1).write_ndjson(jsonl_path)
+    parquet_mtime = get_parquet_path(jsonl_path).stat().st_mtime
+    os.utime(jsonl_path, (parquet_mtime + 10, parquet_mtime + 10))
+
+    assert scan_dataset(jsonl_path).collect().height == 1
+
+
+def test_export_jsonl_to_parquet_empty_file(tmp_path: Path):
+    """Tests that an empty JSONL file does not produce a Parquet copy."""
+    jsonl_path = tmp_path / "empty.jsonl"
+    jsonl_path.touch()
+
+    assert export_jsonl_to_parquet(jsonl_path) is None
+    assert not get_parquet_path(jsonl_path).exists()
+
+
+def test_export_jsonl_to_parquet_infers_sparse_columns(tmp_path: Path):
+    """Tests that a field that is null for the first 100+ records keeps its type."""
+    jsonl_path = tmp_path / "albums.jsonl"
+    lines = ['{"id":"Q%d","year":null}' % i for i in range(150)]
+    lines.append('{"id":"Q150","year":"1980"}')
+    jsonl_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    assert scan_dataset(jsonl_path).collect()["year"].to_list()[-1] == "1980"
+
+    parquet_path = export_jsonl_to_parquet(jsonl_path)
+    df = pl.read_parquet(parquet_path)
+    assert df.schema["year"] == pl.String
+    assert df["year"].to_list()[-1] == "1980"
+
+
+def test_scan_dataset_empty_or_missing(tmp_path: Path):
+    """Tests that an empty or missing dataset scans as an empty typed frame."""
+    schema = {"id": pl.String, "genres": pl.List(pl.String)}
+    empty_path = tmp_path / "empty.jsonl"
+    empty_path.touch()
+
+    for jsonl_path in (empty_path, tmp_path / "missing.jsonl"):
+        df = scan_dataset(jsonl_path, schema=schema).collect()
+        assert df.height == 0
+        assert df.schema == pl.Schema(schema)
+
+
+def test_io_manager_dataframe_and_path_outputs(tmp_path: Path, artists_df: pl.DataFrame):
+    """Tests both output types of the IO manager and loading them back lazily."""
+    io_manager = ParquetDatasetIOManager(base_dir=str(tmp_path))
+
+    # A DataFrame output is stored under the asset name
+    io_manager.handle_output(build_output_context(asset_key=AssetKey("artists")), artists_df)
+    assert (tmp_path / "artists.parquet").exists()
+    assert (tmp_path / "artists.jsonl").exists()
+
+    # A path output (a JSONL file streamed by the asset) is converted to Parquet
+    albums_path = tmp_path / "albums_stream.jsonl"
+    albums_path.write_text('{"id":"Q10"}\n{"id":"Q11"}\n', encoding="utf-8")
+    io_manager.handle_output(build_output_context(asset_key=AssetKey("albums")), str(albums_path))
+    assert pl.read_parquet(get_parquet_path(albums_path))["id"].to_list() == ["Q10", "Q11"]
+
+    input_context = build_input_context(
+        upstream_output=build_output_context(asset_key=AssetKey("artists"))
+    )
+    loaded = io_manager.load_input(input_context)
+    assert isinstance(loaded, pl.LazyFrame)
+    assert loaded.collect().equals(artists_df)
+
+
+def test_io_manager_rejects_unsupported_outputs(tmp_path: Path):
+    """Tests that outputs other than frames and paths raise a TypeError."""
+    io_manager = ParquetDatasetIOManager(base_dir=str(tmp_path))
+    with pytest.raises(TypeError, match="Unsupported output type"):
+        io_manager.handle_output(build_output_context(asset_key=AssetKey("x")), 42)
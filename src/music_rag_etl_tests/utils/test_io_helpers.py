@@ -1,7 +1,16 @@
 import json
 from pathlib import Path
 
-from music_rag_etl.utils.io_helpers import save_to_jsonl
+import pytest
+
+from music_rag_etl.utils.io_helpers import (
+    JSON_CODEC_FACTORIES,
+    JsonlSink,
+    get_json_codec,
+    iter_jsonl,
+    iter_jsonl_batches,
+    save_to_jsonl,
+)
 
 
 def test_save_to_jsonl(tmp_path: Path):
@@ -80,7 +89,116 @@ def test_save_to_jsonl_creates_directory(tmp_path: Path):
     # 3. Assertions
     assert output_dir.exists()
     assert output_file.exists()
-    assert (
-        output_file.read_text(encoding="utf-8").strip()
-        == '{"id": 1, "message": "hello"}'
-    )
+    # The exact formatting is the codec's (see test_json_codecs_produce_identical_output)
+    assert [
+        json.loads(line) for line in output_file.read_text(encoding="utf-8").splitlines()
+    ] == sample_data
+
+
+def test_json_codecs_produce_identical_output():
+    """
+    Tests that every installed codec round-trips and emits the same compact,
+    non-ASCII-preserving output as the stdlib fallback.
+    """
+    record = {"id": "Q1", "name": "Álvaro Ñandú", "tags": ["rock", 1, 2.5, None, True]}
+    expected = json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+
+    for name in JSON_CODEC_FACTORIES:
+        try:
+            codec = get_json_codec(name)
+        except ImportError:
+            continue
+        assert codec.dumps(record) == expected
+        assert codec.loads(expected) == record
+        assert codec.loads(expected.encode("utf-8")) == record
+        with pytest.raises(json.JSONDecodeError):
+            codec.loads("{not json")
+
+
+def test_get_json_codec_unknown():
+    """Tests that an unknown codec name raises a ValueError."""
+    with pytest.raises(ValueError, match="Unknown JSON codec"):
+        get_json_codec("yaml")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("background", [False, True])
+async def test_jsonl_sink_writes_atomically(tmp_path: Path, background: bool):
+    """
+    Tests that the sink only replaces the output file once it closes successfully.
+    """
+    output_file = tmp_path / "datasets" / "albums.jsonl"
+    output_file.parent.mkdir()
+    output_file.write_text('{"id": "old"}\n', encoding="utf-8")
+
+    async with JsonlSink(output_file, buffer_size=16, background=background) as sink:
+        await sink.awrite_many([{"id": 1}, {"id": 2}])
+        sink.write({"id": "Álvaro"})
+        # The previous dataset is untouched while the run is in progress
+        assert output_file.read_text(encoding="utf-8") == '{"id": "old"}\n'
+
+    lines = output_file.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == [{"id": 1}, {"id": 2}, {"id": "Álvaro"}]
+    assert sink.records_written == 3
+    assert list(output_file.parent.iterdir()) == [output_file]
+
+
+def test_jsonl_sink_discards_failed_runs(tmp_path: Path):
+    """
+    Tests that an exception inside the sink leaves the previous dataset in place.
+    """
+    output_file = tmp_path / "tracks.jsonl"
+    output_file.write_text('{"id": "old"}\n', encoding="utf-8")
+
+    with pytest.raises(RuntimeError):
+        with JsonlSink(output_file) as sink:
+            sink.write_many([{"id": 1}])
+            raise RuntimeError("Extraction failed")
+
+    assert output_file.read_text(encoding="utf-8") == '{"id": "old"}\n'
+    assert list(tmp_path.iterdir()) == [output_file]
+
+
+def test_jsonl_sink_counts_buffer_in_bytes(tmp_path: Path):
+    """
+    Tests that the buffer size is measured in encoded bytes, not characters.
+    """
+    output_file = tmp_path / "artists.jsonl"
+
+    with JsonlSink(output_file, buffer_size=21, flush_interval=3600, atomic=False) as sink:
+        # At most 20 characters, but 29+ bytes in UTF-8: the buffer is written out
+        sink.write({"a": "é" * 10})
+        assert json.loads(output_file.read_text(encoding="utf-8")) == {"a": "é" * 10}
+
+
+def test_iter_jsonl_batches(tmp_path: Path):
+    """
+    Tests that records are streamed in batches of at most batch_size.
+    """
+    file_path = tmp_path / "records.jsonl"
+    save_to_jsonl([{"id": i} for i in range(7)], file_path)
+
+    batches = list(iter_jsonl_batches(file_path, batch_size=3))
+
+    assert [len(batch) for batch in batches] == [3, 3, 1]
+    assert [record["id"] for batch in batches for record in batch] == list(range(7))
+
+
+@pytest.mark.parametrize("use_mmap", [False, True])
+def test_iter_jsonl_shards_are_disjoint(tmp_path: Path, use_mmap: bool):
+    """
+    Tests that byte-range shards split the file without losing or repeating lines.
+    """
+    file_path = tmp_path / "records.jsonl"
+    # Lines of varying length so shard boundaries fall mid-line
+    records = [{"id": i, "text": "x" * (i * 7 % 23)} for i in range(50)]
+    save_to_jsonl(records, file_path)
+
+    shards = [
+        [record["id"] for record in iter_jsonl(file_path, use_mmap, index, 4)]
+        for index in range(4)
+    ]
+
+    assert all(shards)
+    assert [record_id for shard in shards for record_id in shard] == list(range(50))
+    assert list(iter_jsonl(file_path, use_mmap=use_mmap)) == records
@@ -27,7 +27,7 @@ def test_fetch_lastfm_data_cache_miss(mock_cache, mock_make_request):
     context = build_asset_context()
     mock_response_data = {"artist": {"name": artist_name, "mbid": "123"}}
 
-    mock_make_request.return_value.json.return_value = mock_response_data
+    mock_make_request.return_value.content = json.dumps(mock_response_data).encode("utf-8")
     mock_make_request.return_value.raise_for_status.return_value = None
 
     with patch("pathlib.Path.exists", return_value=False):
@@ -60,7 +60,7 @@ def test_fetch_lastfm_data_mbid_mismatch(mock_cache, mock_make_request):
     context = build_asset_context()
     mock_response_data = {"artist": {"name": artist_name, "mbid": "wrong-id"}}
 
-    mock_make_request.return_value.json.return_value = mock_response_data
+    mock_make_request.return_value.content = json.dumps(mock_response_data).encode("utf-8")
     mock_make_request.return_value.raise_for_status.return_value = None
 
     with patch("pathlib.Path.exists", return_value=False):
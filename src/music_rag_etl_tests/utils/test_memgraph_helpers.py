@@ -0,0 +1,181 @@
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+from music_rag_etl.utils.memgraph_helpers import (
+    MemgraphPool,
+    compute_content_hash,
+    create_edges,
+    create_nodes,
+    delete_edges,
+    delete_nodes,
+    fetch_unique_constraints,
+    get_partition,
+    iter_batches,
+)
+
+
+def test_iter_batches():
+    """Tests that rows are grouped lazily into batches of at most batch_size."""
+    rows = ({"id": i} for i in range(5))
+    batches = list(iter_batches(rows, 2))
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert batches[-1] == [{"id": 4}]
+    assert list(iter_batches([], 2)) == []
+
+
+def test_create_nodes_sends_one_query_per_batch():
+    """Tests that nodes are created with one UNWIND query per batch of rows."""
+    memgraph = MagicMock()
+    rows = [{"id": f"Q{i}", "name": f"Genre {i}"} for i in range(5)]
+
+    count = create_nodes(memgraph, "Genre", iter(rows), batch_size=2)
+
+    assert count == 5
+    assert memgraph.execute.call_count == 3
+    query, params = memgraph.execute.call_args_list[0].args
+    assert query == "UNWIND $rows AS row CREATE (n:Genre) SET n = row;"
+    assert params == {"rows": rows[:2]}
+
+
+def test_create_edges_matches_endpoints_by_id():
+    """Tests that edges are created between nodes matched by id, in batches."""
+    memgraph = MagicMock()
+    edges = [{"source": "Q1", "target": "Q10"}, {"source": "Q2", "target": "Q10"}]
+
+    count = create_edges(memgraph, "HAS_GENRE", "Artist", "Genre", edges, batch_size=10)
+
+    assert count == 2
+    query, params = memgraph.execute.call_args.args
+    assert query == (
+        "UNWIND $edges AS edge "
+        "MATCH (a:Artist {id: edge.source}) "
+        "MATCH (b:Genre {id: edge.target}) "
+        "CREATE (a)-[:HAS_GENRE]->(b);"
+    )
+    assert params == {"edges": edges}
+
+
+def test_compute_content_hash_ignores_key_order():
+    """Tests that the content hash only depends on the property values."""
+    row = {"id": "Q1", "name": "Joy Division", "aliases": ["JD"]}
+    reordered = {"aliases": ["JD"], "name": "Joy Division", "id": "Q1"}
+
+    assert compute_content_hash(row) == compute_content_hash(reordered)
+    assert compute_content_hash(row) != compute_content_hash({**row, "name": "New Order"})
+
+
+def test_fetch_unique_constraints():
+    """Tests that only single-property uniqueness constraints are returned."""
+    memgraph = MagicMock()
+    memgraph.execute_and_fetch.return_value = [
+        {"constraint type": "unique", "label": "Artist", "properties": ["id"]},
+        {"constraint type": "unique", "label": "Genre", "properties": "id"},
+        {"constraint type": "unique", "label": "Album", "properties": ["id", "title"]},
+        {"constraint type": "exists", "label": "Track", "properties": "id"},
+    ]
+
+    assert fetch_unique_constraints(memgraph) == {("Artist", "id"), ("Genre", "id")}
+
+
+def test_pool_partitions_rows_by_id_and_retries_conflicts():
+    """Tests that each id is always written by the same connection, and that
+    conflicting transactions are retried."""
+    clients = []
+    written = {}
+    lock = threading.Lock()
+
+    def client_factory():
+        client = MagicMock()
+        failures = iter([Exception("Cannot resolve conflicting transactions.")])
+
+        def execute(query, parameters):
+            error = next(failures, None)
+            if error:
+                raise error
+            with lock:
+                for row in parameters["rows"]:
+                    written[row["id"]] = client
+
+        client.execute.side_effect = execute
+        clients.append(client)
+        return client
+
+    rows = [{"id": f"Q{i}"} for i in range(100)]
+    with MemgraphPool(client_factory, workers=3, retry_delay=0) as pool:
+        assert create_nodes(pool, "Artist", iter(rows), batch_size=7) == 100
+
+    assert len(clients) == 3
+    assert pool.retries == 3  # The first query of every connection conflicted
+    assert sorted(written) == sorted(row["id"] for row in rows)
+    partitions = {}
+    for node_id, client in written.items():
+        partitions.setdefault(clients.index(client), set()).add(get_partition(node_id, 3))
+    assert all(len(partition) == 1 for partition in partitions.values())
+
+
+def test_pool_edge_rounds_never_share_endpoints():
+    """Tests that the workers of one round write edges between disjoint
+    source and target partitions, and that other errors are raised."""
+    rounds = []
+    lock = threading.Lock()
+
+    def execute(query, parameters):
+        with lock:
+            rounds[-1].extend(parameters["edges"])
+
+    client = MagicMock()
+    client.execute.side_effect = execute
+    edges = [{"source": f"A{i}", "target": f"G{i % 5}"} for i in range(60)]
+
+    with MemgraphPool(lambda: client, workers=3) as pool:
+        grid_rounds = []
+        original_wait = pool._wait_all
+
+        def wait_round(futures):
+            original_wait(futures)
+            grid_rounds.append(list(rounds[-1]))
+            rounds.append([])
+
+        pool._wait_all = wait_round
+        rounds.append([])
+        assert create_edges(pool, "HAS_GENRE", "Artist", "Genre", edges, batch_size=4) == 60
+
+        client.execute.side_effect = Exception("Constraint violation")
+        with pytest.raises(Exception, match="Constraint violation"):
+            create_nodes(pool, "Artist", [{"id": "Q1"}])
+
+    assert sum(len(edges_in_round) for edges_in_round in grid_rounds) == 60
+    for edges_in_round in grid_rounds:
+        sources = [get_partition(edge["source"], 3) for edge in edges_in_round]
+        targets = [get_partition(edge["target"], 3) for edge in edges_in_round]
+        # Within a round, each source partition maps to a single target partition
+        pairs = set(zip(sources, targets))
+        assert len({source for source, _ in pairs}) == len(pairs)
+        assert len({target for _, target in pairs}) == len(pairs)
+
+
+def test_pool_writes_same_label_edges_and_deletes_serially():
+    """Tests that edges within one label and node deletes use a single
+    connection, in order, as the edge grid cannot keep them apart."""
+    clients = []
+    batches = []
+
+    def client_factory():
+        client = MagicMock()
+        client.execute.side_effect = lambda query, parameters: batches.append(
+            (client, query, parameters)
+        )
+        clients.append(client)
+        return client
+
+    edges = [{"source": f"A{i}", "target": f"A{i + 1}"} for i in range(20)]
+    with MemgraphPool(client_factory, workers=3) as pool:
+        assert create_edges(pool, "SIMILAR_TO", "Artist", "Artist", edges, batch_size=3) == 20
+        assert delete_edges(pool, "SIMILAR_TO", "Artist", "Artist", edges, batch_size=8) == 20
+        assert delete_nodes(pool, "Album", [f"AL{i}" for i in range(10)], batch_size=4) == 10
+
+    assert len(clients) == 1
+    sizes = [len(parameters.get("edges", parameters.get("ids"))) for _, _, parameters in batches]
+    assert sizes == [3, 3, 3, 3, 3, 3, 2, 8, 8, 4, 4, 4, 2]
+    assert [edge for _, _, parameters in batches[:7] for edge in parameters["edges"]] == edges
@@ -1,9 +1,17 @@
-from unittest.mock import MagicMock, patch
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
 
+import aiohttp
 import pytest
 import requests
 
-from music_rag_etl.utils.request_utils import make_request_with_retries
+from music_rag_etl.utils.concurrency_helpers import CircuitBreaker
+from music_rag_etl.utils.request_utils import (
+    async_make_request_with_retries,
+    get_requests_session,
+    make_request_with_retries,
+    parse_retry_after,
+)
 
 
 @pytest.fixture
@@ -14,7 +22,7 @@ def mock_context():
     return context
 
 
-@patch("requests.request")
+@patch("requests.Session.request")
 def test_make_request_with_retries_post_success(mock_request, mock_context):
     """Tests a successful POST request on the first try."""
     # 1. Setup
@@ -39,7 +47,7 @@ def test_make_request_with_retries_post_success(mock_request, mock_context):
     mock_context.log.warning.assert_not_called()
 
 
-@patch("requests.request")
+@patch("requests.Session.request")
 def test_make_request_with_retries_get_success(mock_request, mock_context):
     """Tests a successful GET request on the first try."""
     # 1. Setup
@@ -65,7 +73,7 @@ def test_make_request_with_retries_get_success(mock_request, mock_context):
 
 
 @patch("time.sleep")
-@patch("requests.request")
+@patch("requests.Session.request")
 def test_make_request_with_retries_with_failures(
     mock_request, mock_sleep, mock_context
 ):
@@ -93,7 +101,7 @@ def test_make_request_with_retries_with_failures(
 
 
 @patch("time.sleep")
-@patch("requests.request", side_effect=requests.exceptions.RequestException("API down"))
+@patch("requests.Session.request", side_effect=requests.exceptions.RequestException("API down"))
 def test_make_request_with_retries_exhausted(mock_request, mock_sleep, mock_context):
     """Tests that an exception is raised when all retries are exhausted."""
     # 1. Setup
@@ -112,7 +120,128 @@ def test_make_request_with_retries_exhausted(mock_request, mock_sleep, mock_cont
     assert mock_sleep.call_count == max_retries
 
 
+def test_get_requests_session_is_shared():
+    """Tests that the synchronous path reuses one pooled session."""
+    session = get_requests_session()
+    assert get_requests_session() is session
+    assert "https://" in session.adapters
+    assert session.headers["Accept-Encoding"] == "gzip, deflate"
+
+
 def test_make_request_with_invalid_method(mock_context):
     """Tests that an invalid HTTP method raises a ValueError."""
     with pytest.raises(ValueError, match="Method must be 'GET' or 'POST'"):
         make_request_with_retries(mock_context, "http://test.com", method="PUT")
+
+
+class FakeResponse:
+    """A minimal async context manager standing in for an aiohttp response."""
+
+    def __init__(self, status=200, data=None, headers=None):
+        self.status = status
+        self.data = data
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status >= 400:
+            raise aiohttp.ClientResponseError(
+                None, (), status=self.status, message="error", headers=self.headers
+            )
+
+    async def json(self, loads=None):
+        return self.data
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+
+def test_parse_retry_after():
+    """Tests Retry-After values given in seconds and as HTTP dates."""
+    assert parse_retry_after("5") == 5.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0  # In the past
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+@pytest.mark.asyncio
+async def test_async_request_fails_fast_on_client_error(mock_context):
+    """Tests that a 404 is raised immediately instead of being retried."""
+    session = MagicMock()
+    session.request.return_value = FakeResponse(status=404)
+
+    with pytest.raises(aiohttp.ClientResponseError):
+        await async_make_request_with_retries(
+            mock_context, "http://test.com/api", method="GET", session=session
+        )
+    assert session.request.call_count == 1
+
+
+@pytest.mark.asyncio
+@patch("music_rag_etl.utils.request_utils.asyncio.sleep", new_callable=AsyncMock)
+async def test_async_request_honors_retry_after(mock_sleep, mock_context):
+    """Tests that a 503 with Retry-After waits for the given time before retrying."""
+    session = MagicMock()
+    session.request.side_effect = [
+        FakeResponse(status=503, headers={"Retry-After": "7"}),
+        FakeResponse(status=200, data={"ok": True}),
+    ]
+
+    result = await async_make_request_with_retries(
+        mock_context, "http://test.com/api", method="GET", session=session
+    )
+
+    assert result == {"ok": True}
+    mock_sleep.assert_awaited_once_with(7.0)
+
+
+@pytest.mark.asyncio
+@patch("music_rag_etl.utils.request_utils.asyncio.sleep", new_callable=AsyncMock)
+async def test_async_request_caps_retry_after(mock_sleep, mock_context):
+    """Tests that a far-off Retry-After is capped at the maximum backoff."""
+    session = MagicMock()
+    session.request.side_effect = [
+        FakeResponse(status=503, headers={"Retry-After": "3600"}),
+        FakeResponse(status=200, data={"ok": True}),
+    ]
+
+    await async_make_request_with_retries(
+        mock_context, "http://test.com/api", method="GET", session=session, max_backoff=30
+    )
+
+    mock_sleep.assert_awaited_once_with(30)
+
+
+@pytest.mark.asyncio
+async def test_async_request_cancelled_probe_reopens_circuit(mock_context):
+    """Tests that cancelling the half-open probe opens the circuit again."""
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+    breaker.record_failure()
+    await asyncio.sleep(0.02)
+
+    started = asyncio.Event()
+
+    class HangingResponse(FakeResponse):
+        async def __aenter__(self):
+            started.set()
+            await asyncio.Event().wait()
+
+    session = MagicMock()
+    session.request.return_value = HangingResponse()
+    with patch("music_rag_etl.utils.request_utils.circuit_breakers.for_url", return_value=breaker):
+        task = asyncio.create_task(
+            async_make_request_with_retries(
+                mock_context, "http://test.com/api", method="GET", session=session
+            )
+        )
+        await started.wait()
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    assert breaker.state == CircuitBreaker.OPEN
+    await asyncio.sleep(0.02)
+    assert breaker.allow_request()
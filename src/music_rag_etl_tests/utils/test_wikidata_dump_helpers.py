@@ -0,0 +1,152 @@
+import gzip
+import json
+from pathlib import Path
+
+import pytest
+
+from music_rag_etl.utils.wikidata_dump_helpers import (
+    compute_genre_closure,
+    iter_artist_records_from_dump,
+    parse_dump_line,
+    wikidata_time_to_datetime,
+)
+
+
+def item_claim(value_id: str, rank: str = "normal") -> dict:
+    """Builds a Wikidata statement pointing to an item."""
+    return {
+        "rank": rank,
+        "mainsnak": {
+            "snaktype": "value",
+            "datavalue": {"value": {"entity-type": "item", "id": value_id}},
+        },
+    }
+
+
+def time_claim(time: str) -> dict:
+    """Builds a Wikidata statement holding a time value."""
+    return {
+        "rank": "normal",
+        "mainsnak": {
+            "snaktype": "value",
+            "datavalue": {"value": {"time": time, "precision": 9}},
+        },
+    }
+
+
+def make_artist(qid: str, label: str, sitelink_count: int = 10, **claims) -> dict:
+    """Builds a minimal artist entity with the given number of sitelinks."""
+    sitelinks = {f"wiki{i}": {"title": label} for i in range(sitelink_count - 1)}
+    sitelinks["enwiki"] = {"title": label}
+    return {
+        "type": "item",
+        "id": qid,
+        "labels": {"en": {"language": "en", "value": label}},
+        "aliases": {"en": [{"language": "en", "value": f"{label} alias"}]},
+        "sitelinks": sitelinks,
+        "claims": claims,
+    }
+
+
+@pytest.fixture
+def synthetic_dump(tmp_path: Path) -> Path:
+    """Writes a small gzipped dump in the one-entity-per-line format."""
+    entities = [
+        # Genre hierarchy: Q900 (sub-genre) -> Q598929 (Post-punk, a root genre)
+        {"type": "item", "id": "Q900", "claims": {"P279": [item_claim("Q598929")]}},
+        {"type": "item", "id": "Q901", "claims": {"P279": [item_claim("Q900")]}},
+        # Band with a transitive sub-genre, founded in 1978
+        make_artist(
+            "Q1", "Joy Division",
+            P31=[item_claim("Q215380")],
+            P136=[item_claim("Q901"), item_claim("Q123")],
+            P571=[time_claim("+1976-00-00T00:00:00Z")],
+        ),
+        # Human musician using work start (P2031) instead of inception
+        make_artist(
+            "Q2", "Ian Curtis",
+            P31=[item_claim("Q5")],
+            P106=[item_claim("Q177220")],
+            P136=[item_claim("Q598929")],
+            P2031=[time_claim("+1976-05-00T00:00:00Z")],
+        ),
+        # Human without a musical occupation
+        make_artist(
+            "Q3", "Not A Musician",
+            P31=[item_claim("Q5")],
+            P106=[item_claim("Q82594")],
+            P136=[item_claim("Q598929")],
+            P571=[time_claim("+1976-00-00T00:00:00Z")],
+        ),
+        # Too few sitelinks
+        make_artist(
+            "Q4", "Obscure Band", sitelink_count=7,
+            P31=[item_claim("Q215380")],
+            P136=[item_claim("Q598929")],
+            P571=[time_claim("+1976-00-00T00:00:00Z")],
+        ),
+        # Outside of the requested date ranges
+        make_artist(
+            "Q5000", "Too Old Band",
+            P31=[item_claim("Q215380")],
+            P136=[item_claim("Q598929")],
+            P571=[time_claim("+1950-00-00T00:00:00Z")],
+        ),
+    ]
+    dump_path = tmp_path / "latest-all.json.gz"
+    with gzip.open(dump_path, "wt", encoding="utf-8") as f:
+        f.write("[\n")
+        f.write(",\n".join(json.dumps(entity) for entity in entities))
+        f.write("\n]\n")
+    return dump_path
+
+
+def test_parse_dump_line():
+    """Tests that array brackets and trailing commas are handled."""
+    assert parse_dump_line("[\n") is None
+    assert parse_dump_line("]") is None
+    assert parse_dump_line('{"id": "Q1"},\n') == {"id": "Q1"}
+
+
+def test_wikidata_time_to_datetime():
+    """Tests normalization of year-precision dates to SPARQL dateTimes."""
+    assert wikidata_time_to_datetime({"time": "+1965-00-00T00:00:00Z"}) == "1965-01-01T00:00:00Z"
+    assert wikidata_time_to_datetime({"time": "-0500-00-00T00:00:00Z"}) is None
+
+
+def test_compute_genre_closure():
+    """Tests that the closure is transitive and includes the roots."""
+    edges = [("Q2", ["Q1"]), ("Q3", ["Q2"]), ("Q9", ["Q8"])]
+    assert compute_genre_closure(edges, ["Q1"]) == {"Q1", "Q2", "Q3"}
+
+
+def test_iter_artist_records_from_dump(synthetic_dump: Path):
+    """Tests the dump filters and the record format end to end."""
+    records = list(
+        iter_artist_records_from_dump(
+            synthetic_dump, date_ranges=[(1970, 1979)], processes=1
+        )
+    )
+
+    assert [record["wikidata_id"] for record in records] == ["Q1", "Q2"]
+    assert records[0] == {
+        "wikidata_id": "Q1",
+        "artist": "Joy Division",
+        "aliases": ["Joy Division alias"],
+        "wikipedia_url": "https://en.wikipedia.org/wiki/Joy_Division",
+        "genres": ["Q901"],
+        "inception": "1976-01-01T00:00:00Z",
+        "linkcount": "10",
+    }
+    assert records[1]["inception"] == "1976-05-01T00:00:00Z"
+
+
+def test_iter_artist_records_from_dump_multiprocess(synthetic_dump: Path):
+    """Tests that the multi-process parser yields the same records."""
+    single = list(
+        iter_artist_records_from_dump(synthetic_dump, [(1970, 1979)], processes=1)
+    )
+    parallel = list(
+        iter_artist_records_from_dump(synthetic_dump, [(1970, 1979)], processes=2)
+    )
+    assert parallel == single
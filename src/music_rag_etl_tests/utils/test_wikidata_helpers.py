@@ -1,17 +1,45 @@
-from unittest.mock import patch, mock_open, call
-import json
+import asyncio
+from datetime import date
+from unittest.mock import patch, AsyncMock
 from pathlib import Path
 
+import pytest
 from dagster import build_asset_context
 
+from music_rag_etl.settings import WIKIDATA_ENTITY_PROPS
+from music_rag_etl.utils.cache_helpers import SQLiteCacheBackend
+from music_rag_etl.utils.concurrency_helpers import AdaptiveBatchSize
 from music_rag_etl.utils.wikidata_helpers import (
     fetch_wikidata_entities_batch_with_cache,
+    async_fetch_wikidata_entities_batch_with_cache,
+    async_fetch_grouped_sparql_with_cache,
+    async_resolve_qids_to_labels,
+    WikidataEntityBatcher,
+    project_entity,
+    revalidate_wikidata_entities,
+    build_year_partitions,
+    fetch_sparql_date_partition,
 )
-from music_rag_etl.settings import WIKIDATA_CACHE_DIR
+from music_rag_etl.utils.sparql_queries import (
+    get_albums_by_artists_query,
+    get_tracks_by_albums_query,
+    get_artists_by_date_range_query,
+)
+
+
+@pytest.fixture
+def temp_cache(tmp_path: Path):
+    """Redirects the Wikidata cache backend to a temporary SQLite database."""
+    cache = SQLiteCacheBackend(tmp_path / "wikidata_cache.sqlite3")
+    with patch(
+        "music_rag_etl.utils.wikidata_helpers.get_wikidata_cache", return_value=cache
+    ):
+        yield cache
+    cache.close()
 
 
 @patch("music_rag_etl.utils.wikidata_helpers.fetch_wikidata_entities_batch")
-def test_batch_cache_full_hit(mock_fetch_batch):
+def test_batch_cache_full_hit(mock_fetch_batch, temp_cache):
     """Tests that the API is not called if all QIDs are in the cache."""
     context = build_asset_context()
     qids = ["Q1", "Q2"]
@@ -19,26 +47,18 @@ def test_batch_cache_full_hit(mock_fetch_batch):
         "Q1": {"id": "Q1", "claims": {}},
         "Q2": {"id": "Q2", "claims": {}},
     }
+    temp_cache.put_many(mock_cache_data)
 
-    # Simulate that both files exist
-    with patch("pathlib.Path.exists", return_value=True):
-        # Simulate reading the two different cache files
-        m = mock_open()
-        m.side_effect = [
-            mock_open(read_data=json.dumps(mock_cache_data["Q1"])).return_value,
-            mock_open(read_data=json.dumps(mock_cache_data["Q2"])).return_value,
-        ]
-        with patch("builtins.open", m):
-            results = fetch_wikidata_entities_batch_with_cache(context, qids)
+    results = fetch_wikidata_entities_batch_with_cache(context, qids)
 
-            # Assert API was not called
-            mock_fetch_batch.assert_not_called()
-            # Assert results are correct
-            assert results == mock_cache_data
+    # Assert API was not called
+    mock_fetch_batch.assert_not_called()
+    # Assert results are correct
+    assert results == mock_cache_data
 
 
 @patch("music_rag_etl.utils.wikidata_helpers.fetch_wikidata_entities_batch")
-def test_batch_cache_full_miss(mock_fetch_batch):
+def test_batch_cache_full_miss(mock_fetch_batch, temp_cache):
     """Tests that the API is called for all QIDs if none are in the cache."""
     context = build_asset_context()
     qids = ["Q1", "Q2"]
@@ -50,67 +70,281 @@ def test_batch_cache_full_miss(mock_fetch_batch):
     }
     mock_fetch_batch.return_value = mock_api_response
 
-    # Simulate that no files exist
-    with patch("pathlib.Path.exists", return_value=False):
-        m = mock_open()
-        with patch("builtins.open", m):
-            results = fetch_wikidata_entities_batch_with_cache(context, qids)
+    results = fetch_wikidata_entities_batch_with_cache(context, qids)
 
-            # Assert API was called with all missing QIDs
-            mock_fetch_batch.assert_called_once_with(context, ["Q1", "Q2"])
+    # Assert API was called with all missing QIDs
+    mock_fetch_batch.assert_called_once_with(context, ["Q1", "Q2"], WIKIDATA_ENTITY_PROPS)
 
-            # Assert cache files were written
-            m.assert_any_call(WIKIDATA_CACHE_DIR / "Q1.json", "w", encoding="utf-8")
-            m.assert_any_call(WIKIDATA_CACHE_DIR / "Q2.json", "w", encoding="utf-8")
-            # Assert results are correct
-            assert results == mock_api_response["entities"]
+    # Assert cache entries were written
+    assert temp_cache.get_many(qids) == mock_api_response["entities"]
+    # Assert results are correct
+    assert results == mock_api_response["entities"]
 
 
-import tempfile
-import shutil
-
-# ... (existing imports)
-
 @patch("music_rag_etl.utils.wikidata_helpers.fetch_wikidata_entities_batch")
-def test_batch_cache_partial_hit(mock_fetch_batch):
-    """Tests that the API is only called for the QID not in the cache, using a real file system cache."""
+def test_batch_cache_partial_hit(mock_fetch_batch, temp_cache):
+    """Tests that the API is only called for the QID not in the cache."""
     context = build_asset_context()
     qids = ["Q1", "Q2"]  # Q1 is cached, Q2 is not
 
     mock_cached_q1 = {"id": "Q1", "claims": {}}
     mock_api_response_q2 = {"entities": {"Q2": {"id": "Q2", "claims": {}}}}
     mock_fetch_batch.return_value = mock_api_response_q2
+    temp_cache.put("Q1", mock_cached_q1)
+
+    results = fetch_wikidata_entities_batch_with_cache(context, qids)
+
+    # Assert API was called only with the missing QID
+    mock_fetch_batch.assert_called_once_with(context, ["Q2"], WIKIDATA_ENTITY_PROPS)
+
+    # Assert that the new cache entry for Q2 was written
+    assert temp_cache.get("Q2") == mock_api_response_q2["entities"]["Q2"]
+
+    # Assert the final results contain both items
+    assert results["Q1"] == mock_cached_q1
+    assert results["Q2"] == mock_api_response_q2["entities"]["Q2"]
+
+
+def test_project_entity_keeps_whitelisted_claims():
+    """Tests that projection drops other claims, qualifiers, references and languages."""
+    entity = {
+        "id": "Q1",
+        "labels": {"en": {"language": "en", "value": "Joy Division"}},
+        "aliases": {"en": [{"language": "en", "value": "JD"}]},
+        "claims": {
+            "P495": [{
+                "id": "Q1$abc",
+                "rank": "normal",
+                "mainsnak": {
+                    "snaktype": "value",
+                    "property": "P495",
+                    "datavalue": {"value": {"entity-type": "item", "id": "Q145"}, "type": "wikibase-entityid"},
+                },
+                "qualifiers": {"P580": []},
+                "references": [{"hash": "abc"}],
+            }],
+            "P31": [{"rank": "normal", "mainsnak": {"snaktype": "value"}}],
+        },
+    }
+
+    assert project_entity(entity) == {
+        "id": "Q1",
+        "labels": {"en": {"value": "Joy Division"}},
+        "aliases": {"en": [{"value": "JD"}]},
+        "claims": {
+            "P495": [{
+                "rank": "normal",
+                "mainsnak": {
+                    "snaktype": "value",
+                    "datavalue": {"value": {"entity-type": "item", "id": "Q145"}},
+                },
+            }],
+        },
+    }
+    assert project_entity(entity, props="labels") == {
+        "id": "Q1",
+        "labels": {"en": {"value": "Joy Division"}},
+    }
+
+
+@patch("music_rag_etl.utils.wikidata_helpers.fetch_wikidata_entities_batch")
+def test_batch_cache_smaller_props(mock_fetch_batch, temp_cache):
+    """Tests that a labels-only request is served from full entities and cached apart."""
+    context = build_asset_context()
+    temp_cache.put("Q1", {"id": "Q1", "labels": {"en": {"value": "One"}}, "claims": {}})
+    mock_fetch_batch.return_value = {
+        "entities": {"Q2": {"id": "Q2", "labels": {"en": {"language": "en", "value": "Two"}}}}
+    }
+
+    results = fetch_wikidata_entities_batch_with_cache(context, ["Q1", "Q2"], props="labels")
+
+    mock_fetch_batch.assert_called_once_with(context, ["Q2"], "labels")
+    assert results == {
+        "Q1": {"id": "Q1", "labels": {"en": {"value": "One"}}},
+        "Q2": {"id": "Q2", "labels": {"en": {"value": "Two"}}},
+    }
+    # The labels-only entity does not shadow a full entity under the bare QID
+    assert temp_cache.get("Q2") is None
+    assert temp_cache.get("entity_labels_Q2") == results["Q2"]
+
+
+@pytest.mark.asyncio
+@patch(
+    "music_rag_etl.utils.wikidata_helpers.async_make_request_with_retries",
+    new_callable=AsyncMock,
+)
+async def test_grouped_sparql_splits_rows_per_entity(mock_request, temp_cache):
+    """Tests that a batched SPARQL response is split and cached per artist."""
+    context = build_asset_context()
+    cached_q1 = {"results": {"bindings": [{"album": {"value": "cached"}}]}}
+    temp_cache.put("sparql_albums_Q1", cached_q1)
+
+    row_q2 = {
+        "artist": {"value": "http://www.wikidata.org/entity/Q2"},
+        "album": {"value": "http://www.wikidata.org/entity/Q20"},
+    }
+    mock_request.return_value = {"results": {"bindings": [row_q2]}}
+
+    results = await async_fetch_grouped_sparql_with_cache(
+        context,
+        ["Q1", "Q2", "Q3"],
+        cache_prefix="sparql_albums",
+        get_query_function=get_albums_by_artists_query,
+        group_variable="artist",
+    )
 
-    # Use a temporary directory for WIKIDATA_CACHE_DIR for this test
-    with tempfile.TemporaryDirectory() as tmpdir:
-        temp_cache_dir = Path(tmpdir) / "wikidata"
+    # Only the uncached artists are sent in the VALUES block
+    query = mock_request.call_args.kwargs["params"]["query"]
+    assert "VALUES ?artist { wd:Q2 wd:Q3 }" in query
 
-        # Temporarily redirect WIKIDATA_CACHE_DIR to our temp directory
-        with patch("music_rag_etl.utils.wikidata_helpers.WIKIDATA_CACHE_DIR", new=temp_cache_dir):
-            temp_cache_dir.mkdir(parents=True, exist_ok=True)
-            q1_cache_file = temp_cache_dir / "Q1.json"
+    assert results["Q1"] == cached_q1
+    assert results["Q2"] == {"results": {"bindings": [row_q2]}}
+    # Artists without rows are cached as empty results
+    assert results["Q3"] == {"results": {"bindings": []}}
+    assert temp_cache.get("sparql_albums_Q3") == {"results": {"bindings": []}}
 
-            # Create the cached file for Q1
-            with open(q1_cache_file, "w", encoding="utf-8") as f:
-                json.dump(mock_cached_q1, f)
 
-            results = fetch_wikidata_entities_batch_with_cache(context, qids)
+@pytest.mark.asyncio
+@patch(
+    "music_rag_etl.utils.wikidata_helpers.async_make_request_with_retries",
+    new_callable=AsyncMock,
+)
+async def test_grouped_sparql_splits_failing_batches(mock_request, temp_cache):
+    """Tests that a failing batch shrinks the batch size and is retried in halves."""
+    context = build_asset_context()
+
+    async def request_side_effect(**kwargs):
+        query = kwargs["params"]["query"]
+        if query.count("wd:Q") > 2:
+            raise TimeoutError("Query timed out")
+        return {"results": {"bindings": []}}
+
+    mock_request.side_effect = request_side_effect
+    batch_size = AdaptiveBatchSize(initial=4)
+
+    results = await async_fetch_grouped_sparql_with_cache(
+        context,
+        ["Q1", "Q2", "Q3", "Q4"],
+        cache_prefix="sparql_tracks",
+        get_query_function=get_tracks_by_albums_query,
+        group_variable="album",
+        batch_size=batch_size,
+    )
+
+    assert sorted(results) == ["Q1", "Q2", "Q3", "Q4"]
+    # One failed batch of 4, then two successful batches of 2
+    assert mock_request.call_count == 3
+    assert batch_size.current == 4  # Recovered after the successes
+
+
+@pytest.mark.asyncio
+@patch(
+    "music_rag_etl.utils.wikidata_helpers.async_fetch_wikidata_entities_batch",
+    new_callable=AsyncMock,
+)
+async def test_async_batch_coalesces_overlapping_misses(mock_fetch_batch, temp_cache):
+    """Tests that concurrent batches only request QIDs not already in flight."""
+    context = build_asset_context()
+
+    async def fetch_side_effect(context, qids, session, props):
+        await asyncio.sleep(0.01)
+        return {"entities": {qid: {"id": qid, "labels": {}} for qid in qids}}
+
+    mock_fetch_batch.side_effect = fetch_side_effect
 
-            # Assert API was called only with the missing QID
-            mock_fetch_batch.assert_called_once_with(context, ["Q2"])
+    first, second = await asyncio.gather(
+        async_fetch_wikidata_entities_batch_with_cache(context, ["Q1", "Q2"]),
+        async_fetch_wikidata_entities_batch_with_cache(context, ["Q2", "Q3"]),
+    )
 
-            # Assert that the new cache file for Q2 was written
-            q2_cache_file = temp_cache_dir / "Q2.json"
-            assert q2_cache_file.exists()
-            with open(q2_cache_file, "r", encoding="utf-8") as f:
-                cached_q2_data = json.load(f)
-            assert cached_q2_data == mock_api_response_q2["entities"]["Q2"]
+    requested = [call.args[1] for call in mock_fetch_batch.call_args_list]
+    assert requested == [["Q1", "Q2"], ["Q3"]]
+    assert sorted(first) == ["Q1", "Q2"]
+    assert sorted(second) == ["Q2", "Q3"]
+    assert temp_cache.get("Q2") == {"id": "Q2", "labels": {}}
+
+
+@pytest.mark.asyncio
+@patch(
+    "music_rag_etl.utils.wikidata_helpers.async_fetch_wikidata_entities_batch",
+    new_callable=AsyncMock,
+)
+async def test_batcher_shares_requests_across_callers(mock_fetch_batch, temp_cache):
+    """Tests that label lookups of concurrent callers are sent in one request."""
+    context = build_asset_context()
+    mock_fetch_batch.side_effect = lambda context, qids, session, props: {
+        "entities": {qid: {"id": qid, "labels": {"en": {"value": f"Country {qid}"}}} for qid in qids}
+    }
+    temp_cache.put("entity_labels_Q30", {"id": "Q30", "labels": {"en": {"value": "USA"}}})
+    batcher = WikidataEntityBatcher(context, props="labels")
+
+    first, second = await asyncio.gather(
+        async_resolve_qids_to_labels(context, ["Q30", "Q145"], batcher=batcher),
+        async_resolve_qids_to_labels(context, ["Q183"], batcher=batcher),
+    )
+
+    assert first == {"Q30": "USA", "Q145": "Country Q145"}
+    assert second == {"Q183": "Country Q183"}
+    # Only the two uncached QIDs are requested, together
+    mock_fetch_batch.assert_called_once_with(context, ["Q145", "Q183"], None, "labels")
+
+    with pytest.raises(ValueError, match="props"):
+        await async_fetch_wikidata_entities_batch_with_cache(
+            context, ["Q1"], batcher=batcher
+        )
+
+
+@patch("music_rag_etl.utils.wikidata_helpers.fetch_latest_revisions")
+def test_revalidate_wikidata_entities(mock_latest_revisions):
+    """Tests that only entities whose item is unchanged are confirmed."""
+    mock_latest_revisions.return_value = {"Q1": 100, "Q2": 205}
+    entries = {
+        "Q1": {"id": "Q1", "lastrevid": 100},
+        "entity_labels_Q1": {"id": "Q1", "lastrevid": 100},
+        "Q2": {"id": "Q2", "lastrevid": 200},  # Edited since
+        "Q3": {"id": "Q3"},  # Cached without a revision
+        "sparql_albums_Q1": {"results": {"bindings": []}},
+    }
+
+    assert revalidate_wikidata_entities(entries) == ["Q1", "entity_labels_Q1"]
+    assert sorted(mock_latest_revisions.call_args.kwargs["titles"]) == ["Q1", "Q2"]
+
+
+def test_build_year_partitions():
+    """Tests that a year range is split into adjacent half-open windows."""
+    assert build_year_partitions(1960, 1961) == [
+        (date(1960, 1, 1), date(1961, 1, 1)),
+        (date(1961, 1, 1), date(1962, 1, 1)),
+    ]
+
+
+@patch("music_rag_etl.utils.wikidata_helpers.fetch_sparql_query")
+def test_fetch_sparql_date_partition_bisects_saturated_windows(mock_fetch):
+    """Tests that a window filling a whole page is split instead of paged by OFFSET."""
+    context = build_asset_context()
+    # Three rows per month in the first half of the year, none afterwards
+    rows_by_month = {month: [{"m": month}] * 3 for month in range(1, 7)}
+
+    def fetch_side_effect(context, query):
+        start = query.split('?date >= "')[1][:10]
+        end = query.split('?date < "')[1][:10]
+        rows = [
+            row
+            for month, month_rows in rows_by_month.items()
+            if start <= f"1960-{month:02d}-01" < end
+            for row in month_rows
+        ]
+        return rows[:4]  # Page size
 
-            # Assert the final results contain both items
-            assert "Q1" in results
-            assert "Q2" in results
-            assert results["Q1"] == mock_cached_q1
-            assert results["Q2"] == mock_api_response_q2["entities"]["Q2"]
+    mock_fetch.side_effect = fetch_side_effect
 
-    # Cleanup is handled by TemporaryDirectory context manager
+    results = fetch_sparql_date_partition(
+        context,
+        get_artists_by_date_range_query,
+        date(1960, 1, 1),
+        date(1961, 1, 1),
+        limit=4,
+    )
 
+    assert len(results) == 18
+    assert all("OFFSET 0" in call.args[1] for call in mock_fetch.call_args_list)